@@ -25,7 +25,6 @@ from osdf.logging.osdf_logging import debug_log
 from osdf.logging.osdf_logging import error_log
 from osdf.utils.interfaces import get_rest_client
 from requests import RequestException
-from threading import Thread
 import traceback
 BASE_DIR = os.path.dirname(__file__)
 
@@ -33,10 +32,9 @@ BASE_DIR = os.path.dirname(__file__)
 # This is the class for NST Selection
 
 
-class NstSelection(Thread):
+class NstSelection(object):
 
     def __init__(self, osdf_config, request_json):
-        super().__init__()
         self.osdf_config = osdf_config
         self.request_json = request_json
         self.request_info = self.request_json['requestInfo']
@@ -53,14 +51,26 @@ class NstSelection(Thread):
             :return: response from NST Opt
         """
         try:
-            rest_client = get_rest_client(self.request_json, service='so')
-            solution = self.get_nst_solution()
+            self.get_nst_solution()
+        except Exception as err:
+            error_log.error("Error for {} {}".format(self.request_info.get('requestId'),
+                                                     traceback.format_exc()))
+            error_message = str(err)
+            self.send_response(self.error_response(error_message))
+
+    def complete_nst_selection(self, plan, model_name):
+        """Send the response for a done Conductor plan (see get_nst_solution)"""
+        try:
+            solution = self.process_conductor_response(plan, model_name)
         except Exception as err:
             error_log.error("Error for {} {}".format(self.request_info.get('requestId'),
                                                      traceback.format_exc()))
             error_message = str(err)
             solution = self.error_response(error_message)
+        self.send_response(solution)
 
+    def send_response(self, solution):
+        rest_client = get_rest_client(self.request_json, service='so')
         try:
             rest_client.request(json=solution, noresponse=True)
         except RequestException:
@@ -76,8 +86,9 @@ class NstSelection(Thread):
         requirements = self.request_json['serviceProfile']
         model_name = "nst"
         policies = self.get_app_policies(model_name, "nst_selection")
-        conductor_response = self.get_conductor(req_info, requirements, policies, model_name)
-        return conductor_response
+        plan = self.get_conductor(req_info, requirements, policies, model_name)
+        # the response is sent from complete_nst_selection, without holding this thread while Conductor solves
+        conductor.on_plan_done(plan, "nst_selection", self.complete_nst_selection, model_name)
 
     def get_nst_selection_response(self, solutions):
         """Get NST selection response from final solution
@@ -116,13 +127,21 @@ class NstSelection(Thread):
             }
         ]
 
+        template_fields = {
+            'location_enabled': False,
+            'version': '2020-08-13'
+        }
+        return conductor.request_async(req_info, demands, request_parameters, {}, template_fields,
+                                       self.osdf_config, policies, service_type="nst_selection")
+
+    def process_conductor_response(self, plan, model_name):
+        """Build the response for the API request from a done Conductor plan
+
+            :param plan: Future of the Conductor plan
+            :return: response json as a dictionary
+        """
         try:
-            template_fields = {
-                'location_enabled': False,
-                'version': '2020-08-13'
-            }
-            resp = conductor.request(req_info, demands, request_parameters, {}, template_fields,
-                                     self.osdf_config, policies)
+            resp = plan.result()
         except RequestException as e:
             resp = e.response.json()
             error = resp['plans'][0]['message']
@@ -130,7 +149,7 @@ class NstSelection(Thread):
                 return self.get_nst_selection_response([])
             error_log.error('Error from conductor {}'.format(error))
             return self.error_response(error)
-        debug_log.debug("Response from conductor in get_conductor method {}".format(str(resp)))
+        debug_log.debug("Response from conductor {}".format(str(resp)))
         recommendations = resp["plans"][0].get("recommendations")
         return self.process_response(recommendations, model_name)
 
@@ -16,7 +16,7 @@
 # -------------------------------------------------------------------------
 #
 
-from schematics.types import BaseType, StringType, URLType, IntType
+from schematics.types import BaseType, BooleanType, StringType, URLType, IntType
 from schematics.types.compound import ModelType, ListType, DictType
 
 from osdf.models.api.common import OSDFModel
@@ -33,6 +33,7 @@ class RequestInfo(OSDFModel):
     numSolutions = IntType()
     optimizers = ListType(StringType(required=True))
     timeout = IntType()
+    engine = StringType(choices=['minizinc', 'native', 'native-warm-start'])
 
 
 class ANRInfo(OSDFModel):
@@ -48,6 +49,8 @@ class CellInfo(OSDFModel):
     fixedPCICells = ListType(StringType())
     priorityTreatmentCells = ListType(StringType())
     trigger = StringType()
+    incremental = BooleanType()
+    neighborhoodHops = IntType(min_value=0)
 
 
 class PCIOptimizationAPI(OSDFModel):
@@ -16,6 +16,8 @@
 # -------------------------------------------------------------------------
 #
 
+from concurrent.futures import ThreadPoolExecutor
+
 
 class ConfigClient(object):
 
@@ -35,3 +37,19 @@ class ConfigClient(object):
             raise ValueError('Bad config client type {}'.format(type))
 
         return cls.subclasses[type]()
+
+    def get_nbr_lists(self, network_id, cell_ids, max_workers=1):
+        """Neighbor lists of many cells, fetched with up to max_workers concurrent calls to get_nbr_list
+
+        Clients whose backend can return the neighbors of all the cells at once override this.
+        :param network_id: network (region) of the cells
+        :param cell_ids: list of cell ids
+        :param max_workers: maximum number of concurrent requests
+        :return: dict of cell id -> neighbor list
+        """
+        if max_workers <= 1 or len(cell_ids) <= 1:
+            return {cell_id: self.get_nbr_list(network_id, cell_id) for cell_id in cell_ids}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(cell_ids)),
+                                thread_name_prefix="osdf-nbr-fetch") as executor:
+            nbr_lists = executor.map(lambda cell_id: self.get_nbr_list(network_id, cell_id), cell_ids)
+            return dict(zip(cell_ids, nbr_lists))
@@ -17,6 +17,7 @@
 #
 
 from apps.pci.optimizers.config.config_client import ConfigClient
+from apps.pci.optimizers.topology_cache import get_topology_cache
 
 
 def request(req_object, osdf_config, flat_policies):
@@ -37,7 +38,19 @@ def request(req_object, osdf_config, flat_policies):
 
     config_client = ConfigClient.create(config['configClientType'])
 
-    cell_resp = config_client.get_cell_list(network_id)
+    def fetch_cells():
+        return config_client.get_cell_list(network_id)
+
+    def fetch_nbr_lists(cell_ids):
+        return config_client.get_nbr_lists(network_id, cell_ids, config.get('configClientConcurrency', 1))
+
+    topology_cache = get_topology_cache(osdf_config)
+    if topology_cache:
+        cell_resp, nbr_lists = topology_cache.get(network_id, fetch_cells, fetch_nbr_lists,
+                                                  req_object['cellInfo'].get('cellIdList', []))
+    else:
+        cell_resp = fetch_cells()
+        nbr_lists = fetch_nbr_lists(cell_resp)
 
     cell_list = []
     count = 0
@@ -45,7 +58,7 @@ def request(req_object, osdf_config, flat_policies):
         cell_info = {
             'cell_id': cell_id,
             'id': count,
-            'nbr_list': config_client.get_nbr_list(network_id, cell_id)
+            'nbr_list': nbr_lists[cell_id]
         }
         cell_list.append(cell_info)
         count += 1
@@ -23,8 +23,8 @@ from requests import RequestException
 
 from apps.pci.optimizers.config_request import request as config_request
 from apps.pci.optimizers.solver.optimizer import pci_optimize as optimize
-from apps.pci.optimizers.solver.pci_utils import get_cell_id
-from apps.pci.optimizers.solver.pci_utils import get_pci_value
+from apps.pci.optimizers.solver.pci_utils import NetworkIndex
+from apps.pci.optimizers.topology_cache import get_topology_cache
 from osdf.logging.osdf_logging import error_log
 from osdf.logging.osdf_logging import metrics_log
 from osdf.logging.osdf_logging import MH
@@ -73,6 +73,21 @@ def process_pci_optimation(request_json, osdf_config, flat_policies):
     except RequestException:  # can't do much here but log it and move on
         error_log.error("Error sending asynchronous notification for {} {}".format(req_id, traceback.format_exc()))
 
+    # the solution is applied to the network from here on, the cached topology of its cells can be outdated
+    topology_cache = get_topology_cache(osdf_config)
+    changed_cells = solution_cells(pci_response['solutions'])
+    if topology_cache and changed_cells:
+        topology_cache.expect_changes(pci_response['solutions']['networkId'], changed_cells)
+
+
+def solution_cells(solutions):
+    """Cells whose PCI or neighbor list is changed by a PCI/ANR solution"""
+    cells = {solution['cellId'] for solution in solutions['pciSolutions']}
+    for solution in solutions['anrSolutions']:
+        cells.add(solution['cellId'])
+        cells.update(solution['removeableNeighbors'])
+    return sorted(cells)
+
 
 def get_solutions(cell_info_list, network_cell_info, request_json):
     status, pci_solutions, anr_solutions = build_solution_list(cell_info_list, network_cell_info, request_json)
@@ -95,38 +110,41 @@ def build_solution_list(cell_info_list, network_cell_info, request_json):
     pci_solutions = []
     anr_solutions = []
     try:
-        opt_solution = optimize(network_cell_info, cell_info_list, request_json)
+        index = NetworkIndex(network_cell_info)
+        opt_solution = optimize(network_cell_info, cell_info_list, request_json, index)
         if opt_solution == 'UNSATISFIABLE':
             status = 'inconsistent input'
             return status, pci_solutions, anr_solutions
         else:
-            pci_solutions = build_pci_solution(network_cell_info, opt_solution['pci'])
-            anr_solutions = build_anr_solution(network_cell_info, opt_solution.get('removables', {}))
+            pci_solutions = build_pci_solution(network_cell_info, opt_solution['pci'], index)
+            anr_solutions = build_anr_solution(network_cell_info, opt_solution.get('removables', {}), index)
     except RuntimeError:
         error_log.error("Failed finding solution for {} {}".format(req_id, traceback.format_exc()))
         status = "failed"
     return status, pci_solutions, anr_solutions
 
 
-def build_pci_solution(network_cell_info, pci_solution):
+def build_pci_solution(network_cell_info, pci_solution, index=None):
+    index = index or NetworkIndex(network_cell_info)
     pci_solutions = []
     for k, v in pci_solution.items():
-        old_pci = get_pci_value(network_cell_info, k)
+        old_pci = index.get_pci_value(k)
         if old_pci != v:
             response = {
-                'cellId': get_cell_id(network_cell_info, k),
+                'cellId': index.get_cell_id(k),
                 'pci': v
             }
             pci_solutions.append(response)
     return pci_solutions
 
 
-def build_anr_solution(network_cell_info, removables):
+def build_anr_solution(network_cell_info, removables, index=None):
+    index = index or NetworkIndex(network_cell_info)
     anr_solutions = []
     for k, v in removables.items():
         response = {
-            'cellId': get_cell_id(network_cell_info, k),
-            'removeableNeighbors': list(map(lambda x: get_cell_id(network_cell_info, x), v))
+            'cellId': index.get_cell_id(k),
+            'removeableNeighbors': list(map(index.get_cell_id, v))
         }
         anr_solutions.append(response)
     return anr_solutions
@@ -0,0 +1,225 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+In-process PCI assignment
+
+PCI assignment is a graph coloring problem: neighbors (and, without ANR, second level neighbors) must get
+different PCIs. A DSatur construction followed by a tabu search finds an assignment without starting
+MiniZinc. It does not prove optimality (or unsatisfiability), so its result is either used as it is or
+handed to MiniZinc as a warm start.
+"""
+
+import heapq
+
+
+class ConflictGraph(object):
+    """Weighted conflict graph in CSR form
+
+    The links of node v are targets[offsets[v]:offsets[v + 1]], with the cost of giving both ends the same PCI
+    in weights. Links which must not be in conflict get the weight hard, which is more than all the soft
+    weights together.
+    """
+
+    def __init__(self, num_nodes, pair_weights, hard):
+        self.num_nodes = num_nodes
+        self.hard = hard
+        links = [[] for _ in range(num_nodes)]
+        for (a, b), weight in pair_weights.items():
+            links[a].append((b, weight))
+            links[b].append((a, weight))
+        self.offsets = [0]
+        self.targets = []
+        self.weights = []
+        for node_links in links:
+            for target, weight in sorted(node_links):
+                self.targets.append(target)
+                self.weights.append(weight)
+            self.offsets.append(len(self.targets))
+
+    @classmethod
+    def from_dzn(cls, dzn_data, anr_flag):
+        """Conflict graph of the dzn data of the MiniZinc models
+
+        Without ANR all the neighbor and second level neighbor links are hard. With ANR the neighbor links
+        are hard except for the ignorable ones (weight 1 each), and every second level neighbor link in
+        conflict (a confusion) costs 2 * NUM_IGNORABLE_NEIGHBOR_LINKS, as in min_confusion_inl.mzn.
+        """
+        hard_pairs = set()
+        soft = {}
+        if anr_flag:
+            ignorable = set(tuple(link) for link in dzn_data['IGNORABLE_NEIGHBOR_LINKS'])
+            confusion_weight = 2 * len(ignorable)
+            for a, b in dzn_data['NEIGHBORS']:
+                if (a, b) in ignorable:
+                    soft[pair(a, b)] = soft.get(pair(a, b), 0) + 1
+                else:
+                    hard_pairs.add(pair(a, b))
+            for a, b in dzn_data['SECOND_LEVEL_NEIGHBORS']:
+                soft[pair(a, b)] = soft.get(pair(a, b), 0) + confusion_weight
+        else:
+            for a, b in dzn_data['NEIGHBORS'] + dzn_data['SECOND_LEVEL_NEIGHBORS']:
+                hard_pairs.add(pair(a, b))
+        hard = sum(soft.values()) + 1
+        pair_weights = {p: w for p, w in soft.items() if w > 0}
+        pair_weights.update((p, hard) for p in hard_pairs if p[0] != p[1])
+        return cls(dzn_data['NUM_NODES'], pair_weights, hard)
+
+    def degree(self, node):
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def neighbors(self, node):
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def color_costs(self, node, colors):
+        """Cost of giving node each of the PCIs its (colored) neighbors have: dict PCI -> cost"""
+        costs = {}
+        for i in range(self.offsets[node], self.offsets[node + 1]):
+            color = colors[self.targets[i]]
+            if color >= 0:
+                costs[color] = costs.get(color, 0) + self.weights[i]
+        return costs
+
+    def cost(self, colors):
+        total = 0
+        for node in range(self.num_nodes):
+            for i in range(self.offsets[node], self.offsets[node + 1]):
+                if self.targets[i] > node and colors[self.targets[i]] == colors[node]:
+                    total += self.weights[i]
+        return total
+
+
+def pair(a, b):
+    return (a, b) if a <= b else (b, a)
+
+
+def smallest_free_color(costs, num_colors):
+    color = 0
+    while color in costs:
+        color += 1
+    return color if color < num_colors else None
+
+
+def dsatur(graph, num_colors, fixed):
+    """Greedy coloring, always coloring next the node whose neighbors have the most distinct colors
+
+    :param graph: ConflictGraph
+    :param num_colors: number of available colors (PCIs)
+    :param fixed: dict node -> color of the nodes whose color cannot change
+    :return: list of colors
+    """
+    colors = [-1] * graph.num_nodes
+    for node, color in fixed.items():
+        colors[node] = color
+    saturation = [set() for _ in range(graph.num_nodes)]
+    for node in fixed:
+        for nbr in graph.neighbors(node):
+            saturation[nbr].add(colors[node])
+
+    queue = [(-len(saturation[node]), -graph.degree(node), node) for node in range(graph.num_nodes)
+             if node not in fixed]
+    heapq.heapify(queue)
+    while queue:
+        neg_saturation, _, node = heapq.heappop(queue)
+        if colors[node] >= 0 or -neg_saturation != len(saturation[node]):
+            continue  # already colored, or an outdated entry
+        costs = graph.color_costs(node, colors)
+        color = smallest_free_color(costs, num_colors)
+        if color is None:
+            color = min(range(num_colors), key=lambda c: (costs.get(c, 0), c))
+        colors[node] = color
+        for nbr in graph.neighbors(node):
+            if colors[nbr] < 0 and color not in saturation[nbr]:
+                saturation[nbr].add(color)
+                heapq.heappush(queue, (-len(saturation[nbr]), -graph.degree(nbr), nbr))
+    return colors
+
+
+def tabu_search(graph, colors, num_colors, fixed, max_iterations=10000, tabu_tenure=10):
+    """Improve a coloring by moving conflicting nodes to their best non-tabu color
+
+    A node may not take back a color it left for tabu_tenure iterations, unless that gives the best
+    coloring found so far.
+    :return: (best coloring, its cost)
+    """
+    colors = list(colors)
+    total = graph.cost(colors)
+    best, best_total = list(colors), total
+
+    def in_conflict(node):
+        return node not in fixed and graph.color_costs(node, colors).get(colors[node], 0) > 0
+
+    conflicted = set(node for node in range(graph.num_nodes) if in_conflict(node))
+    tabu = {}
+    for iteration in range(max_iterations):
+        if best_total == 0 or not conflicted:
+            break
+        move = None
+        for node in sorted(conflicted):
+            costs = graph.color_costs(node, colors)
+            current = costs.get(colors[node], 0)
+            candidates = [(cost, color) for color, cost in costs.items() if color != colors[node]]
+            free = smallest_free_color(costs, num_colors)
+            if free is not None:
+                candidates.append((0, free))
+            for cost, color in candidates:
+                delta = cost - current
+                if tabu.get((node, color), -1) >= iteration and total + delta >= best_total:
+                    continue
+                if move is None or delta < move[0]:
+                    move = (delta, node, color)
+        if move is None:
+            break
+        delta, node, color = move
+        tabu[(node, colors[node])] = iteration + tabu_tenure
+        colors[node] = color
+        total += delta
+        for changed in [node] + graph.neighbors(node):
+            if in_conflict(changed):
+                conflicted.add(changed)
+            else:
+                conflicted.discard(changed)
+        if total < best_total:
+            best, best_total = list(colors), total
+    return best, best_total
+
+
+def solve(dzn_data, anr_flag, max_iterations=10000, tabu_tenure=10):
+    """Assign the PCIs of the dzn data of the MiniZinc models (see optimizer.build_dzn_data)
+
+    :param dzn_data: dzn data of the problem
+    :param anr_flag: whether the problem is a PCI-ANR one
+    :param max_iterations: maximum number of tabu search moves
+    :param tabu_tenure: number of moves a node may not take back a color it left
+    :return: solution in the format of pymzn ([{'pci': {node: pci}, 'used_ignorables': [...]}]), or None if no
+             assignment without hard conflicts was found
+    """
+    num_colors = dzn_data['NUM_PCIS']
+    fixed = {node: dzn_data['ORIGINAL_PCIS'][node] for node in dzn_data['PCI_UNCHANGEABLE_CELLS']}
+    graph = ConflictGraph.from_dzn(dzn_data, anr_flag)
+    colors, total = tabu_search(graph, dsatur(graph, num_colors, fixed), num_colors, fixed,
+                                max_iterations, tabu_tenure)
+    if total >= graph.hard:
+        return None
+    solution = {'pci': dict(enumerate(colors))}
+    if anr_flag:
+        neighbors = set(tuple(link) for link in dzn_data['NEIGHBORS'])
+        solution['used_ignorables'] = [int(tuple(link) in neighbors and colors[link[0]] == colors[link[1]])
+                                       for link in dzn_data['IGNORABLE_NEIGHBOR_LINKS']]
+    return [solution]
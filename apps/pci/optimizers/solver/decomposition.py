@@ -0,0 +1,168 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+Decomposition of a PCI optimization problem into independent sub-problems
+
+Cells are only coupled through the neighbor (conflict), second level neighbor (confusion) and ignorable
+neighbor links, so the connected components of the graph of these links can be solved separately and their
+PCI assignments merged. Likewise, re-optimizing around a few cells only needs their neighborhood, with the
+cells at its border pinned to their PCIs.
+"""
+
+from collections import defaultdict
+import itertools
+
+
+class SubProblem(object):
+    """The dzn data of one connected component, with the cell ids renumbered from 0"""
+
+    def __init__(self, nodes, dzn_data, ignorable_links, anr_flag):
+        self.nodes = nodes
+        self.dzn_data = dzn_data
+        self.ignorable_links = ignorable_links
+        self.anr_flag = anr_flag
+
+    def has_links(self):
+        return self.dzn_data['NUM_NEIGHBORS'] > 0 or self.dzn_data['NUM_SECOND_LEVEL_NEIGHBORS'] > 0
+
+    def to_global(self, mzn_solution):
+        """PCI assignment and used ignorable links of a MiniZinc solution, in the cell ids of the whole problem"""
+        pcis = mzn_solution['pci']
+        pcis = pcis.items() if isinstance(pcis, dict) else enumerate(pcis)
+        used = mzn_solution.get('used_ignorables', [])
+        return ({self.nodes[i]: pci for i, pci in pcis},
+                [link for link, count in zip(self.ignorable_links, used) if count > 0])
+
+
+def connected_components(num_nodes, *edge_lists):
+    """Connected components of the nodes 0..num_nodes-1
+
+    :param num_nodes: number of nodes
+    :param edge_lists: lists of [node, node] pairs
+    :return: list of sorted lists of nodes, ordered by their smallest node
+    """
+    parent = list(range(num_nodes))
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for edges in edge_lists:
+        for a, b in edges:
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    components = {}
+    for node in range(num_nodes):
+        components.setdefault(find(node), []).append(node)
+    return list(components.values())
+
+
+def is_decomposable(dzn_data, anr_flag):
+    """Whether all the links and original PCIs refer to known cells (otherwise the problem is solved as a whole)"""
+    num_nodes = dzn_data['NUM_NODES']
+    links = dzn_data['NEIGHBORS'] + dzn_data['SECOND_LEVEL_NEIGHBORS']
+    if anr_flag:
+        links = links + dzn_data['IGNORABLE_NEIGHBOR_LINKS']
+    nodes = [node for link in links for node in link] + list(dzn_data['PCI_UNCHANGEABLE_CELLS'])
+    return (all(isinstance(node, int) and 0 <= node < num_nodes for node in nodes)
+            and len(dzn_data['ORIGINAL_PCIS']) == num_nodes and None not in dzn_data['ORIGINAL_PCIS'])
+
+
+def decompose(dzn_data, anr_flag):
+    """Split the dzn data of a PCI problem into the sub-problems of its connected components
+
+    Every component of a PCI-ANR problem keeps the ANR model, even without ignorable links: that model only
+    minimizes the confusions, which the model without ANR forbids (and can be unsatisfiable for).
+    :param dzn_data: dzn data of the whole problem (see optimizer.build_dzn_data)
+    :param anr_flag: whether the problem is a PCI-ANR one
+    :return: list of SubProblem
+    """
+    ignorable = dzn_data['IGNORABLE_NEIGHBOR_LINKS'] if anr_flag else []
+    components = connected_components(dzn_data['NUM_NODES'], dzn_data['NEIGHBORS'],
+                                      dzn_data['SECOND_LEVEL_NEIGHBORS'], ignorable)
+    component_of = {node: i for i, nodes in enumerate(components) for node in nodes}
+
+    def split(links):
+        parts = [[] for _ in components]
+        for link in links:
+            parts[component_of[link[0]]].append(link)
+        return parts
+
+    neighbors = split(dzn_data['NEIGHBORS'])
+    second_level = split(dzn_data['SECOND_LEVEL_NEIGHBORS'])
+    ignorables = split(ignorable)
+    unchangeable = set(dzn_data['PCI_UNCHANGEABLE_CELLS'])
+    return [make_sub_problem(dzn_data, anr_flag, nodes, neighbors[i], second_level[i], ignorables[i], unchangeable)
+            for i, nodes in enumerate(components)]
+
+
+def neighborhood(dzn_data, anr_flag, affected, hops):
+    """Sub-problem re-assigning only the PCIs of the cells within hops links of the affected cells
+
+    The cells linked to this neighborhood keep their PCIs (they are added to PCI_UNCHANGEABLE_CELLS), and the
+    links between two cells outside of it are left out.
+    :param dzn_data: dzn data of the whole problem (see optimizer.build_dzn_data)
+    :param anr_flag: whether the problem is a PCI-ANR one
+    :param affected: ids of the cells to re-optimize around
+    :param hops: size of the neighborhood, in links
+    :return: SubProblem
+    """
+    ignorable = dzn_data['IGNORABLE_NEIGHBOR_LINKS'] if anr_flag else []
+    adjacency = defaultdict(set)
+    for a, b in itertools.chain(dzn_data['NEIGHBORS'], dzn_data['SECOND_LEVEL_NEIGHBORS'], ignorable):
+        adjacency[a].add(b)
+        adjacency[b].add(a)
+
+    region = set(affected)
+    frontier = region
+    for _ in range(hops):
+        frontier = set(nbr for node in frontier for nbr in adjacency[node]) - region
+        region |= frontier
+    boundary = set(nbr for node in region for nbr in adjacency[node]) - region
+
+    def links(all_links):
+        return [link for link in all_links if link[0] in region or link[1] in region]
+
+    return make_sub_problem(dzn_data, anr_flag, sorted(region | boundary), links(dzn_data['NEIGHBORS']),
+                            links(dzn_data['SECOND_LEVEL_NEIGHBORS']), links(ignorable),
+                            set(dzn_data['PCI_UNCHANGEABLE_CELLS']) | boundary)
+
+
+def make_sub_problem(dzn_data, anr_flag, nodes, neighbors, second_level, ignorable, unchangeable):
+    """SubProblem of the given cells and links (in the cell ids of the whole problem)"""
+    local = {node: j for j, node in enumerate(nodes)}
+    sub_dzn = {
+        'NUM_NODES': len(nodes),
+        'NUM_PCIS': dzn_data['NUM_PCIS'],
+        'NUM_NEIGHBORS': len(neighbors),
+        'NEIGHBORS': [[local[a], local[b]] for a, b in neighbors],
+        'NUM_SECOND_LEVEL_NEIGHBORS': len(second_level),
+        'SECOND_LEVEL_NEIGHBORS': [[local[a], local[b]] for a, b in second_level],
+        'PCI_UNCHANGEABLE_CELLS': {local[node] for node in nodes if node in unchangeable},
+        'ORIGINAL_PCIS': [dzn_data['ORIGINAL_PCIS'][node] for node in nodes]
+    }
+    if anr_flag:
+        sub_dzn['NUM_IGNORABLE_NEIGHBOR_LINKS'] = len(ignorable)
+        sub_dzn['IGNORABLE_NEIGHBOR_LINKS'] = [[local[a], local[b]] for a, b in ignorable]
+    return SubProblem(nodes, sub_dzn, [tuple(link) for link in ignorable], anr_flag)
@@ -0,0 +1,77 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+Neighbor and second level neighbor edges of a PCI network, built with NumPy
+
+The neighbor lists are read once into a CSR structure; the edges are then produced as sorted and deduplicated
+int32 arrays of shape (number of edges, 2), without creating a Python tuple per edge.
+"""
+
+import numpy as np
+
+
+class NeighborArrays(object):
+    """Neighbors of all the cells in CSR form
+
+    The ids of the neighbors of the k-th cell of the cell list (whose id is hosts[k]) are
+    indices[indptr[k]:indptr[k + 1]], with -1 for the neighbors which are not cells of the network.
+    """
+
+    def __init__(self, network_cell_info, index):
+        cells = network_cell_info['cell_list']
+        degrees = [len(cell.get('nbr_list', [])) for cell in cells]
+        nbr_ids = (index.get_id(nbr['targetCellId']) for cell in cells for nbr in cell.get('nbr_list', []))
+        self.hosts = np.array([cell['id'] for cell in cells], dtype=np.int32)
+        self.degrees = np.array(degrees, dtype=np.int64)
+        self.indptr = np.concatenate(([0], np.cumsum(self.degrees))).astype(np.int64)
+        self.indices = np.fromiter((-1 if nbr_id is None else nbr_id for nbr_id in nbr_ids), dtype=np.int32,
+                                   count=int(self.indptr[-1]))
+
+    def neighbor_edges(self):
+        """(cell, neighbor) edges; neighbors with id 0 are skipped, like in optimizer.get_neighbor_list"""
+        hosts = np.repeat(self.hosts, self.degrees)
+        keep = (self.indices > 0) & (self.indices != hosts)
+        return unique_edges(hosts[keep], self.indices[keep])
+
+    def second_level_edges(self):
+        """(neighbor, neighbor) edges of every pair of neighbors of a cell, in the order of its neighbor list"""
+        firsts, seconds = [], []
+        for degree in np.unique(self.degrees):
+            if degree < 2:
+                continue
+            rows = np.flatnonzero(self.degrees == degree)
+            nbrs = self.indices[self.indptr[rows][:, None] + np.arange(degree)]
+            i, j = np.triu_indices(degree, 1)
+            first, second = nbrs[:, i].ravel(), nbrs[:, j].ravel()
+            keep = (first > 0) & (second > 0)
+            firsts.append(first[keep])
+            seconds.append(second[keep])
+        if not firsts:
+            return unique_edges(np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32))
+        return unique_edges(np.concatenate(firsts), np.concatenate(seconds))
+
+
+def unique_edges(firsts, seconds):
+    """Sorted, deduplicated (first, second) int32 edge array of non-negative node ids"""
+    if firsts.size == 0:
+        return np.empty((0, 2), dtype=np.int32)
+    num_nodes = int(max(firsts.max(), seconds.max())) + 1
+    keys = np.unique(firsts.astype(np.int64) * num_nodes + seconds)
+    return np.stack([keys // num_nodes, keys % num_nodes], axis=1).astype(np.int32)
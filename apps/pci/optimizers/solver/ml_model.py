@@ -16,57 +16,130 @@
 # -------------------------------------------------------------------------
 #
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import json
 
-from apps.pci.optimizers.solver.pci_utils import get_id
+from apps.pci.optimizers.solver.pci_utils import NetworkIndex
 from osdf.adapters.dcae import des
 from osdf.adapters.dcae.des import DESException
 from osdf.config.base import osdf_config
 from osdf.logging.osdf_logging import error_log
+from osdf.utils.ttl_cache import TTLCache
+
+ho_stats_cache = TTLCache(max_size=100000)  # cell id -> (average, latest) handover attempts
 
 
 class MlModel(object):
     def __init__(self):
         self.config = osdf_config.core['PCI']
 
-    def get_additional_inputs(self, dzn_data, network_cell_info):
+    def get_additional_inputs(self, dzn_data, network_cell_info, index=None):
         """Add/update additional info to the existing models.
 
         The method returns nothing. Instead, it modifies the dzn_data
         :params: dzn_data: map with data for the optimization
+        :params: index: NetworkIndex of network_cell_info, if already built
         """
-        self.compute_ml_model(dzn_data, network_cell_info)
+        self.compute_ml_model(dzn_data, network_cell_info, index or NetworkIndex(network_cell_info))
 
-    def compute_ml_model(self, dzn_data, network_cell_info):
+    def compute_ml_model(self, dzn_data, network_cell_info, index):
         average_ho_threshold = self.config['ML']['average_ho_threshold']
         latest_ho_threshold = self.config['ML']['latest_ho_threshold']
 
+        cell_ids = [cell['cell_id'] for cell in network_cell_info['cell_list']]
+        ho_details = self.get_ho_details_of_cells(cell_ids)
         fixed_cells = set()
-        for cell in network_cell_info['cell_list']:
-            cell_id = cell['cell_id']
-            average_ho, latest_ho = self.get_ho_details(cell['cell_id'])
+        for cell_id in cell_ids:
+            average_ho, latest_ho = ho_details[cell_id]
             if average_ho > average_ho_threshold or latest_ho > latest_ho_threshold:
-                fixed_cells.add(get_id(network_cell_info, cell_id))
+                fixed_cells.add(index.get_id(cell_id))
 
         fixed_cells.update(dzn_data.get('PCI_UNCHANGEABLE_CELLS', []))
         dzn_data['PCI_UNCHANGEABLE_CELLS'] = fixed_cells
 
+    def get_ho_details_of_cells(self, cell_ids):
+        """Handover statistics of the cells, from the cache or from DES
+
+        With DES.batch_service_id configured, the statistics of up to DES.batch_size cells are fetched with
+        one request; otherwise every cell is queried with DES.service_id, up to DES.concurrency cells at the
+        same time. The statistics are cached for DES.cache_ttl seconds, unless DES could not be queried.
+        :param cell_ids: list of cell ids
+        :return: dict of cell id -> (average, latest) handover attempts
+        """
+        des_config = self.config['DES']
+        ttl = des_config.get('cache_ttl', 0)
+        ho_details = ho_stats_cache.get_many(cell_ids) if ttl else {}
+        missing = [cell_id for cell_id in dict.fromkeys(cell_ids) if cell_id not in ho_details]
+        if des_config.get('batch_service_id'):
+            fetched = self.fetch_ho_details_batch(missing)
+        else:
+            fetched = self.fetch_ho_details_concurrently(missing, des_config.get('concurrency', 1))
+        fetched = {cell_id: details for cell_id, details in fetched.items() if details is not None}
+        if ttl:
+            ho_stats_cache.put_many(fetched, ttl)
+        ho_details.update(fetched)
+        return {cell_id: ho_details.get(cell_id, (0, 0)) for cell_id in cell_ids}
+
     def get_ho_details(self, cell_id):
+        ho_details = self.fetch_ho_details(cell_id)
+        return (0, 0) if ho_details is None else ho_details
+
+    def fetch_ho_details(self, cell_id):
+        """(average, latest) handover attempts of a cell, or None if DES could not be queried"""
         service_id = self.config['DES']['service_id']
-        request_data = self.config['DES']['filter']
-        request_data['cell_id'] = cell_id
+        request_data = dict(self.config['DES']['filter'], cell_id=cell_id)
         try:
             result = des.extract_data(service_id, json.dumps(request_data))
         except DESException as e:
             error_log.error("Error while calling DES {}".format(e))
-            return 0, 0
+            return None
+        return ho_statistics(result)
+
+    def fetch_ho_details_concurrently(self, cell_ids, max_workers):
+        """(average, latest) handover attempts of many cells, with up to max_workers concurrent DES requests
+
+        :return: dict of cell id -> statistics, or None for the cells DES did not answer for
+        """
+        if max_workers <= 1 or len(cell_ids) <= 1:
+            return {cell_id: self.fetch_ho_details(cell_id) for cell_id in cell_ids}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(cell_ids)),
+                                thread_name_prefix="osdf-des-fetch") as executor:
+            return dict(zip(cell_ids, executor.map(self.fetch_ho_details, cell_ids)))
+
+    def fetch_ho_details_batch(self, cell_ids):
+        """(average, latest) handover attempts of many cells, with one DES request per DES.batch_size cells
+
+        The rows of the result carry the id of their cell in DES.batch_cell_id_field.
+        :return: dict of cell id -> statistics, for the cells of the batches DES answered
+        """
+        des_config = self.config['DES']
+        batch_size = des_config.get('batch_size', 100)
+        cell_id_field = des_config.get('batch_cell_id_field', 'cellId')
+        ho_details = {}
+        for start in range(0, len(cell_ids), batch_size):
+            batch = cell_ids[start:start + batch_size]
+            request_data = dict(des_config['filter'], cell_ids=batch)
+            try:
+                result = des.extract_data(des_config['batch_service_id'], json.dumps(request_data))
+            except DESException as e:
+                error_log.error("Error while calling DES {}".format(e))
+                continue
+            pm_data_by_cell = defaultdict(list)
+            for pm_data in result or []:
+                pm_data_by_cell[pm_data[cell_id_field]].append(pm_data)
+            ho_details.update((cell_id, ho_statistics(pm_data_by_cell.get(cell_id))) for cell_id in batch)
+        return ho_details
+
 
-        if not result:
-            return 0, 0
+def ho_statistics(pm_data_list):
+    """(average, latest) handover attempts of the pm data of a cell (the latest one first)"""
+    if not pm_data_list:
+        return 0, 0
 
-        ho_list = []
-        for pm_data in result:
-            ho = pm_data['overallHoAtt']
-            ho_list.append(ho)
+    ho_list = []
+    for pm_data in pm_data_list:
+        ho = pm_data['overallHoAtt']
+        ho_list.append(ho)
 
-        return sum(ho_list) / len(ho_list), ho_list[0]
+    return sum(ho_list) / len(ho_list), ho_list[0]
@@ -18,48 +18,154 @@
 #
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import itertools
+import numpy as np
 import os
 import pymzn
 
+from apps.pci.optimizers.solver import coloring
+from apps.pci.optimizers.solver.decomposition import decompose
+from apps.pci.optimizers.solver.decomposition import is_decomposable
+from apps.pci.optimizers.solver.decomposition import neighborhood
+from apps.pci.optimizers.solver.edges import NeighborArrays
 from apps.pci.optimizers.solver.ml_model import MlModel
-from apps.pci.optimizers.solver.pci_utils import get_id
-from apps.pci.optimizers.solver.pci_utils import mapping
+from apps.pci.optimizers.solver.pci_utils import NetworkIndex
 from osdf.config.base import osdf_config
+from osdf.logging.osdf_logging import debug_log
+from osdf.operation.exceptions import BusinessException
 
 BASE_DIR = os.path.dirname(__file__)
-cell_id_mapping = dict()
-id_cell_mapping = dict()
 
 
-def pci_optimize(network_cell_info, cell_info_list, request_json):
-    global cell_id_mapping, id_cell_mapping
-    cell_id_mapping, id_cell_mapping = mapping(network_cell_info)
-    original_pcis = get_original_pci_list(network_cell_info)
-    unchangeable_pcis = get_ids_of_fixed_pci_cells(request_json['cellInfo'].get('fixedPCICells', []))
-    neighbor_edges = get_neighbor_list(network_cell_info)
-    second_level_edges = get_second_level_neighbor(network_cell_info)
-    ignorable_links = get_ignorable_links(network_cell_info, request_json)
-    anr_flag = is_anr(request_json)
-
-    dzn_data = build_dzn_data(cell_info_list, ignorable_links, neighbor_edges, second_level_edges, anr_flag,
-                              original_pcis, unchangeable_pcis)
+class PciOptimizationContext(object):
+    """The data a single PCI optimization works on
+
+    One context is built per request, so that concurrent requests do not share any mutable state. The
+    NetworkIndex of the request is passed in by the caller when it needs the index again for the solution.
+    """
+
+    def __init__(self, network_cell_info, cell_info_list, request_json, index=None):
+        self.network_cell_info = network_cell_info
+        self.cell_info_list = cell_info_list
+        self.request_json = request_json
+        self.index = index or NetworkIndex(network_cell_info)
+        self.cell_id_mapping = self.index.id_by_cell_id
+        self.id_cell_mapping = self.index.cell_id_by_id
+        self.anr_flag = is_anr(request_json)
+        self.engine = get_engine(request_json)
+        self.original_pcis = get_original_pci_list(network_cell_info, self.cell_id_mapping)
+        self.unchangeable_pcis = get_ids_of_fixed_pci_cells(request_json['cellInfo'].get('fixedPCICells', []),
+                                                            self.cell_id_mapping)
+        neighbor_arrays = NeighborArrays(network_cell_info, self.index)
+        self.neighbor_edges = neighbor_arrays.neighbor_edges()
+        self.second_level_edges = neighbor_arrays.second_level_edges()
+        self.ignorable_links = get_ignorable_links(network_cell_info, request_json, self.index)
+        self.dzn_data = build_dzn_data(cell_info_list, self.ignorable_links, self.neighbor_edges,
+                                       self.second_level_edges, self.anr_flag, self.original_pcis,
+                                       self.unchangeable_pcis)
+
+
+def pci_optimize(network_cell_info, cell_info_list, request_json, index=None):
+    context = PciOptimizationContext(network_cell_info, cell_info_list, request_json, index)
 
     ml_enabled = osdf_config.core['PCI']['ml_enabled']
     if ml_enabled:
-        MlModel().get_additional_inputs(dzn_data, network_cell_info)
+        MlModel().get_additional_inputs(context.dzn_data, network_cell_info, context.index)
+
+    if request_json['cellInfo'].get('incremental'):
+        if is_decomposable(context.dzn_data, context.anr_flag):
+            return solve_incrementally(context)
+        debug_log.warning("Request {} asks for an incremental PCI optimization, but the network has links to or "
+                          "PCIs of unknown cells; re-optimizing the whole network"
+                          .format(request_json['requestInfo'].get('requestId')))
+
+    decomposition = osdf_config.core['PCI'].get('decomposition') or {}
+    if decomposition.get('enabled') and is_decomposable(context.dzn_data, context.anr_flag):
+        sub_problems = decompose(context.dzn_data, context.anr_flag)
+        if len(sub_problems) > 1:
+            return solve_sub_problems(sub_problems, context.anr_flag, decomposition.get('workers', 4),
+                                      context.engine)
+
+    return build_pci_solution(context.dzn_data, context.ignorable_links, context.anr_flag, context.engine)
+
+
+def solve_sub_problems(sub_problems, anr_flag, max_workers, engine='minizinc'):
+    """Solve the connected components of a problem and merge their solutions
+
+    MiniZinc solves every component in its own process, so threads are enough to run those in parallel. The
+    native engine is pure Python and holds the GIL, so with it the components are solved one after the other.
+    """
+    sub_problems = sorted(sub_problems, key=lambda sub: len(sub.nodes), reverse=True)
+    if engine == 'native':
+        sub_solutions = [solve_sub_problem(sub, engine) for sub in sub_problems]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sub_problems))),
+                                thread_name_prefix="osdf-pci-solve") as executor:
+            sub_solutions = list(executor.map(lambda sub: solve_sub_problem(sub, engine), sub_problems))
+    return merge_sub_solutions(sub_solutions, anr_flag)
+
+
+def solve_incrementally(context):
+    """Re-optimize only the neighborhood of the cells in the cellIdList of the request
+
+    All the other cells keep their PCIs. The size of the neighborhood (in links) is cellInfo.neighborhoodHops,
+    or PCI.incremental.hops of the core config.
+    :raises BusinessException: if a cell of the cellIdList is not in the network
+    """
+    cell_info = context.request_json['cellInfo']
+    hops = cell_info.get('neighborhoodHops')
+    if hops is None:
+        hops = (osdf_config.core['PCI'].get('incremental') or {}).get('hops', 2)
+    cell_ids = cell_info.get('cellIdList', [])
+    unknown = [cell_id for cell_id in cell_ids if context.index.get_id(cell_id) is None]
+    if unknown:
+        raise BusinessException("Cells of the cellIdList are not in network {}: {}"
+                                .format(cell_info.get('networkId'), ", ".join(unknown)))
+    affected = [context.index.get_id(cell_id) for cell_id in cell_ids]
+    sub_problem = neighborhood(context.dzn_data, context.anr_flag, affected, hops)
+    return merge_sub_solutions([solve_sub_problem(sub_problem, context.engine)], context.anr_flag,
+                               dict(enumerate(context.dzn_data['ORIGINAL_PCIS'])))
+
+
+def merge_sub_solutions(sub_solutions, anr_flag, pcis=None):
+    """Solution of the whole problem from the (pci, used ignorable links) of its sub-problems
+
+    :param pcis: PCIs of the cells not in any of the sub-problems
+    """
+    if 'UNSATISFIABLE' in sub_solutions:
+        return 'UNSATISFIABLE'
+
+    pcis = dict(pcis or {})
+    removables = defaultdict(list)
+    for sub_pcis, used_ignorables in sub_solutions:
+        pcis.update(sub_pcis)
+        for host_id, nbr_id in used_ignorables:
+            removables[host_id].append(nbr_id)
+    solution = {'pci': dict(sorted(pcis.items()))}
+    if anr_flag:
+        solution['removables'] = removables
+    return solution
+
 
-    return build_pci_solution(dzn_data, ignorable_links, anr_flag)
+def solve_sub_problem(sub_problem, engine='minizinc'):
+    if not sub_problem.has_links():  # an isolated cell keeps its PCI
+        return dict(zip(sub_problem.nodes, sub_problem.dzn_data['ORIGINAL_PCIS'])), []
+    mzn_solution = solve_with_engine(engine, sub_problem.anr_flag, sub_problem.dzn_data)
+    if mzn_solution == 'UNSATISFIABLE':
+        return mzn_solution
+    return sub_problem.to_global(mzn_solution[0])
 
 
-def get_ids_of_fixed_pci_cells(fixed_pci_list):
+def get_ids_of_fixed_pci_cells(fixed_pci_list, cell_id_mapping):
     fixed_pci_ids = set()
     for cell in fixed_pci_list:
         fixed_pci_ids.add(cell_id_mapping[cell])
     return fixed_pci_ids
 
 
-def get_cell_id_pci_mapping(network_cell_info):
+def get_cell_id_pci_mapping(network_cell_info, cell_id_mapping):
     original_pcis = dict()
     for cell in network_cell_info['cell_list']:
         for nbr in cell['nbr_list']:
@@ -68,16 +174,16 @@ def get_cell_id_pci_mapping(network_cell_info):
     return original_pcis
 
 
-def get_original_pci_list(network_cell_info):
-    cell_id_pci_mapping = get_cell_id_pci_mapping(network_cell_info)
+def get_original_pci_list(network_cell_info, cell_id_mapping):
+    cell_id_pci_mapping = get_cell_id_pci_mapping(network_cell_info, cell_id_mapping)
     original_pcis_list = []
     for i in range(len(cell_id_pci_mapping)):
         original_pcis_list.append(cell_id_pci_mapping.get(i))
     return original_pcis_list
 
 
-def build_pci_solution(dzn_data, ignorable_links, anr_flag):
-    mzn_solution = solve(get_mzn_model(anr_flag), dzn_data)
+def build_pci_solution(dzn_data, ignorable_links, anr_flag, engine='minizinc'):
+    mzn_solution = solve_with_engine(engine, anr_flag, dzn_data)
     if mzn_solution == 'UNSATISFIABLE':
         return mzn_solution
     solution = {'pci': mzn_solution[0]['pci']}
@@ -86,7 +192,7 @@ def build_pci_solution(dzn_data, ignorable_links, anr_flag):
         removables = defaultdict(list)
         used_ignorables = mzn_solution[0]['used_ignorables']
         index = 0
-        for i in ignorable_links:
+        for i in dzn_data['IGNORABLE_NEIGHBOR_LINKS']:  # used_ignorables is in the order of the model data
             if used_ignorables[index] > 0:
                 removables[i[0]].append(i[1])
             index += 1
@@ -120,11 +226,42 @@ def get_mzn_model(anr_flag):
     return mzn_model
 
 
+@lru_cache(maxsize=None)
+def get_warm_start_model(anr_flag):
+    """The MiniZinc model, starting its search from the assignment in PCI_HINT"""
+    with open(get_mzn_model(anr_flag)) as model:
+        return model.read().replace('solve ::', 'array[int] of int: PCI_HINT;\n\n'
+                                                'solve :: warm_start(array1d(pci), PCI_HINT) ::', 1)
+
+
+def get_engine(request_json):
+    """PCI engine for a request: minizinc, native or native-warm-start (native result as MiniZinc warm start)"""
+    return request_json['requestInfo'].get('engine') or osdf_config.core['PCI'].get('engine', 'minizinc')
+
+
+def solve_with_engine(engine, anr_flag, dzn_data):
+    """Solve with MiniZinc, the native engine, or MiniZinc starting from the native engine's assignment
+
+    Whenever the native engine does not find an assignment without conflicts, MiniZinc solves the problem.
+    """
+    if engine in ('native', 'native-warm-start'):
+        native_conf = osdf_config.core['PCI'].get('native') or {}
+        native_solution = coloring.solve(dzn_data, anr_flag, **native_conf)
+        if native_solution and engine == 'native':
+            return native_solution
+        if native_solution:
+            hint = [native_solution[0]['pci'][node] for node in range(dzn_data['NUM_NODES'])]
+            return solve(get_warm_start_model(anr_flag), dict(dzn_data, PCI_HINT=hint))
+    return solve(get_mzn_model(anr_flag), dzn_data)
+
+
 def is_anr(request_json):
     return 'pci-anr' in request_json["requestInfo"]["optimizers"]
 
 
 def get_list(edge_list):
+    if isinstance(edge_list, np.ndarray):  # sorted and deduplicated already
+        return edge_list.tolist()
     array_list = []
     for s in edge_list:
         array_list.append([s[0], s[1]])
@@ -135,45 +272,48 @@ def solve(mzn_model, dzn_data):
     return pymzn.minizinc(mzn=mzn_model, data=dzn_data)
 
 
-def get_neighbor_list(network_cell_info):
+def get_neighbor_list(network_cell_info, index=None):
+    index = index or NetworkIndex(network_cell_info)
     neighbor_list = set()
     for cell in network_cell_info['cell_list']:
-        add_to_neighbor_list(network_cell_info, cell, neighbor_list)
+        add_to_neighbor_list(index, cell, neighbor_list)
     return neighbor_list
 
 
-def add_to_neighbor_list(network_cell_info, cell, neighbor_list):
+def add_to_neighbor_list(index, cell, neighbor_list):
     for nbr in cell.get('nbr_list', []):
         host_id = cell['id']
-        nbr_id = get_id(network_cell_info, nbr['targetCellId'])
+        nbr_id = index.get_id(nbr['targetCellId'])
         if nbr_id and host_id != nbr_id:
             neighbor_list.add((host_id, nbr_id))
 
 
-def get_second_level_neighbor(network_cell_info):
+def get_second_level_neighbor(network_cell_info, index=None):
+    index = index or NetworkIndex(network_cell_info)
     second_neighbor_list = set()
     for cell in network_cell_info['cell_list']:
-        comb_list = build_second_level_list(network_cell_info, cell)
+        comb_list = build_second_level_list(index, cell)
         for comb in comb_list:
             if comb[0] and comb[1]:
                 second_neighbor_list.add((comb[0], comb[1]))
     return sorted(second_neighbor_list)
 
 
-def build_second_level_list(network_cell_info, cell):
+def build_second_level_list(index, cell):
     second_nbr_list = []
     for nbr in cell.get('nbr_list', []):
-        second_nbr_list.append(get_id(network_cell_info, nbr['targetCellId']))
+        second_nbr_list.append(index.get_id(nbr['targetCellId']))
     return [list(elem) for elem in list(itertools.combinations(second_nbr_list, 2))]
 
 
-def get_ignorable_links(network_cell_info, request_json):
+def get_ignorable_links(network_cell_info, request_json, index=None):
+    index = index or NetworkIndex(network_cell_info)
     ignorable_list = set()
     anr_input_list = request_json["cellInfo"].get('anrInputList', [])
     if anr_input_list:
         for anr_info in anr_input_list:
-            cell_id = get_id(network_cell_info, anr_info['cellId'])
+            cell_id = index.get_id(anr_info['cellId'])
             anr_removable = anr_info.get('removeableNeighbors', [])
             for anr in anr_removable:
-                ignorable_list.add((cell_id, get_id(network_cell_info, anr)))
+                ignorable_list.add((cell_id, index.get_id(anr)))
     return ignorable_list
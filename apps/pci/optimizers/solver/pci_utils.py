@@ -24,6 +24,35 @@ def mapping(network_cell_info):
         id_cell_mapping[i['id']] = i['cell_id']
     return cell_id_mapping, id_cell_mapping
 
+
+class NetworkIndex(object):
+    """id <-> cell_id <-> PCI lookups for the cells of a network, built once per request
+
+    Gives the same answers as get_id, get_cell_id and get_pci_value, which scan network_cell_info for every
+    lookup and are only meant for one-off lookups.
+    """
+
+    def __init__(self, network_cell_info):
+        self.id_by_cell_id = {}
+        self.cell_id_by_id = {}
+        self.pci_by_cell_id = {}
+        for cell in network_cell_info['cell_list']:
+            self.id_by_cell_id.setdefault(cell['cell_id'], cell['id'])
+            self.cell_id_by_id.setdefault(cell['id'], cell['cell_id'])
+        for cell in network_cell_info['cell_list']:
+            for nbr in cell['nbr_list']:
+                self.pci_by_cell_id.setdefault(nbr['targetCellId'], nbr['pciValue'])
+
+    def get_id(self, cell_id):
+        return self.id_by_cell_id.get(cell_id)
+
+    def get_cell_id(self, id):
+        return self.cell_id_by_id.get(id)
+
+    def get_pci_value(self, id):
+        return self.pci_by_cell_id.get(self.cell_id_by_id.get(id))
+
+
 def get_id(network_cell_info, cell_id):
     for i in network_cell_info['cell_list']:
         if i['cell_id'] == cell_id:
@@ -0,0 +1,186 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+Cache of the network topology (cells and their neighbor lists) fetched from ConfigDB/CPS
+
+Entries are keyed by network id and expire after a TTL. Cells reported as changed (by an invalidation or,
+with delta_refresh, by the cellIdList of a request) are re-pulled on the next use of the network instead of
+fetching the whole cell and neighbor graph again. As the PCI of a cell is held in the neighbor lists of its
+neighbors, those are re-pulled along with the changed cells, and so is the cell list of the network.
+
+The cells of a PCI/ANR solution sent by OSDF are only changed once PCI-Handler/SDN-R has applied it, which
+OSDF is not told about. They are re-pulled on every use of the network until they are invalidated (the
+change is confirmed) or the entry expires, so that a re-pull made before the apply does not stick.
+"""
+
+from collections import OrderedDict
+import copy
+import threading
+import time
+
+from osdf.logging.osdf_logging import debug_log
+
+
+class NetworkTopology(object):
+    __slots__ = ["cell_ids", "nbr_lists", "changed", "pending", "expires"]
+
+    def __init__(self, cell_ids, nbr_lists, expires):
+        self.cell_ids = cell_ids
+        self.nbr_lists = nbr_lists
+        self.changed = set()
+        self.pending = set()  # cells of solutions sent by OSDF, which may not be applied yet
+        self.expires = expires
+
+
+class TopologyCache(object):
+    """LRU cache with TTL and per-cell refresh for the topology of PCI networks"""
+
+    def __init__(self, ttl=300, max_size=32, delta_refresh=False):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.delta_refresh = delta_refresh
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "refreshedCells": 0}
+
+    def get(self, network_id, fetch_cells, fetch_nbr_lists, changed_cells=()):
+        """Cell ids and neighbor lists of a network
+
+        :param network_id: network id
+        :param fetch_cells: function returning the cell ids of the network
+        :param fetch_nbr_lists: function taking a list of cell ids and returning a dict cell id -> neighbor list
+        :param changed_cells: cells known to have changed; re-pulled on a hit when delta_refresh is set
+        :return: (list of cell ids, dict of cell id -> neighbor list), copies which callers can modify
+        """
+        with self._lock:
+            entry = self._entries.get(network_id)
+            if entry is not None and entry.expires > time.monotonic():
+                self._entries.move_to_end(network_id)
+                self._counters["hits"] += 1
+                changed = entry.changed | entry.pending | (set(changed_cells) if self.delta_refresh else set())
+            else:
+                entry = None
+                self._counters["misses"] += 1
+        if entry is None:
+            cell_ids = fetch_cells()
+            entry = NetworkTopology(cell_ids, fetch_nbr_lists(cell_ids), time.monotonic() + self.ttl)
+            self._put(network_id, entry)
+        elif changed:
+            self._refresh(network_id, entry, changed, fetch_cells, fetch_nbr_lists)
+        with self._lock:
+            return list(entry.cell_ids), copy.deepcopy(entry.nbr_lists)
+
+    def _refresh(self, network_id, entry, changed, fetch_cells, fetch_nbr_lists):
+        """Re-pull the cell list, and the neighbor lists of the changed, added or removed cells and of their
+        neighbors (which hold the PCI of the changed cells)"""
+        cell_ids = fetch_cells()
+        with self._lock:
+            known = set(entry.cell_ids)
+            touched = (set(changed) & known) | (set(cell_ids) ^ known)
+            touched |= neighbors(entry.nbr_lists, touched)
+            stale = [cell_id for cell_id in cell_ids if cell_id in touched or cell_id not in entry.nbr_lists]
+        debug_log.debug("Re-pulling the neighbor lists of {} cells of network {}".format(len(stale), network_id))
+        nbr_lists = fetch_nbr_lists(stale) if stale else {}
+        with self._lock:
+            entry.nbr_lists = {cell_id: nbr_lists[cell_id] if cell_id in nbr_lists else entry.nbr_lists[cell_id]
+                               for cell_id in cell_ids}
+            entry.cell_ids = cell_ids
+            entry.changed.difference_update(changed)  # the pending cells stay until confirmed or expired
+            self._counters["refreshedCells"] += len(stale)
+
+    def _put(self, network_id, entry):
+        with self._lock:
+            self._entries[network_id] = entry
+            self._entries.move_to_end(network_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, network_id=None, cell_ids=None):
+        """Drop the topology of a network (of all of them if no network_id is given)
+
+        :param network_id: network id
+        :param cell_ids: only mark these cells of the network as changed, so that just their neighbor lists
+                         and those of their neighbors are fetched again on its next use (this confirms the
+                         changes expected by expect_changes)
+        :return: number of networks dropped or cells marked
+        """
+        with self._lock:
+            if network_id is None:
+                count = len(self._entries)
+                self._entries.clear()
+            elif cell_ids:
+                entry = self._entries.get(network_id)
+                count = len(cell_ids) if entry else 0
+                if entry:
+                    entry.changed.update(cell_ids)
+                    entry.pending.difference_update(cell_ids)
+            else:
+                count = 1 if self._entries.pop(network_id, None) else 0
+        debug_log.debug("Invalidated topology cache for network {} cells {}: {}".format(network_id, cell_ids, count))
+        return count
+
+    def expect_changes(self, network_id, cell_ids):
+        """Mark cells of a network as about to change, e.g. by a solution sent to PCI-Handler
+
+        Until they are invalidated or the entry expires, the cells and their neighbors are re-pulled on every
+        use of the network, as the change may be applied after any of these re-pulls.
+        :return: number of cells marked
+        """
+        with self._lock:
+            entry = self._entries.get(network_id)
+            if entry is None:
+                return 0
+            entry.pending.update(cell_ids)
+        debug_log.debug("Expecting changes of the cells {} of network {}".format(cell_ids, network_id))
+        return len(cell_ids)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, size=len(self._entries), maxSize=self.max_size, ttl=self.ttl,
+                        deltaRefresh=self.delta_refresh)
+
+
+def neighbors(nbr_lists, cell_ids):
+    """Cells which are neighbors of any of cell_ids, or have any of them as a neighbor"""
+    found = set()
+    for cell_id, nbr_list in nbr_lists.items():
+        targets = {nbr['targetCellId'] for nbr in nbr_list}
+        if cell_id in cell_ids:
+            found |= targets
+        elif targets & cell_ids:
+            found.add(cell_id)
+    return found
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_topology_cache(osdf_config):
+    """The process-wide TopologyCache, or None if osdf_config.deployment['pciTopologyCache'] does not enable it"""
+    global _cache
+    conf = dict(osdf_config.deployment.get('pciTopologyCache') or {})
+    if not conf.pop('enabled', False):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TopologyCache(**conf)
+        return _cache
@@ -115,6 +115,8 @@ def process_placement_opt(request_json, policies, osdf_config):
     """Perform the work for placement optimization (e.g. call SDC artifact and make conductor request)
 
     NOTE: there is scope to make the requests to policy asynchronous to speed up overall performance
+    The response for a plan sent to Conductor is built and sent by complete_placement_opt once the plan
+    is done, so that the worker thread is not held while Conductor is solving.
     :param request_json: json content from original request
     :param policies: flattened policies corresponding to this request
     :param osdf_config: configuration specific to OSDF app
@@ -144,33 +146,64 @@ def process_placement_opt(request_json, policies, osdf_config):
                 'location_enabled': True,
                 'version': '2017-10-10'
             }
-            resp = conductor.request(req_info, demands, request_parameters, service_info, template_fields,
-                                     osdf_config, policies)
-            if resp["plans"][0].get("recommendations"):
-                placement_response = conductor_response_processor(resp, req_id, transaction_id)
-            else:  # "solved" but no solutions found
-                placement_response = conductor_no_solution_processor(resp, req_id, transaction_id)
-            if license_info:  # Attach license solution if it exists
-                placement_response['solutionInfo']['licenseInfo'] = license_info
-        else:  # License selection only scenario
-            placement_response = {
-                "transactionId": transaction_id,
-                "requestId": req_id,
-                "requestStatus": "completed",
-                "statusMessage": "License selection completed successfully",
-                "solutionInfo": {"licenseInfo": license_info}
-            }
+            plan = conductor.request_async(req_info, demands, request_parameters, service_info, template_fields,
+                                           osdf_config, policies)
+            conductor.on_plan_done(plan, "placement", complete_placement_opt, request_json, license_info)
+            return
+
+        # License selection only scenario
+        placement_response = {
+            "transactionId": transaction_id,
+            "requestId": req_id,
+            "requestStatus": "completed",
+            "statusMessage": "License selection completed successfully",
+            "solutionInfo": {"licenseInfo": license_info}
+        }
     except Exception as err:
         error_log.error("Error for {} {}".format(req_id, traceback.format_exc()))
+        send_placement_error(rc, req_id, err)
+        return
+
+    send_placement_response(rc, req_id, placement_response)
+
 
-        try:
-            body = build_json_error_body(err)
-            metrics_log.info(MH.sending_response(req_id, "ERROR"))
-            rc.request(json=body, noresponse=True)
-        except RequestException:
-            error_log.error("Error sending asynchronous notification for {} {}".format(req_id, traceback.format_exc()))
+def complete_placement_opt(plan, request_json, license_info):
+    """Build the placement response from a done Conductor plan and POST it to the callback URL
+
+    :param plan: Future of the Conductor plan (see osdf.adapters.conductor.conductor.request_async)
+    :param request_json: json content from original request
+    :param license_info: license solution to attach to the response, if any
+    """
+    mdc_from_json(request_json)
+    rc = get_rest_client(request_json, service="so")
+    req_id = request_json["requestInfo"]["requestId"]
+    transaction_id = request_json['requestInfo']['transactionId']
+    try:
+        resp = plan.result()
+        if resp["plans"][0].get("recommendations"):
+            placement_response = conductor_response_processor(resp, req_id, transaction_id)
+        else:  # "solved" but no solutions found
+            placement_response = conductor_no_solution_processor(resp, req_id, transaction_id)
+        if license_info:  # Attach license solution if it exists
+            placement_response['solutionInfo']['licenseInfo'] = license_info
+    except Exception as err:
+        error_log.error("Error for {} {}".format(req_id, traceback.format_exc()))
+        send_placement_error(rc, req_id, err)
         return
 
+    send_placement_response(rc, req_id, placement_response)
+
+
+def send_placement_error(rc, req_id, err):
+    try:
+        body = build_json_error_body(err)
+        metrics_log.info(MH.sending_response(req_id, "ERROR"))
+        rc.request(json=body, noresponse=True)
+    except RequestException:
+        error_log.error("Error sending asynchronous notification for {} {}".format(req_id, traceback.format_exc()))
+
+
+def send_placement_response(rc, req_id, placement_response):
     try:
         metrics_log.info(MH.calling_back_with_body(req_id, rc.url, placement_response))
         rc.request(json=placement_response, noresponse=True)
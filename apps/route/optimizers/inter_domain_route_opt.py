@@ -16,34 +16,31 @@
 # -------------------------------------------------------------------------
 
 
+from concurrent.futures import ThreadPoolExecutor
 import os
 import itertools
-import json
-import requests
-from requests.auth import HTTPBasicAuth
-import urllib3
-
+from operator import itemgetter
+
+from apps.route.optimizers import path_engine
+from apps.route.optimizers.route_processing import order_route
+from apps.route.optimizers.route_processing import route_options
+from apps.route.optimizers.route_processing import selected_links
+from apps.route.optimizers.topology import CONTROLLERS
+from apps.route.optimizers.topology import get_route_topology
+from apps.route.optimizers.topology import INTER_DOMAIN_LINKS
+from osdf.adapters.aai.aai_client import AAIClient
+from osdf.adapters.aai.aai_client import AAIException
 from osdf.logging.osdf_logging import audit_log
+from osdf.utils.ttl_cache import TTLCache
 import pymzn
 from sklearn import preprocessing
 
 BASE_DIR = os.path.dirname(__file__)
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
 
-class InterDomainRouteOpt:
+port_controller_cache = TTLCache()  # (AAI url, p-interface id) -> controller id
 
-    """
-    This values will need to deleted..
-    only added for the debug purpose
-    """
-    aai_headers = {
-        "X-TransactionId": "9999",
-        "X-FromAppId": "OOF",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
 
+class InterDomainRouteOpt:
 
     def get_route(self, request, osdf_config):
         """
@@ -64,7 +61,8 @@ class InterDomainRouteOpt:
             audit_log.info("Dzn data")
             audit_log.info(dzn_data)
             mzn_model = os.path.join(BASE_DIR, 'route_opt.mzn')
-            links_list = self.find_suitable_path(mzn_model, dzn_data, mapping_table)
+            links_list = self.find_suitable_path(mzn_model, dzn_data, mapping_table,
+                                                 path_engine.get_engine(osdf_config))
             ordered_list = self.get_ordered_route_list(links_list,
                                                        src_controller_id, dst_controller_id)
             solution = self.get_solution_object(ordered_list, src_port_id, dst_port_id)
@@ -79,6 +77,76 @@ class InterDomainRouteOpt:
             audit_log.info(err)
             raise err
 
+    def get_routes(self, request, osdf_config):
+        """
+        This method processes a batch of mdons route requests
+        (routeInfo.routeRequests) and returns the routes of
+        each of them, with alternative routes if requested in
+        routeInfo.options or the options of a route request
+        (alternatives, disjoint, linkWeight: hops or bandwidth).
+        The links are looked up once per service rate.
+        :raises BusinessException: if the options of a route request are not valid
+        """
+        try:
+            route_info = request["routeInfo"]
+            options = [route_options(route_info.get("options"), route_request.get("options"))
+                       for route_request in route_info["routeRequests"]]
+            engine = path_engine.get_engine(osdf_config)
+            route_graphs = {}
+            solutions = []
+            for route_request, request_options in zip(route_info["routeRequests"], options):
+                service_rate = route_request["serviceRate"]
+                if service_rate not in route_graphs:
+                    route_graphs[service_rate] = self.get_route_graph(osdf_config, service_rate)
+                solutions.append(self.get_route_solution(route_request, request_options,
+                                                         route_graphs[service_rate], engine))
+            return {
+                "requestId": request["requestInfo"]["requestId"],
+                "transactionId": request["requestInfo"]["transactionId"],
+                "statusMessage": "SUCCESS",
+                "requestStatus": "accepted",
+                "solutions": solutions
+                }
+        except Exception as err:
+            audit_log.info(err)
+            raise err
+
+    def get_route_solution(self, route_request, options, route_graph, engine):
+        """
+        :param route_request: one of the route requests of a batch
+        :param options: alternatives, disjoint and linkWeight
+        :param route_graph: links usable for the service rate
+        :param engine: native or minizinc
+        :return: routes of the request, the best one first
+        """
+        src_controller_id = route_request["srcDetails"]["controllerId"]
+        dst_controller_id = route_request["dstDetails"]["controllerId"]
+        solution = {
+            "srcDetails": route_request["srcDetails"],
+            "dstDetails": route_request["dstDetails"],
+            "serviceRate": route_request["serviceRate"]
+            }
+        try:
+            dzn_data, mapping_table = self.build_dzn_data(None, src_controller_id, dst_controller_id,
+                                                          route_request["serviceRate"], route_graph,
+                                                          options["linkWeight"])
+            mzn_model = os.path.join(BASE_DIR, 'route_opt.mzn')
+            routes = self.solve(mzn_model, dzn_data, engine, options["alternatives"], options["disjoint"],
+                                [item["linkName"] for item in mapping_table])
+            route_list = []
+            for route in routes:
+                links_list = selected_links([route], mapping_table)
+                ordered_list = self.get_ordered_route_list(links_list, src_controller_id, dst_controller_id)
+                route_list.append(self.get_solution_object(ordered_list, route_request["srcDetails"]["interfaceId"],
+                                                           route_request["dstDetails"]["interfaceId"])["routeInfo"])
+            solution["routeStatus"] = "success" if route_list else "not found"
+            solution["routes"] = route_list
+        except Exception as err:
+            audit_log.info("Route from {} to {} failed: {}".format(src_controller_id, dst_controller_id, err))
+            solution["routeStatus"] = "failed"
+            solution["statusMessage"] = str(err)
+        return solution
+
     def get_solution_object(self, ordered_list, src_port_id, dst_port_id):
         """
         :param ordered_list: service_route list
@@ -119,47 +187,33 @@ class InterDomainRouteOpt:
         :param dst_controller_id: destination port id of route
         :return: route list in order
         """
-        ordered_link_list = []
-        flag = True
-        while flag:
-            for item in link_list:
-                if item["srcControllerId"] == src_controller_id:
-                    ordered_link_list.append(item)
-                    src_controller_id = item["dstControllerId"]
-                    if src_controller_id == dst_controller_id:
-                        flag = False
-        return ordered_link_list
+        return order_route(link_list, src_controller_id, dst_controller_id,
+                           itemgetter("srcControllerId"), itemgetter("dstControllerId"))
 
 
-    def find_suitable_path(self, mzn_model, dzn_data, mapping_table):
+    def find_suitable_path(self, mzn_model, dzn_data, mapping_table, engine="minizinc"):
         """
         :param mzn_model: minizinc model details
         :param dzn_data: minizinc data
         :param mapping_table: list that maintains AAI link details
+        :param engine: native or minizinc
         :return: list of link from after running minizinc
         """
-        minizinc_solution = self.solve(mzn_model, dzn_data)
+        minizinc_solution = self.solve(mzn_model, dzn_data, engine)
         audit_log.info("Minizinc Solution ==========>")
         routes = list(minizinc_solution)
         audit_log.info(routes)
-        try:
-            arr = routes[0]['x']
-        except Exception as err:
-            audit_log.info("No minizinc solutions found")
-            raise err
-        links_list = []
-        for i in range(0, len(routes[0]['x'])):
-            if arr[i] == 1:
-                links_list.append(mapping_table[i])
-        return links_list
+        return selected_links(routes, mapping_table)
 
 
-    def process_inter_domain_link(self, logical_link, osdf_config):
+    def process_inter_domain_link(self, logical_link, osdf_config, port_controllers=None):
         """
         :param logical_link: logical links from AAI
         :param osdf_config: OSDF config details
+        :param port_controllers: controller ids of the ports, if already looked up
         :return: list of link object with src and dst controller details
         """
+        port_controllers = port_controllers or {}
         link_details = {}
         link_details["linkName"] = logical_link["link-name"]
         relationship = logical_link["relationship-list"]["relationship"]
@@ -168,26 +222,30 @@ class InterDomainRouteOpt:
         for value in relationship:
             if value["related-to"] == "p-interface" and flag == 1:
                 src_port_id = value["relationship-data"][1]["relationship-value"]
-                src_controller_id = self.get_controller_for_interface(osdf_config, src_port_id)
+                src_controller_id = port_controllers.get(src_port_id) or \
+                    self.get_controller_for_interface(osdf_config, src_port_id)
                 link_details["srcPortId"] = src_port_id
                 link_details["srcControllerId"] = src_controller_id
                 flag += 1
             elif value["related-to"] == "p-interface" and flag == 2:
                 dest_port_id = value["relationship-data"][1]["relationship-value"]
-                dest_controller_id = self.get_controller_for_interface(osdf_config, dest_port_id)
+                dest_controller_id = port_controllers.get(dest_port_id) or \
+                    self.get_controller_for_interface(osdf_config, dest_port_id)
                 link_details["dstPortId"] = dest_port_id
                 link_details["dstControllerId"] = dest_controller_id
         return link_details
 
 
-    def prepare_map_table(self, osdf_config, logical_links):
+    def prepare_map_table(self, osdf_config, logical_links, port_controllers=None):
         """
         :param logical_links: logical links from AAI
         :param osdf_config: OSDF config details
+        :param port_controllers: controller ids of the ports, if already looked up
         :return: list of link object with src and dst controller details
         """
         results = map(self.process_inter_domain_link, logical_links,
-                      itertools.repeat(osdf_config, len(logical_links)))
+                      itertools.repeat(osdf_config, len(logical_links)),
+                      itertools.repeat(port_controllers, len(logical_links)))
         new_results = list(results)
 
         new_list = []
@@ -203,21 +261,29 @@ class InterDomainRouteOpt:
         return new_list
 
 
-    def solve(self, mzn_model, dzn_data):
+    def solve(self, mzn_model, dzn_data, engine="minizinc", alternatives=1, disjoint=False, link_groups=None):
         """
         :param mzn_model: minizinc template
         :param dzn_data: minizinc data model
+        :param engine: native (in-process shortest path) or minizinc
+        :param alternatives: number of routes (the native engine finds
+        the alternatives, route_opt.mzn only the optimal route)
+        :param disjoint: alternatives may not share links
+        :param link_groups: link name of each edge, for disjoint routes
         :return: minizinc response
         """
+        if engine == "native" or alternatives > 1:
+            return path_engine.solve(dzn_data, alternatives, disjoint, link_groups)
         return pymzn.minizinc(mzn=mzn_model, data=dzn_data)
 
 
     def get_links_based_on_bandwidth_attributes(self, logical_links_list,
-                                                osdf_config, service_rate):
+                                                osdf_config, service_rate, available_interfaces=None):
         """
         This method filters the logical links based on the
         bandwidth attribute availability of the interfaces
         from AAI
+        :param available_interfaces: bandwidth availability of the interface urls, if already looked up
         :return: filtered_list[]
         """
         filtered_list = []
@@ -227,7 +293,11 @@ class InterDomainRouteOpt:
             for value in relationship:
                 if value["related-to"] == "p-interface":
                     interface_url = value["related-link"]
-                    if self.get_available_bandwidth_aai(interface_url, osdf_config, service_rate):
+                    if available_interfaces is not None and interface_url in available_interfaces:
+                        available = available_interfaces[interface_url]
+                    else:
+                        available = self.get_available_bandwidth_aai(interface_url, osdf_config, service_rate)
+                    if available:
                         count += 1
             if count == 2:
                 filtered_list.append(logical_link)
@@ -235,32 +305,33 @@ class InterDomainRouteOpt:
         return  filtered_list
 
 
-    def build_dzn_data(self, osdf_config, src_controller_id, dst_controller_id, service_rate):
+    def build_dzn_data(self, osdf_config, src_controller_id, dst_controller_id, service_rate,
+                       route_graph=None, link_weight="hops"):
         """
         :param osdf_config: OSDF config details
         :param src_controller_id: controller Id of the source port
         :param dst_controller_id: controller id of the destination port
         :param service_rate: service rate
+        :param route_graph: links usable for the service rate (see get_route_graph), if already built
+        :param link_weight: hops (every link costs 1) or bandwidth (links with more available ODUs
+        of the service rate cost less)
         :return: mapping atble which maintains link details from AAI
         and minizinc data model to be used by template
         """
-        logical_links = self.get_inter_domain_links(osdf_config)
-        logical_links_list = logical_links["logical-link"]
-        mapping_table = self.prepare_map_table(osdf_config,
-                                               self.get_links_based_on_bandwidth_attributes(logical_links_list, osdf_config, service_rate))
+        mapping_table, list_controllers, le, link_capacity = \
+            route_graph or self.get_route_graph(osdf_config, service_rate)
 
         edge_start = []
         edge_end = []
         for item in mapping_table:
             edge_start.append(item["srcControllerId"])
             edge_end.append(item["dstControllerId"])
-        link_cost = []
-        for k in range(0, len(edge_start)):
-            link_cost.append(1)
-        list_controllers = self.get_controllers_from_aai(osdf_config)
-        le = preprocessing.LabelEncoder()
-        le.fit(list_controllers)
-
+        if link_weight == "bandwidth":
+            link_cost = path_engine.bandwidth_costs(link_capacity)
+        else:
+            link_cost = []
+            for k in range(0, len(edge_start)):
+                link_cost.append(1)
         start_edge = le.transform(edge_start)
         end_edge = le.transform(edge_end)
         source = le.transform([src_controller_id])
@@ -288,6 +359,99 @@ class InterDomainRouteOpt:
         return dzn_data, mapping_table
 
 
+    def get_route_graph(self, osdf_config, service_rate):
+        """
+        :param osdf_config: OSDF config details
+        :param service_rate: service rate
+        :return: mapping table of the links with bandwidth available
+        for the service rate (both directions of each link), the
+        controller ids and their label encoder, and the number of
+        ODUs of the service rate available on each link
+        """
+        topology = get_route_topology(osdf_config)
+        if topology is None:
+            logical_links_list = self.get_inter_domain_links(osdf_config)["logical-link"]
+        else:
+            logical_links_list = topology.snapshot(INTER_DOMAIN_LINKS).entities
+        max_workers = osdf_config.deployment.get('aaiEnrichmentConcurrency', 8)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="osdf-aai-enrich") as executor:
+            controllers = executor.submit(self.get_controller_numbering, osdf_config, topology)
+            available_interfaces = self.get_available_interfaces(executor, logical_links_list, osdf_config,
+                                                                 service_rate)
+            filtered_links = self.get_links_based_on_bandwidth_attributes(logical_links_list, osdf_config,
+                                                                          service_rate, available_interfaces)
+            port_controllers = self.get_port_controllers(executor, filtered_links, osdf_config)
+            mapping_table = self.prepare_map_table(osdf_config, filtered_links, port_controllers)
+            list_controllers, le = controllers.result()
+
+        capacities = {}
+        for logical_link in filtered_links:
+            capacities[logical_link["link-name"]] = min(available_interfaces[value["related-link"]]
+                                                        for value in logical_link["relationship-list"]["relationship"]
+                                                        if value["related-to"] == "p-interface")
+        link_capacity = [capacities[item["linkName"]] for item in mapping_table]
+        return mapping_table, list_controllers, le, link_capacity
+
+
+    def get_controller_numbering(self, osdf_config, topology=None):
+        """
+        :param osdf_config: OSDF config details
+        :param topology: route topology, if enabled
+        :return: list of controller ids and the label encoder numbering
+        them, built once per snapshot of the route topology
+        """
+        if topology is None:
+            return self.fit_controllers(self.get_controllers_from_aai(osdf_config))
+        snapshot = topology.snapshot(CONTROLLERS)
+        return snapshot.derived("controller-numbering", lambda: self.fit_controllers(list(snapshot.by_key)))
+
+
+    def fit_controllers(self, list_controllers):
+        le = preprocessing.LabelEncoder()
+        le.fit(list_controllers)
+        return list_controllers, le
+
+
+    def get_available_interfaces(self, executor, logical_links_list, osdf_config, service_rate):
+        """
+        Looks up the bandwidth availability of every distinct
+        p-interface of the logical links concurrently
+        :return: dict of interface url -> number of available ODUs
+        """
+        interface_urls = list(dict.fromkeys(value["related-link"]
+                                            for logical_link in logical_links_list
+                                            for value in logical_link["relationship-list"]["relationship"]
+                                            if value["related-to"] == "p-interface"))
+        odus = executor.map(lambda url: self.get_available_odus(url, osdf_config, service_rate), interface_urls)
+        return dict(zip(interface_urls, odus))
+
+
+    def get_port_controllers(self, executor, logical_links_list, osdf_config):
+        """
+        Looks up the controllers of the distinct ports of the
+        logical links, concurrently for the ports whose controller
+        is not cached (for aaiPortControllerCacheTtl seconds)
+        :return: dict of port id -> controller id
+        """
+        port_ids = list(dict.fromkeys(value["relationship-data"][1]["relationship-value"]
+                                      for logical_link in logical_links_list
+                                      for value in logical_link["relationship-list"]["relationship"]
+                                      if value["related-to"] == "p-interface"))
+        aai_url = osdf_config.deployment["aaiUrl"]
+        ttl = osdf_config.deployment.get("aaiPortControllerCacheTtl", 3600)
+        cached = port_controller_cache.get_many((aai_url, port_id) for port_id in port_ids) if ttl else {}
+        port_controllers = {port_id: controller_id for (_, port_id), controller_id in cached.items()}
+        missing = [port_id for port_id in port_ids if port_id not in port_controllers]
+        controller_ids = executor.map(lambda port_id: self.get_controller_for_interface(osdf_config, port_id),
+                                      missing)
+        fetched = dict(zip(missing, controller_ids))
+        if ttl:
+            port_controller_cache.put_many({(aai_url, port_id): controller_id
+                                            for port_id, controller_id in fetched.items()}, ttl)
+        port_controllers.update(fetched)
+        return port_controllers
+
+
     def get_inter_domain_links(self, osdf_config):
         """
         This method returns list of all cross ONAP links
@@ -296,12 +460,7 @@ class InterDomainRouteOpt:
         """
 
         config = osdf_config.deployment
-        aai_url = config["aaiUrl"]
-        aai_req_url = aai_url + config["aaiGetInterDomainLinksUrl"]
-        response = requests.get(aai_req_url, headers=self.aai_headers,
-                                auth=HTTPBasicAuth("AAI", "AAI"), verify=False)
-        if response.status_code == 200:
-            return response.json()
+        return AAIClient(osdf_config).get(config["aaiGetInterDomainLinksUrl"], endpoint="inter-domain-links")
 
 
     def get_controller_for_interface(self, osdf_config, port_id):
@@ -317,15 +476,9 @@ class InterDomainRouteOpt:
         query = data.get("query") + port_id
         data.update(query=query)
         config = osdf_config.deployment
-        aai_url = config["aaiUrl"]
-        aai_req_url = aai_url + config["controllerQueryUrl"]
-        response = requests.put(aai_req_url, data=json.dumps(data),
-                                headers=self.aai_headers,
-                                auth=HTTPBasicAuth("AAI", "AAI"),
-                                verify=False)
-        if response.status_code == 200:
-            response_body = response.json()
-            return response_body["results"][0]["esr-thirdparty-sdnc"]["thirdparty-sdnc-id"]
+        response_body = AAIClient(osdf_config).put(config["controllerQueryUrl"], data,
+                                                   endpoint="domain-controller-query")
+        return response_body["results"][0]["esr-thirdparty-sdnc"]["thirdparty-sdnc-id"]
 
 
     def get_controllers_from_aai(self, osdf_config):
@@ -336,19 +489,12 @@ class InterDomainRouteOpt:
         """
         controllers_list = []
         config = osdf_config.deployment
-        aai_url = config["aaiUrl"]
-        aai_req_url = aai_url + config["aaiGetControllersUrl"]
-        response = requests.get(aai_req_url,
-                                headers=self.aai_headers,
-                                auth=HTTPBasicAuth("AAI", "AAI"),
-                                verify=False)
-        if response.status_code == 200:
-            response_body = response.json()
-            esr_thirdparty_list = response_body["esr-thirdparty-sdnc"]
+        response_body = AAIClient(osdf_config).get(config["aaiGetControllersUrl"], endpoint="controllers")
+        esr_thirdparty_list = response_body["esr-thirdparty-sdnc"]
 
-            for item in esr_thirdparty_list:
-                controllers_list.append(item["thirdparty-sdnc-id"])
-            return controllers_list
+        for item in esr_thirdparty_list:
+            controllers_list.append(item["thirdparty-sdnc-id"])
+        return controllers_list
 
 
     def get_available_bandwidth_aai(self, interface_url, osdf_config, service_rate):
@@ -356,15 +502,18 @@ class InterDomainRouteOpt:
         Checks if the given interface has the required bandwidth
         :return: boolean flag
         """
-        config = osdf_config.deployment
-        aai_url = config["aaiUrl"]
-        aai_req_url = aai_url + interface_url + "?depth=all"
-        response = requests.get(aai_req_url,
-                                headers=self.aai_headers,
-                                auth=HTTPBasicAuth("AAI", "AAI"), verify=False)
-        if response.status_code == 200:
-            response_body = response.json()
-            available_bandwidth = response_body["bandwidth-attributes"]["bandwidth-attribute"][0]["available-bandwidth-map"]["available-bandwidth"]
-            for i in available_bandwidth:
-                if i["odu-type"] == service_rate and i["number"] > 0:
-                    return True
+        return self.get_available_odus(interface_url, osdf_config, service_rate) > 0
+
+
+    def get_available_odus(self, interface_url, osdf_config, service_rate):
+        """
+        Number of ODUs of the service rate available on the given interface
+        :return: number of ODUs, 0 if the interface is not found
+        """
+        try:
+            response_body = AAIClient(osdf_config).get(interface_url + "?depth=all", endpoint="p-interface")
+        except AAIException as e:
+            audit_log.info("Bandwidth of {} not available: {}".format(interface_url, e))
+            return 0
+        available_bandwidth = response_body["bandwidth-attributes"]["bandwidth-attribute"][0]["available-bandwidth-map"]["available-bandwidth"]
+        return sum(max(i["number"], 0) for i in available_bandwidth if i["odu-type"] == service_rate)
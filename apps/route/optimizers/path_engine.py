@@ -0,0 +1,169 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+In-process shortest path search for the route optimizers
+
+route_opt.mzn selects the cheapest set of directed links carrying one unit of flow from Start to End, which,
+for non-negative link costs, is a shortest path. Dijkstra's algorithm over the adjacency lists of the links
+finds it without starting MiniZinc, and the result has the same form as the MiniZinc solutions. Alternative
+routes are the k shortest loopless paths (Yen's algorithm) or paths not sharing any link.
+"""
+
+from collections import defaultdict
+import heapq
+import math
+
+ENGINES = ["native", "minizinc"]
+
+
+class RouteGraph(object):
+    """Directed graph of links, as adjacency lists of (link index, end node, cost)"""
+
+    def __init__(self, edge_start, edge_end, link_cost):
+        self.edge_start = list(edge_start)
+        self.edge_end = list(edge_end)
+        self.link_cost = list(link_cost)
+        self.adjacency = defaultdict(list)
+        for link, (start, end, cost) in enumerate(zip(self.edge_start, self.edge_end, link_cost)):
+            self.adjacency[start].append((link, end, cost))
+
+    def shortest_path(self, start, end, excluded_links=(), excluded_nodes=()):
+        """Indices of the links of a cheapest path from start to end, in path order, or None if there is none
+
+        :param excluded_links: indices of links the path may not use
+        :param excluded_nodes: nodes the path may not pass through
+        """
+        if start == end:
+            return []
+        cost_to = {start: 0}
+        via = {}
+        queue = [(0, start)]
+        while queue:
+            cost, node = heapq.heappop(queue)
+            if node == end:
+                break
+            if cost > cost_to[node]:
+                continue  # an outdated entry
+            for link, nbr, link_cost in self.adjacency[node]:
+                if link in excluded_links or nbr in excluded_nodes:
+                    continue
+                if nbr not in cost_to or cost + link_cost < cost_to[nbr]:
+                    cost_to[nbr] = cost + link_cost
+                    via[nbr] = link
+                    heapq.heappush(queue, (cost + link_cost, nbr))
+        if end not in via:
+            return None
+        path = []
+        node = end
+        while node != start:
+            path.append(via[node])
+            node = self.edge_start[via[node]]
+        return path[::-1]
+
+    def cost(self, path):
+        return sum(self.link_cost[link] for link in path)
+
+    def k_shortest_paths(self, start, end, k):
+        """Up to k cheapest loopless paths from start to end (Yen's algorithm), cheapest first"""
+        path = self.shortest_path(start, end)
+        if path is None:
+            return []
+        paths = [path]
+        seen = {tuple(path)}
+        candidates = []  # heap of (cost, path)
+        while len(paths) < k:
+            last = paths[-1]
+            nodes = [start] + [self.edge_end[link] for link in last]
+            for i in range(len(last)):
+                root = last[:i]
+                used = {p[i] for p in paths if len(p) > i and p[:i] == root}
+                spur = self.shortest_path(nodes[i], end, used, set(nodes[:i]))
+                if spur is not None and tuple(root + spur) not in seen:
+                    seen.add(tuple(root + spur))
+                    heapq.heappush(candidates, (self.cost(root + spur), root + spur))
+            if not candidates:
+                break
+            paths.append(heapq.heappop(candidates)[1])
+        return paths
+
+    def disjoint_paths(self, start, end, k, link_groups=None):
+        """Up to k paths from start to end which do not share any link, each the cheapest one avoiding the
+        links of the previous ones
+
+        :param link_groups: group of each link (e.g. the logical link of both directions of a link); links of
+                            the same group are not shared either
+        """
+        if start == end:
+            return [[]]
+        group_of = list(link_groups) if link_groups is not None else list(range(len(self.edge_start)))
+        groups = defaultdict(set)
+        for link, group in enumerate(group_of):
+            groups[group].add(link)
+        paths = []
+        excluded = set()
+        while len(paths) < k:
+            path = self.shortest_path(start, end, excluded)
+            if path is None:
+                break
+            paths.append(path)
+            for link in path:
+                excluded |= groups[group_of[link]]
+        return paths
+
+
+def solve(dzn_data, alternatives=1, disjoint=False, link_groups=None):
+    """Shortest path, and optionally alternative paths, for the data of route_opt.mzn
+
+    :param dzn_data: dict with N, M, Edge_Start, Edge_End, L, Start and End
+    :param alternatives: number of paths to find
+    :param disjoint: the alternatives do not share links with the shorter paths (see RouteGraph.disjoint_paths)
+    :param link_groups: group of each link, for disjoint paths
+    :return: solutions in the format of pymzn ([{'x': [0 or 1 for each link]}, ...]), cheapest first; no
+             solution if End cannot be reached
+    """
+    graph = RouteGraph(dzn_data['Edge_Start'], dzn_data['Edge_End'], dzn_data['L'])
+    if disjoint:
+        paths = graph.disjoint_paths(dzn_data['Start'], dzn_data['End'], alternatives, link_groups)
+    else:
+        paths = graph.k_shortest_paths(dzn_data['Start'], dzn_data['End'], alternatives)
+    solutions = []
+    for path in paths:
+        used = set(path)
+        solutions.append({'x': [int(link in used) for link in range(dzn_data['M'])]})
+    return solutions
+
+
+def bandwidth_costs(capacities):
+    """Link costs inversely proportional to the capacity of the links (the largest capacity costs 1)
+
+    :param capacities: capacity of each link, None if unknown
+    :return: list of integer costs; links of unknown or no capacity cost as much as the smallest known one
+    """
+    known = [c for c in capacities if c]
+    if not known:
+        return [1] * len(capacities)
+    largest = max(known)
+    highest_cost = math.ceil(largest / min(known))
+    return [math.ceil(largest / c) if c else highest_cost for c in capacities]
+
+
+def get_engine(osdf_config):
+    """Route engine from osdf_config.core['route']: native (default) or minizinc (route_opt.mzn)"""
+    return (osdf_config.core.get('route') or {}).get('engine', 'native')
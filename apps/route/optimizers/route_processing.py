@@ -0,0 +1,104 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+Post-processing of the route_opt.mzn solutions, shared by the route optimizers
+
+The solver output only tells which links are used. The route is rebuilt from it in linear time by indexing
+the links by their start node and walking from the source to the destination, and solutions which are not
+a single path from the source to the destination are rejected with a BusinessException. The options of
+the batch route requests are checked here too, so that a bad option fails the request instead of each route.
+"""
+
+from osdf.operation.exceptions import BusinessException
+
+LINK_WEIGHTS = ["hops", "bandwidth"]
+
+
+def route_options(options, request_options=None):
+    """Options of a route request: those of routeInfo overridden by those of the request
+
+    :param options: routeInfo.options of a batch
+    :param request_options: options of one of its route requests
+    :return: alternatives, disjoint and linkWeight, with their defaults if not given
+    :raises BusinessException: if alternatives is not a positive integer, disjoint is not a boolean
+                               or linkWeight is not one of LINK_WEIGHTS
+    """
+    merged = dict({"alternatives": 1, "disjoint": False, "linkWeight": "hops"}, **(options or {}))
+    merged.update(request_options or {})
+    alternatives = merged["alternatives"]
+    if isinstance(alternatives, bool) or not isinstance(alternatives, int) or alternatives < 1:
+        raise BusinessException("Invalid route option alternatives: {!r} is not a positive integer"
+                                .format(alternatives))
+    if not isinstance(merged["disjoint"], bool):
+        raise BusinessException("Invalid route option disjoint: {!r} is not a boolean".format(merged["disjoint"]))
+    if merged["linkWeight"] not in LINK_WEIGHTS:
+        raise BusinessException("Invalid route option linkWeight: {!r} is not one of {}"
+                                .format(merged["linkWeight"], ", ".join(LINK_WEIGHTS)))
+    return merged
+
+
+def selected_links(solutions, links):
+    """Links used by the best solution
+
+    :param solutions: solutions of route_opt.mzn ([{'x': [0 or 1 for each link]}, ...]), the best one first
+    :param links: the link of each index of x
+    :return: the used links, in the order of links
+    """
+    solutions = list(solutions)
+    if not solutions:
+        raise BusinessException("No route found: the solver returned no solution")
+    return [link for link, used in zip(links, solutions[0]['x']) if used == 1]
+
+
+def order_route(links, src, dst, start_of, end_of):
+    """Links of a route in order from src to dst
+
+    :param links: links used by a solution, in any order
+    :param src: source node
+    :param dst: destination node
+    :param start_of: function returning the start node of a link
+    :param end_of: function returning the end node of a link
+    :return: list of the links in route order
+    :raises BusinessException: if the links are not a single path from src to dst (two links leave the same
+                               node, the links loop, do not reach dst or include links off the path)
+    """
+    next_link = {}
+    for link in links:
+        node = start_of(link)
+        if node in next_link:
+            raise BusinessException("Invalid route: more than one link leaves {}".format(node))
+        next_link[node] = link
+
+    route = []
+    visited = {src}
+    node = src
+    while node != dst:
+        link = next_link.get(node)
+        if link is None:
+            raise BusinessException("Invalid route: the links from {} do not reach {}".format(src, dst))
+        route.append(link)
+        node = end_of(link)
+        if node in visited:
+            raise BusinessException("Invalid route: the links loop back to {}".format(node))
+        visited.add(node)
+    if len(route) != len(links):
+        raise BusinessException("Invalid route: {} links are not on the path from {} to {}"
+                                .format(len(links) - len(route), src, dst))
+    return route
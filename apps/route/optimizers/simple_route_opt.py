@@ -16,10 +16,16 @@
 # -------------------------------------------------------------------------
 #
 
-import requests
 import json
-from requests.auth import HTTPBasicAuth
-
+from operator import itemgetter
+
+from apps.route.optimizers import path_engine
+from apps.route.optimizers.route_processing import order_route
+from apps.route.optimizers.route_processing import route_options
+from apps.route.optimizers.route_processing import selected_links
+from apps.route.optimizers.topology import get_route_topology
+from apps.route.optimizers.topology import LOGICAL_LINKS
+from osdf.adapters.aai.aai_client import AAIClient
 from osdf.utils.mdc_utils import mdc_from_json
 from osdf.logging.osdf_logging import MH, audit_log, error_log, debug_log
 import pymzn
@@ -28,20 +34,10 @@ from sklearn import preprocessing
 import os
 BASE_DIR = os.path.dirname(__file__)
 
-class RouteOpt:
+SPEED_UNITS = {"kbps": 0.001, "mbps": 1, "gbps": 1000, "tbps": 1000000}
 
-    """
-    This values will need to deleted.. 
-    only added for the debug purpose 
-    """
-    # DNS server and standard port of AAI.. 
-    # TODO: read the port from the configuration and add to DNS
-    aai_headers = {
-        "X-TransactionId": "9999",
-        "X-FromAppId": "OOF",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+
+class RouteOpt:
 
     def is_cross_onap_link(self, logical_link):
         """
@@ -55,29 +51,31 @@ class RouteOpt:
         return False
 
     def get_links_name(self, routes,initial_start_edge,initial_end_edge, mappingTable):
-        routes=list(routes)
-        try:
-            arr=routes[0]['x']
-        except Exception as err:
-            audit_log.info("No satisfiable solutions found")
-            raise err
         listOfLinks=[]
-        for i in range(0, len(routes[0]['x'])):
+        for i in selected_links(routes, range(len(initial_start_edge))):
             individual_link = {}
-            if arr[i] == 1 :
-                # listOfLinks.append(self.fetchLogicalLinks(initial_start_edge[i], initial_end_edge[i], mappingTable))
-                individual_link["link"] = mappingTable[initial_start_edge[i] + ":" + initial_end_edge[i]]
-                individual_link["start_node"] = initial_start_edge[i]
-                individual_link["end_node"] = initial_end_edge[i]
-                listOfLinks.append(individual_link)
+            individual_link["link"] = mappingTable[initial_start_edge[i] + ":" + initial_end_edge[i]]
+            individual_link["start_node"] = initial_start_edge[i]
+            individual_link["end_node"] = initial_end_edge[i]
+            listOfLinks.append(individual_link)
 
         return listOfLinks
 
-    def solve(self, mzn_model, dzn_data):
+    def check_route(self, links, src_access_node_id, dst_access_node_id):
+        """
+        The links are listed in the order of AAI, but they must
+        form a single path from the source to the destination
+        """
+        order_route(links, src_access_node_id, dst_access_node_id, itemgetter("start_node"), itemgetter("end_node"))
+
+    def solve(self, mzn_model, dzn_data, engine="minizinc", alternatives=1, disjoint=False):
+        # route_opt.mzn only finds the optimal route, alternatives are always found by the native engine
+        if engine == "native" or alternatives > 1:
+            return path_engine.solve(dzn_data, alternatives, disjoint)
         return pymzn.minizinc(mzn=mzn_model, data=dzn_data)
 
-    def get_links(self, mzn_model, dzn_data, initial_start_edge,initial_end_edge, mappingTable):
-        routes = self.solve(mzn_model, dzn_data)
+    def get_links(self, mzn_model, dzn_data, initial_start_edge,initial_end_edge, mappingTable, engine="minizinc"):
+        routes = self.solve(mzn_model, dzn_data, engine)
         audit_log.info("mocked minizinc solution====>")
         audit_log.info(routes)
 
@@ -112,13 +110,32 @@ class RouteOpt:
         audit_log.info(parseTemplate)
         return parseTemplate
 
-    def build_dzn_data(self, src_access_node_id, dst_access_node_id, osdf_config):
-        Edge_Start = []
-        Edge_End = []
-        logical_links = self.get_logical_links(osdf_config)
+    def get_route_graph(self, osdf_config):
+        """
+        Links inside the local ONAP and the numbering of their nodes,
+        built once per snapshot of the route topology when it is enabled
+        :return: (Edge_Start, Edge_End, mappingTable, label encoder, Link_Speed)
+        """
+        topology = get_route_topology(osdf_config)
+        if topology is None:
+            return self.build_route_graph(self.get_logical_links(osdf_config)['logical-link'])
+        snapshot = topology.snapshot(LOGICAL_LINKS)
+        return snapshot.derived("route-graph", lambda: self.build_route_graph(snapshot.entities))
 
+    def get_link_speed(self, logical_link):
+        """
+        Speed of a logical link in Mbps (from speed-value and speed-units)
+        :return: speed, None if not known
+        """
+        try:
+            return float(logical_link["speed-value"]) * SPEED_UNITS[logical_link.get("speed-units", "Mbps").lower()]
+        except (KeyError, TypeError, ValueError):
+            return None
 
-        logical_links = logical_links['logical-link']
+    def build_route_graph(self, logical_links):
+        Edge_Start = []
+        Edge_End = []
+        Link_Speed = []
         audit_log.info("mocked response of AAI received (logical links) successful===>")
         audit_log.info(logical_links)
         # prepare map table
@@ -151,6 +168,7 @@ class RouteOpt:
                         audit_log.info('relationshipEndNodeID')
                         audit_log.info(relationshipEndNodeID)
                         Edge_End.append(relationshipEndNodeID)
+                        Link_Speed.append(self.get_link_speed(logical_link))
                 else:
                     continue
 
@@ -160,6 +178,15 @@ class RouteOpt:
         # labeling ip to number for mapping
         le = preprocessing.LabelEncoder()
         le.fit(Edge_Start + Edge_End)
+        return Edge_Start, Edge_End, mappingTable, le, Link_Speed
+
+    def build_dzn_data(self, src_access_node_id, dst_access_node_id, osdf_config, route_graph=None,
+                       link_weight="hops"):
+        """
+        :param route_graph: links and their numbering (see get_route_graph), if already built
+        :param link_weight: hops (every link costs 1) or bandwidth (faster links cost less)
+        """
+        Edge_Start, Edge_End, mappingTable, le, Link_Speed = route_graph or self.get_route_graph(osdf_config)
         dzn_start_edge = le.transform(Edge_Start)
 
         final_dzn_start_arr = []
@@ -175,9 +202,12 @@ class RouteOpt:
         audit_log.info(final_dzn_start_arr)
         audit_log.info(final_dzn_end_arr)
 
-        link_cost  = []
-        for k in range(0, len(final_dzn_start_arr)):
-            link_cost.append(1)
+        if link_weight == "bandwidth":
+            link_cost = path_engine.bandwidth_costs(Link_Speed)
+        else:
+            link_cost  = []
+            for k in range(0, len(final_dzn_start_arr)):
+                link_cost.append(1)
 
         audit_log.info("src_access_node_id")
         audit_log.info(src_access_node_id)
@@ -237,7 +267,9 @@ class RouteOpt:
             #mzn_model = "/home/root1/Videos/projects/osdf/test/functest/simulators/osdf/optimizers/routeopt/route_opt.mzn"
             mzn_model = os.path.join(BASE_DIR, 'route_opt.mzn')
 
-            routeSolutions = self.get_links(mzn_model, dzn_data, initial_start_edge,initial_end_edge, mappingTable)
+            routeSolutions = self.get_links(mzn_model, dzn_data, initial_start_edge,initial_end_edge, mappingTable,
+                                            path_engine.get_engine(osdf_config))
+            self.check_route(routeSolutions, src_access_node_id, dst_access_node_id)
 
             return {
             "requestId": request["requestInfo"]["requestId"],
@@ -250,6 +282,54 @@ class RouteOpt:
             audit_log.info(err)
             raise err
 
+    def get_routes(self, request, osdf_config):
+        """
+        Finds the routes of all the route requests of routeInfo.routeRequests
+        over the same snapshot of the links, with alternative routes if
+        requested in routeInfo.options or the options of a route request
+        (alternatives, disjoint, linkWeight: hops or bandwidth)
+        :return: one solution per route request, with its routes (the best one first)
+        :raises BusinessException: if the options of a route request are not valid
+        """
+        try:
+            route_info = request["routeInfo"]
+            options = [route_options(route_info.get("options"), route_request.get("options"))
+                       for route_request in route_info["routeRequests"]]
+            route_graph = self.get_route_graph(osdf_config)
+            engine = path_engine.get_engine(osdf_config)
+            solutions = [self.get_route_solution(route_request, request_options, route_graph, engine)
+                         for route_request, request_options in zip(route_info["routeRequests"], options)]
+            return {
+                "requestId": request["requestInfo"]["requestId"],
+                "transactionId": request["requestInfo"]["transactionId"],
+                "statusMessage": " ",
+                "requestStatus": "accepted",
+                "solutions": solutions
+            }
+        except Exception as err:
+            audit_log.info(err)
+            raise err
+
+    def get_route_solution(self, route_request, options, route_graph, engine):
+        src_access_node_id = route_request["srcPort"]["accessNodeId"]
+        dst_access_node_id = route_request["dstPort"]["accessNodeId"]
+        solution = {"srcAccessNodeId": src_access_node_id, "dstAccessNodeId": dst_access_node_id}
+        try:
+            dzn_data, initial_start_edge, initial_end_edge, mappingTable = self.build_dzn_data(
+                src_access_node_id, dst_access_node_id, None, route_graph, options["linkWeight"])
+            mzn_model = os.path.join(BASE_DIR, 'route_opt.mzn')
+            routes = self.solve(mzn_model, dzn_data, engine, options["alternatives"], options["disjoint"])
+            solution["routeStatus"] = "success" if routes else "not found"
+            solution["routes"] = [self.get_links_name([route], initial_start_edge, initial_end_edge, mappingTable)
+                                  for route in routes]
+            for links in solution["routes"]:
+                self.check_route(links, src_access_node_id, dst_access_node_id)
+        except Exception as err:
+            audit_log.info("Route from {} to {} failed: {}".format(src_access_node_id, dst_access_node_id, err))
+            solution["routeStatus"] = "failed"
+            solution["statusMessage"] = str(err)
+        return solution
+
     def get_logical_links(self, osdf_config):
         """
         This method returns list of all cross ONAP links
@@ -258,9 +338,4 @@ class RouteOpt:
         """
 
         config = osdf_config.deployment
-        aai_url = config["aaiUrl"]
-        aai_req_url = aai_url + config["aaiGetLinksUrl"]
-
-        response = requests.get(aai_req_url,headers=self.aai_headers,auth=HTTPBasicAuth("AAI", "AAI"),verify=False)
-        if response.status_code == 200:
-            return response.json()
\ No newline at end of file
+        return AAIClient(osdf_config).get(config["aaiGetLinksUrl"], endpoint="logical-links")
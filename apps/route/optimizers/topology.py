@@ -0,0 +1,242 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+Long-lived in-memory copy of the AAI topology used by the route optimizers
+
+The logical links, inter-domain links and SDN controllers are loaded from AAI when they are first needed and
+then fully reloaded every refresh_interval seconds. In between, link add/remove/status updates are applied
+as they arrive, as AAI-EVENT notifications read from DMaaP or pushed to OSDF. Route queries only read the
+current snapshot, and whatever they derive from it (e.g. the node numbering) is built once per snapshot.
+"""
+
+from collections import OrderedDict
+import itertools
+import json
+import threading
+import time
+
+from osdf.adapters.aai.aai_client import AAIClient
+from osdf.adapters.dcae.message_router import MessageRouterClient
+from osdf.logging.osdf_logging import debug_log
+from osdf.logging.osdf_logging import error_log
+
+LOGICAL_LINKS = "logical-links"
+INTER_DOMAIN_LINKS = "inter-domain-links"
+CONTROLLERS = "controllers"
+
+
+def is_up(logical_link):
+    return logical_link.get("operational-status", "up").lower() == "up"
+
+
+def is_inter_domain(logical_link):
+    return logical_link.get("link-type") == "inter-domain" and is_up(logical_link)
+
+
+class TopologySource(object):
+    """Entities of one AAI entity type loaded by one AAI query
+
+    :param entity_type: AAI entity type (as in the event-header of AAI events)
+    :param key_field: field identifying an entity
+    :param load: function returning the list of entities
+    :param accepts: whether an updated entity belongs to the source (it is dropped from the source otherwise);
+                    the loaded entities are already filtered by the AAI query
+    """
+
+    def __init__(self, entity_type, key_field, load, accepts=None):
+        self.entity_type = entity_type
+        self.key_field = key_field
+        self.load = load
+        self.accepts = accepts or (lambda entity: True)
+
+
+class TopologySnapshot(object):
+    """Entities of a source at one point in time; never modified, updates create a new snapshot"""
+
+    def __init__(self, version, by_key):
+        self.version = version
+        self.by_key = by_key
+        self.entities = list(by_key.values())
+        self.created = time.time()
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def derived(self, name, build):
+        """Data derived from the entities, built by build() on first use and shared by later queries"""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = build()
+            return self._derived[name]
+
+
+class RouteTopology(object):
+    """Snapshots of the topology sources, kept up to date by periodic reloads and incremental updates"""
+
+    def __init__(self, sources, refresh_interval=300, event_source=None, event_retry_interval=30):
+        self.sources = sources
+        self.refresh_interval = refresh_interval
+        self._snapshots = {}
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in sources}
+        self._counters = {"loads": 0, "loadErrors": 0, "events": 0, "ignoredEvents": 0, "eventErrors": 0}
+        if refresh_interval:
+            threading.Thread(target=self._refresh_loop, name="osdf-route-topology-refresh", daemon=True).start()
+        if event_source is not None:
+            threading.Thread(target=self._event_loop, args=(event_source, event_retry_interval),
+                             name="osdf-route-topology-events", daemon=True).start()
+
+    def snapshot(self, name):
+        """Current snapshot of a source (loaded from AAI if it is not loaded yet)"""
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+        return snapshot if snapshot is not None else self.load(name, only_missing=True)
+
+    def load(self, name, only_missing=False):
+        """(Re)load all the entities of a source from AAI
+
+        :param name: source name
+        :param only_missing: do not reload a source someone else loaded in the meantime
+        :return: the new snapshot
+        """
+        source = self.sources[name]
+        with self._load_locks[name]:
+            if only_missing and name in self._snapshots:
+                return self._snapshots[name]
+            try:
+                entities = source.load()
+            except Exception:
+                with self._lock:
+                    self._counters["loadErrors"] += 1
+                raise
+            with self._lock:
+                self._counters["loads"] += 1
+                snapshot = TopologySnapshot(next(self._versions),
+                                            OrderedDict((e[source.key_field], e) for e in entities))
+                self._snapshots[name] = snapshot
+        debug_log.debug("Loaded {} {} for routing (version {})".format(len(entities), name, snapshot.version))
+        return snapshot
+
+    def apply_events(self, events):
+        """Apply AAI events to the loaded sources
+
+        :param events: list of AAI events ({"event-header": {"entity-type": ..., "action": "CREATE", "UPDATE"
+                       or "DELETE"}, "entity": {...}}), as dicts or json strings
+        :return: number of entities added, changed or removed
+        """
+        updates = {}  # source name -> key -> entity, None if removed
+        for event in events:
+            event = json.loads(event) if isinstance(event, str) else event
+            header = event.get("event-header") or {}
+            entity = event.get("entity") or {}
+            matched = False
+            for name, source in self.sources.items():
+                if header.get("entity-type") != source.entity_type or source.key_field not in entity:
+                    continue
+                matched = True
+                keep = str(header.get("action")).upper() != "DELETE" and source.accepts(entity)
+                updates.setdefault(name, {})[entity[source.key_field]] = entity if keep else None
+            with self._lock:
+                self._counters["events" if matched else "ignoredEvents"] += 1
+
+        changed = 0
+        with self._lock:
+            for name, entity_updates in updates.items():
+                snapshot = self._snapshots.get(name)
+                if snapshot is None:
+                    continue  # the update is seen when the source is first loaded
+                by_key = OrderedDict(snapshot.by_key)
+                for key, entity in entity_updates.items():
+                    if entity is not None:
+                        by_key[key] = entity
+                    elif by_key.pop(key, None) is None:
+                        continue
+                    changed += 1
+                self._snapshots[name] = TopologySnapshot(next(self._versions), by_key)
+        return changed
+
+    def stats(self):
+        with self._lock:
+            sources = {name: {"version": s.version, "size": len(s.entities), "loadedAt": s.created}
+                       for name, s in self._snapshots.items()}
+            return dict(self._counters, sources=sources, refreshInterval=self.refresh_interval)
+
+    def _refresh_loop(self):
+        while True:
+            time.sleep(self.refresh_interval)
+            with self._lock:
+                names = list(self._snapshots)
+            for name in names:
+                try:
+                    self.load(name)
+                except Exception as err:  # keep the current snapshot until the next refresh
+                    error_log.error("Reloading the {} for routing failed: {}".format(name, err))
+
+    def _event_loop(self, event_source, retry_interval):
+        while True:
+            try:
+                events = event_source.get()
+                changed = self.apply_events(events or [])
+                debug_log.debug("Applied {} AAI events, {} topology changes".format(len(events or []), changed))
+            except Exception as err:
+                with self._lock:
+                    self._counters["eventErrors"] += 1
+                error_log.error("Reading the AAI events for routing failed: {}".format(err))
+                time.sleep(retry_interval)
+
+
+def aai_sources(osdf_config):
+    """The topology sources of the route optimizers, loaded with the AAI queries of osdf_config.deployment"""
+    config = osdf_config.deployment
+
+    def query(url, endpoint, field):
+        return lambda: AAIClient(osdf_config).get(config[url], endpoint=endpoint).get(field) or []
+
+    return {
+        LOGICAL_LINKS: TopologySource("logical-link", "link-name",
+                                      query("aaiGetLinksUrl", "logical-links", "logical-link"), is_up),
+        INTER_DOMAIN_LINKS: TopologySource("logical-link", "link-name",
+                                           query("aaiGetInterDomainLinksUrl", "inter-domain-links", "logical-link"),
+                                           is_inter_domain),
+        CONTROLLERS: TopologySource("esr-thirdparty-sdnc", "thirdparty-sdnc-id",
+                                    query("aaiGetControllersUrl", "controllers", "esr-thirdparty-sdnc")),
+    }
+
+
+_topology = None
+_topology_lock = threading.Lock()
+
+
+def get_route_topology(osdf_config):
+    """The process-wide RouteTopology, or None if osdf_config.deployment['routeTopology'] does not enable it"""
+    global _topology
+    conf = osdf_config.deployment.get('routeTopology') or {}
+    if not conf.get('enabled', False):
+        return None
+    with _topology_lock:
+        if _topology is None:
+            event_source = None
+            if conf.get('aai_event_topic_url'):
+                event_source = MessageRouterClient(conf['aai_event_topic_url'],
+                                                   conf.get('consumer_group_id', 'osdf-route-topology:osdf'),
+                                                   userid_passwd=conf.get('userid_passwd', ':'))
+            _topology = RouteTopology(aai_sources(osdf_config), conf.get('refresh_interval', 300), event_source,
+                                      conf.get('event_retry_interval', 30))
+        return _topology
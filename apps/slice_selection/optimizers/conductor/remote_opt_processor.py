@@ -21,7 +21,6 @@ Module for processing slice selection request
 """
 
 from requests import RequestException
-from threading import Thread
 import traceback
 
 from apps.slice_selection.optimizers.conductor.response_processor import ResponseProcessor
@@ -33,9 +32,8 @@ from osdf.utils.interfaces import get_rest_client
 from osdf.utils.mdc_utils import mdc_from_json
 
 
-class SliceSelectionOptimizer(Thread):
+class SliceSelectionOptimizer(object):
     def __init__(self, osdf_config, slice_config, request_json, model_type):
-        super().__init__()
         self.osdf_config = osdf_config
         self.slice_config = slice_config
         self.request_json = request_json
@@ -46,9 +44,11 @@ class SliceSelectionOptimizer(Thread):
         self.process_slice_selection_opt()
 
     def process_slice_selection_opt(self):
-        """Process the slice selection request from the API layer"""
+        """Process the slice selection request from the API layer
+
+        The response for a plan sent to Conductor is sent by complete_slice_selection once the plan is done
+        """
         req_info = self.request_json['requestInfo']
-        rc = get_rest_client(self.request_json, service='so')
 
         try:
             if self.model_type == 'NSSI' \
@@ -57,14 +57,33 @@ class SliceSelectionOptimizer(Thread):
                 final_response = self.response_processor.get_slice_selection_response([])
 
             else:
-                final_response = self.do_slice_selection()
+                self.do_slice_selection()
+                return
+
+        except Exception as ex:
+            error_log.error("Error for {} {}".format(req_info.get('requestId'),
+                                                     traceback.format_exc()))
+            error_message = str(ex)
+            final_response = self.response_processor.process_error_response(error_message)
 
+        self.send_response(final_response)
+
+    def complete_slice_selection(self, plan, model_info):
+        """Send the slice selection response for a done Conductor plan"""
+        req_info = self.request_json['requestInfo']
+        mdc_from_json(self.request_json)
+        try:
+            final_response = self.process_conductor_response(plan, model_info)
         except Exception as ex:
             error_log.error("Error for {} {}".format(req_info.get('requestId'),
                                                      traceback.format_exc()))
             error_message = str(ex)
             final_response = self.response_processor.process_error_response(error_message)
+        self.send_response(final_response)
 
+    def send_response(self, final_response):
+        req_info = self.request_json['requestInfo']
+        rc = get_rest_client(self.request_json, service='so')
         try:
             rc.request(json=final_response, noresponse=True)
         except RequestException:
@@ -88,13 +107,18 @@ class SliceSelectionOptimizer(Thread):
             }
         ]
 
+        template_fields = {
+            'location_enabled': False,
+            'version': '2020-08-13'
+        }
+        service_type = self.model_type.lower() + "_selection"
+        plan = conductor.request_async(req_info, demands, request_parameters, {}, template_fields,
+                                       self.osdf_config, policies, service_type=service_type)
+        conductor.on_plan_done(plan, service_type, self.complete_slice_selection, model_info)
+
+    def process_conductor_response(self, plan, model_info):
         try:
-            template_fields = {
-                'location_enabled': False,
-                'version': '2020-08-13'
-            }
-            resp = conductor.request(req_info, demands, request_parameters, {}, template_fields,
-                                     self.osdf_config, policies)
+            resp = plan.result()
         except RequestException as e:
             resp = e.response.json()
             error = resp['plans'][0]['message']
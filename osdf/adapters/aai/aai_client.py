@@ -0,0 +1,146 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+"""
+Client for all the calls OSDF makes to AAI
+"""
+
+from collections import defaultdict
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests import RequestException
+import urllib3
+
+from osdf.logging.osdf_logging import debug_log
+from osdf.utils.http_sessions import get_session
+
+AAI_HEADERS = {
+    "X-TransactionId": "9999",
+    "X-FromAppId": "OOF",
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+}
+
+
+class AAIException(Exception):
+    pass
+
+
+class EndpointLatency(object):
+    """Latency statistics of the calls made to each AAI endpoint (served by GET /api/oof/v1/aai/latency)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(lambda: {"count": 0, "errors": 0, "total": 0.0, "max": 0.0})
+
+    def record(self, endpoint, elapsed, error=False):
+        with self._lock:
+            stats = self._stats[endpoint]
+            stats["count"] += 1
+            stats["errors"] += int(error)
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    def stats(self):
+        with self._lock:
+            return {k: dict(v, mean=v["total"] / v["count"]) for k, v in self._stats.items()}
+
+
+latency = EndpointLatency()
+
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def _concurrency_slots(aai_url, limit):
+    """Semaphore limiting the number of concurrent calls to an AAI instance (shared by all clients)"""
+    with _slots_lock:
+        if aai_url not in _slots:
+            _slots[aai_url] = threading.BoundedSemaphore(limit)
+        return _slots[aai_url]
+
+
+class AAIClient(object):
+    """Pooled, rate-limited access to AAI using the aai* settings of osdf_config.deployment"""
+
+    def __init__(self, osdf_config):
+        config = osdf_config.deployment
+        self.aai_url = config["aaiUrl"]
+        self.auth = (config.get("aaiUsername", "AAI"), config.get("aaiPassword", "AAI"))
+        timeout = config.get("aaiTimeout", [10, 60])
+        self.timeout = tuple(timeout) if isinstance(timeout, list) else timeout
+        self.verify = config.get("aaiVerify", False)
+        if not self.verify:
+            # AAI is deployed with self-signed certificates; only then is the warning of every call muted
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.slots = _concurrency_slots(self.aai_url, config.get("aaiMaxConcurrency", 10))
+        self.session = get_session(self.aai_url, self.auth)
+
+    def url(self, path):
+        """Full URL for a path (paths from AAI related-links are relative to the AAI base URL)"""
+        return path if path.startswith("http") else self.aai_url + path
+
+    def get(self, path, endpoint=None):
+        """GET a resource from AAI
+
+        :param path: path (or full URL) of the resource
+        :param endpoint: name under which the latency is recorded (default: the path without query)
+        :return: response body as json
+        """
+        return self._call("GET", self.url(path), endpoint)
+
+    def put(self, path, data, endpoint=None):
+        """PUT (e.g. for custom queries) to AAI
+
+        :param path: path (or full URL) of the resource
+        :param data: request body (will be json encoded)
+        :param endpoint: name under which the latency is recorded (default: the path without query)
+        :return: response body as json
+        """
+        return self._call("PUT", self.url(path), endpoint, data=json.dumps(data))
+
+    def dsl_query(self, query, output_format, dsl_path):
+        """Execute an AAI DSL query
+
+        :param query: dsl query to be executed
+        :param output_format: format of the output
+        :param dsl_path: path of the dsl API (without the format)
+        :return: response body as json
+        """
+        return self.put(dsl_path + output_format, {'dsl': query}, endpoint="dsl")
+
+    def _call(self, method, url, endpoint, **kwargs):
+        endpoint = endpoint or urlsplit(url).path
+        request = self.session.get if method == "GET" else self.session.put
+        debug_log.debug("aai request: {} {}".format(method, url))
+        start = time.monotonic()
+        with self.slots:
+            try:
+                response = request(url, headers=AAI_HEADERS, auth=self.auth, timeout=self.timeout,
+                                   verify=self.verify, **kwargs)
+            except RequestException as e:
+                latency.record(endpoint, time.monotonic() - start, error=True)
+                raise AAIException("Request exception was encountered {}".format(e))
+        latency.record(endpoint, time.monotonic() - start, error=response.status_code != 200)
+        if response.status_code != 200:
+            raise AAIException("Response code other than 200 from AAI for the request {}: {}"
+                               .format(url, response.status_code))
+        return response.json()
@@ -16,26 +16,10 @@
 # -------------------------------------------------------------------------
 #
 
-import json
-import requests
-from requests.auth import HTTPBasicAuth
-from requests import RequestException
-
+from osdf.adapters.aai.aai_client import AAIClient
+from osdf.adapters.aai.aai_client import AAIException  # noqa: F401
 from osdf.logging.osdf_logging import debug_log
 
-AAI_HEADERS = {
-    "X-TransactionId": "9999",
-    "X-FromAppId": "OOF",
-    "Accept": "application/json",
-    "Content-Type": "application/json",
-}
-
-AUTH = HTTPBasicAuth("AAI", "AAI")
-
-
-class AAIException(Exception):
-    pass
-
 
 def get_aai_data(request_json, osdf_config):
 
@@ -48,20 +32,11 @@ def get_aai_data(request_json, osdf_config):
 
     nxi_id = request_json["NxIId"]
     config = osdf_config.deployment
-    aai_url = config["aaiUrl"]
-    aai_req_url = aai_url + config["aaiServiceInstanceUrl"] + nxi_id + "?depth=2"
-
-    try:
-        debug_log.debug("aai request: {}".format(aai_req_url))
-        response = requests.get(aai_req_url, headers=AAI_HEADERS, auth=AUTH, verify=False)
-        debug_log.debug("aai response: {}".format(response.json()))
-    except RequestException as e:
-        raise AAIException("Request exception was encountered {}".format(e))
+    aai_req_path = config["aaiServiceInstanceUrl"] + nxi_id + "?depth=2"
 
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise AAIException("Error response recieved from AAI for the request {}".format(aai_req_url))
+    response = AAIClient(osdf_config).get(aai_req_path, endpoint="service-instance")
+    debug_log.debug("aai response: {}".format(response))
+    return response
 
 
 def execute_dsl_query(query, format, osdf_config):
@@ -73,18 +48,7 @@ def execute_dsl_query(query, format, osdf_config):
            :return:response body from AAI
     """
     config = osdf_config.deployment
-    dsl_url = config["aaiUrl"] + config["dslQueryPath"] + format
-
-    data = json.dumps({'dsl': query})
-    debug_log.debug("aai dsl request: {}".format(data))
-    try:
-        response = requests.put(dsl_url, data=data, headers=AAI_HEADERS, auth=AUTH, verify=False)
-        debug_log.debug("aai dsl response: {}".format(response))
-    except RequestException as ex:
-        raise AAIException("Request exception was encountered {}".format(ex))
-
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise AAIException("Response code other than 200 from AAI: {} {}".format(response.status_code,
-                                                                                 response.content))
+    debug_log.debug("aai dsl request: {}".format(query))
+    response = AAIClient(osdf_config).dsl_query(query, format, config["dslQueryPath"])
+    debug_log.debug("aai dsl response: {}".format(response))
+    return response
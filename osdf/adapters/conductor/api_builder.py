@@ -17,12 +17,11 @@
 # -------------------------------------------------------------------------
 #
 
+from functools import lru_cache
 from jinja2 import Template
 import json
 
 import osdf.adapters.conductor.translation as tr
-from osdf.adapters.policy.utils import group_policies_gen
-from osdf.utils.programming_utils import list_flatten
 
 
 def _build_parameters(group_policies, service_info, request_parameters):
@@ -34,7 +33,7 @@ def _build_parameters(group_policies, service_info, request_parameters):
         :return:
         """
     initial_params = tr.get_opt_query_data(request_parameters,
-                                           group_policies['onap.policies.optimization.service.QueryPolicy'])
+                                           group_policies.get('onap.policies.optimization.service.QueryPolicy', []))
     params = dict()
     params.update({"REQUIRED_MEM": initial_params.pop("requiredMemory", "")})
     params.update({"REQUIRED_DISK": initial_params.pop("requiredDisk", "")})
@@ -49,9 +48,74 @@ def _build_parameters(group_policies, service_info, request_parameters):
     return params
 
 
+def _build_sections(demands, request_parameters, service_info, flat_policies, local_config):
+    """Demands, constraints, optimization and parameters sections of the request to Conductor"""
+    compiled = tr.compile_policies(flat_policies, local_config)
+    demand_name_list = []
+    for demand in demands:
+        demand_name_list.append(demand['resourceModuleName'].lower())
+    demand_list = compiled.gen_demands(demands)
+    policy_groups = compiled.gen_constraints(demand_name_list)
+    optimization_policy_list = tr.gen_optimization_policy(
+        demand_name_list, compiled.policies('onap.policies.optimization.resource.OptimizationPolicy'))
+    req_params_dict = _build_parameters(compiled.grouped_policies, service_info, request_parameters)
+    return demand_list, policy_groups, optimization_policy_list, req_params_dict
+
+
+def _merge(list_of_dicts):
+    merged = {}
+    for elem in list_of_dicts:
+        merged.update(elem)
+    return merged
+
+
+def conductor_payload(req_info, demands, request_parameters, service_info,
+                      template_fields, flat_policies: list, local_config):
+    """Build the request for HAS-Conductor/Placement optimization as a dict (to be serialized only once, when sent)
+
+    The result is the same as the one of rendering templates/conductor_interface.json
+    :param req_info: parameter data received from a client
+    :param demands: list of demands
+    :param request_parameters: request parameters
+    :param service_info: service info object
+    :param template_fields: Fields that has to be passed to the template to render
+    :param flat_policies: policy data received from the policy platform (flat policies)
+    :param local_config: local configuration file with pointers for
+           the service specific information
+    :return: request to be sent to Conductor/placement optimization
+    """
+    demand_list, policy_groups, optimization_policy_list, req_params_dict = _build_sections(
+        demands, request_parameters, service_info, flat_policies, local_config)
+    homing_template = {"homing_template_version": str(template_fields.get('version')),
+                       "parameters": req_params_dict}
+    if template_fields.get('location_enabled'):
+        homing_template["locations"] = {
+            "customer_loc": {
+                "latitude": {"get_param": "customer_lat"},
+                "longitude": {"get_param": "customer_long"}
+            }
+        }
+    homing_template["demands"] = demand_list
+    homing_template["constraints"] = _merge(policy_groups)
+    homing_template["optimization"] = _merge(optimization_policy_list)
+    return {
+        "name": str(req_info['requestId']),
+        "files": {},
+        "timeout": req_info['timeout'],
+        "num_solution": str(req_info['numSolutions']),
+        "template": homing_template
+    }
+
+
+@lru_cache(maxsize=None)
+def compiled_template(template):
+    """Jinja template, read and compiled only once"""
+    with open(template) as fid:
+        return Template(fid.read())
+
+
 def conductor_api_builder(req_info, demands, request_parameters, service_info,
-                          template_fields, flat_policies: list, local_config,
-                          template="osdf/adapters/conductor/templates/conductor_interface.json"):
+                          template_fields, flat_policies: list, local_config, template=None):
     """Build an OSDF southbound API call for HAS-Conductor/Placement optimization
 
         :param req_info: parameter data received from a client
@@ -61,53 +125,19 @@ def conductor_api_builder(req_info, demands, request_parameters, service_info,
         :param template_fields: Fields that has to be passed to the template to render
         :param flat_policies: policy data received from the policy platform (flat policies)
         :param template: template to generate southbound API call to conductor
+               (None => built directly, see conductor_payload)
         :param local_config: local configuration file with pointers for
                the service specific information
         :return: json to be sent to Conductor/placement optimization
         """
+    if template is None:
+        return json.dumps(conductor_payload(req_info, demands, request_parameters, service_info, template_fields,
+                                            flat_policies, local_config))
 
-    templ = Template(open(template).read())
-    gp = group_policies_gen(flat_policies, local_config)
-    demand_name_list = []
-    for demand in demands:
-        demand_name_list.append(demand['resourceModuleName'].lower())
-    demand_list = tr.gen_demands(demands, gp['onap.policies.optimization.resource.VnfPolicy'])
-    attribute_policy_list = tr.gen_attribute_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.AttributePolicy'])
-
-    distance_to_location_policy_list = tr.gen_distance_to_location_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.DistancePolicy'])
-    inventory_policy_list = tr.gen_inventory_group_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.InventoryGroupPolicy'])
-    resource_instance_policy_list = tr.gen_resource_instance_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.ResourceInstancePolicy'])
-    resource_region_policy_list = tr.gen_resource_region_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.ResourceRegionPolicy'])
-    zone_policy_list = tr.gen_zone_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.AffinityPolicy'])
-    optimization_policy_list = tr.gen_optimization_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.OptimizationPolicy'])
-    reservation_policy_list = tr.gen_reservation_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.InstanceReservationPolicy'])
-    capacity_policy_list = tr.gen_capacity_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.Vim_fit'])
-    hpa_policy_list = tr.gen_hpa_policy(
-        demand_name_list, gp['onap.policies.optimization.resource.HpaPolicy'])
-    threshold_policy_list = tr.gen_threshold_policy(demand_name_list,
-                                                    gp['onap.policies.optimization.resource.'
-                                                       'ThresholdPolicy'])
-    aggregation_policy_list = tr.gen_aggregation_policy(demand_name_list,
-                                                        gp['onap.policies.optimization.resource.'
-                                                           'AggregationPolicy'])
-    req_params_dict = _build_parameters(gp, service_info, request_parameters)
-    conductor_policies = [attribute_policy_list, distance_to_location_policy_list,
-                          inventory_policy_list, resource_instance_policy_list,
-                          resource_region_policy_list, zone_policy_list, reservation_policy_list,
-                          capacity_policy_list, hpa_policy_list, threshold_policy_list, aggregation_policy_list]
-    filtered_policies = [x for x in conductor_policies if len(x) > 0]
-    policy_groups = list_flatten(filtered_policies)
+    demand_list, policy_groups, optimization_policy_list, req_params_dict = _build_sections(
+        demands, request_parameters, service_info, flat_policies, local_config)
     request_type = req_info.get('requestType', None)
-    rendered_req = templ.render(
+    rendered_req = compiled_template(template).render(
         requestType=request_type,
         demand_list=demand_list,
         policy_groups=policy_groups,
@@ -17,18 +17,103 @@
 # -------------------------------------------------------------------------
 #
 
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError
 import json
+import logging
 from requests import RequestException
-import time
 
-from osdf.adapters.conductor.api_builder import conductor_api_builder
+from osdf.adapters.conductor.api_builder import conductor_payload
+from osdf.adapters.conductor.plan_poller import get_plan_poller
+from osdf.adapters.conductor.polling import polling_policy
 from osdf.logging.osdf_logging import debug_log
+from osdf.operation import worker_pool
 from osdf.operation.exceptions import BusinessException
+from osdf.operation.exceptions import WorkerPoolFullException
+from osdf.operation.exceptions import WorkerPoolUnavailableException
 from osdf.utils.interfaces import RestClient
 
+RESULT_GRACE = 60  # seconds a blocking caller waits past the plan timeout, in case the poller is stuck
+
 
 def request(req_info, demands, request_parameters, service_info, template_fields,
-            osdf_config, flat_policies):
+            osdf_config, flat_policies, service_type="placement"):
+    """Submit a plan to Conductor and wait for its final response
+
+    This blocks the calling thread until the plan is done; the API processors use request_async
+    and on_plan_done instead, so that their worker threads are free while Conductor is solving.
+    :return: Conductor's response for the completed plan
+    """
+    plan = request_async(req_info, demands, request_parameters, service_info, template_fields,
+                         osdf_config, flat_policies, service_type)
+    policy = plan_polling_policy(req_info, osdf_config, service_type)
+    wait_time = policy.first_delay + policy.timeout + RESULT_GRACE
+    try:
+        return plan.result(timeout=wait_time)
+    except TimeoutError:
+        raise BusinessException("No response for the Conductor plan of request_id {} after {} seconds"
+                                .format(req_info["requestId"], wait_time))
+
+
+def request_async(req_info, demands, request_parameters, service_info, template_fields,
+                  osdf_config, flat_policies, service_type="placement"):
+    """Submit a plan to Conductor and hand it over to the shared plan poller
+
+    The polling schedule is chosen per service_type (see osdf.adapters.conductor.polling)
+
+    :return: Future which resolves to Conductor's response for the completed plan (or raises
+             RequestException if Conductor reports an error, BusinessException on timeout); errors
+             while submitting the plan are reported through the Future as well
+    """
+    try:
+        rc, plan_url = submit_plan(req_info, demands, request_parameters, service_info, template_fields,
+                                   osdf_config, flat_policies)
+    except Exception as err:
+        plan = Future()
+        plan.set_exception(err)
+        return plan
+    policy = plan_polling_policy(req_info, osdf_config, service_type)
+    return get_plan_poller(osdf_config).watch(rc, plan_url, req_info["requestId"], policy, service_type)
+
+
+def on_plan_done(plan, service_type, callback, *args):
+    """Call callback(plan, *args) once the plan is done, without holding a thread while Conductor solves it
+
+    A plan which is already done (e.g. rejected by Conductor) is handled right away in the calling thread,
+    the others on the worker pool of service_type (or on the poller thread if that pool is full).
+    :param plan: Future returned by request_async
+    :param service_type: worker pool to continue on, e.g. placement, nsi_selection
+    :param callback: function taking the done plan and args
+    """
+    if plan.done():
+        callback(plan, *args)
+        return
+
+    def resume(done_plan):
+        try:
+            worker_pool.submit(service_type, callback, done_plan, *args)
+        except (WorkerPoolFullException, WorkerPoolUnavailableException):
+            callback(done_plan, *args)
+
+    plan.add_done_callback(resume)
+
+
+def plan_polling_policy(req_info, osdf_config, service_type):
+    """Polling policy for a plan, timing out after the client's timeout or the configured retries"""
+    config = osdf_config.deployment
+    max_retries = config.get('conductorMaxRetries', 30)
+    ping_wait_time = config.get('conductorPingWaitTime', 60)
+    # We are not counting initial request time, first call back, or time for HTTP request
+    max_timeout = min(req_info['timeout'], max_retries * ping_wait_time)
+    return polling_policy(osdf_config, service_type, max_timeout)
+
+
+def submit_plan(req_info, demands, request_parameters, service_info, template_fields,
+                osdf_config, flat_policies):
+    """Send the initial request for a plan to Conductor
+
+    :return: RestClient to follow up with, plan URL to poll
+    """
     config = osdf_config.deployment
     local_config = osdf_config.core
     uid, passwd = config['conductorUsername'], config['conductorPassword']
@@ -46,50 +131,15 @@ def request(req_info, demands, request_parameters, service_info, template_fields
             debug_log.debug("Versions set in HTTP header to "
                             "conductor: X-MinorVersion: {} ".format(x_minor_version))
 
-    max_retries = config.get('conductorMaxRetries', 30)
-    ping_wait_time = config.get('conductorPingWaitTime', 60)
-
     rc = RestClient(userid=uid, passwd=passwd, method="GET", log_func=debug_log.debug,
                     headers=headers)
-    conductor_req_json_str = conductor_api_builder(req_info, demands, request_parameters,
-                                                   service_info, template_fields, flat_policies,
-                                                   local_config)
-    conductor_req_json = json.loads(conductor_req_json_str)
+    conductor_req_json = conductor_payload(req_info, demands, request_parameters,
+                                           service_info, template_fields, flat_policies,
+                                           local_config)
 
     debug_log.debug("Sending first Conductor request for request_id {}".format(req_id))
 
-    resp, raw_resp = initial_request_to_conductor(rc, conductor_url, conductor_req_json)
-    # Very crude way of keeping track of time.
-    # We are not counting initial request time, first call back, or time for HTTP request
-    total_time, ctr = 0, 2
-    client_timeout = req_info['timeout']
-    configured_timeout = max_retries * ping_wait_time
-    max_timeout = min(client_timeout, configured_timeout)
-
-    while True:  # keep requesting conductor till we get a result or we run out of time
-        if resp is not None:
-            if resp["plans"][0].get("status") in ["error"]:
-                raise RequestException(response=raw_resp, request=raw_resp.request)
-
-            if resp["plans"][0].get("status") in ["done", "not found", "solved"]:
-                return resp
-            new_url = resp['plans'][0]['links'][0][0]['href']  # TODO(krishna): check why a list of lists
-
-        if total_time >= max_timeout:
-            raise BusinessException("Conductor could not provide a solution within {} seconds,"
-                                    "this transaction is timing out".format(max_timeout))
-        time.sleep(ping_wait_time)
-        ctr += 1
-        debug_log.debug("Attempt number {} url {}; prior status={}"
-                        .format(ctr, new_url, resp['plans'][0]['status']))
-        total_time += ping_wait_time
-
-        try:
-            raw_resp = rc.request(new_url, raw_response=True)
-            resp = raw_resp.json()
-        except RequestException as e:
-            debug_log.debug("Conductor attempt {} for request_id {} has failed because {}"
-                            .format(ctr, req_id, str(e)))
+    return rc, initial_request_to_conductor(rc, conductor_url, conductor_req_json)
 
 
 def initial_request_to_conductor(rc, conductor_url, conductor_req_json):
@@ -101,20 +151,14 @@ def initial_request_to_conductor(rc, conductor_url, conductor_req_json):
     :return: URL to check for follow up (similar to redirects);
              we keep checking these till we get a result/error
     """
-    debug_log.debug("Payload to Conductor: {}".format(json.dumps(conductor_req_json)))
+    if debug_log.isEnabledFor(logging.DEBUG):  # the payload can be large, serialize it for the log only if needed
+        debug_log.debug("Payload to Conductor: {}".format(json.dumps(conductor_req_json)))
     raw_resp = rc.request(url=conductor_url, raw_response=True, method="POST",
                           json=conductor_req_json)
     resp = raw_resp.json()
     if resp["status"] != "template":
         raise RequestException(response=raw_resp, request=raw_resp.request)
-    time.sleep(10)  # 10 seconds wait time to avoid being too quick!
     plan_url = resp["links"][0][0]["href"]
     debug_log.debug("Attempting to read the plan from "
                     "the conductor provided url {}".format(plan_url))
-    raw_resp = rc.request(raw_response=True,
-                          url=plan_url)
-    resp = raw_resp.json()
-
-    if resp["plans"][0]["status"] in ["error"]:
-        raise RequestException(response=raw_resp, request=raw_resp.request)
-    return resp, raw_resp  # now the caller of this will handle further follow-ups
+    return plan_url  # the plan poller will handle further follow-ups
@@ -0,0 +1,254 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+"""
+Shared poller for outstanding Conductor plans
+
+Instead of every request sleeping in its own thread between calls to Conductor, the plans are registered
+with a single scheduler thread which keeps them in a timer queue ordered by their next poll time. The
+HTTP calls themselves run on a small fixed pool, and each plan completes a Future when it is done.
+
+A watchdog thread fails the plans which are still not done well after their timeout and restarts the
+scheduler thread if it has died, so that no request waits forever for its plan.
+"""
+
+from collections import defaultdict
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import InvalidStateError
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import threading
+import time
+import traceback
+
+from requests import RequestException
+
+from osdf.logging.osdf_logging import debug_log
+from osdf.logging.osdf_logging import error_log
+from osdf.logging.osdf_logging import metrics_log
+from osdf.operation.exceptions import BusinessException
+
+FINAL_STATUSES = ["done", "not found", "solved"]
+ERROR_STATUSES = ["error"]
+
+
+class PlanWatch(object):
+    """State of a single outstanding Conductor plan"""
+
+    def __init__(self, rc, url, req_id, service_type, policy, deadline_grace=60):
+        self.rc = rc
+        self.url = url
+        self.req_id = req_id
+        self.service_type = service_type
+        self.policy = policy
+        self.future = Future()
+        self.attempts = 0
+        self.status = None
+        self.submitted = time.monotonic()
+        self.started = self.submitted + policy.first_delay  # the initial wait does not count against the timeout
+        self.deadline = self.started + policy.timeout + deadline_grace
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def solve_time(self):
+        return time.monotonic() - self.submitted
+
+
+class PlanPoller(object):
+    """Polls every registered Conductor plan from one scheduler thread"""
+
+    def __init__(self, http_workers=4, solve_time_samples=100, deadline_grace=60, watchdog_interval=5):
+        """
+        :param http_workers: threads making the HTTP calls to Conductor
+        :param solve_time_samples: solve times kept per service type for the statistics
+        :param deadline_grace: seconds after its timeout at which the watchdog fails a plan which is not done
+        :param watchdog_interval: seconds between the checks of the watchdog
+        """
+        self.deadline_grace = deadline_grace
+        self._solve_times = defaultdict(lambda: deque(maxlen=solve_time_samples))
+        self._queue = []  # heap of (due time, sequence number, PlanWatch)
+        self._plans = set()  # plans which are not done
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._http = ThreadPoolExecutor(max_workers=http_workers, thread_name_prefix="osdf-conductor-poll")
+        self._thread = None
+        self._start_scheduler()
+        self._watchdog = threading.Thread(target=self._watchdog_loop, args=(watchdog_interval,),
+                                          name="osdf-conductor-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def watch(self, rc, url, req_id, policy, service_type="placement"):
+        """Start tracking a plan
+
+        :param rc: RestClient to use for calling Conductor
+        :param url: plan URL returned by Conductor
+        :param req_id: request ID (for logging)
+        :param policy: polling schedule (see osdf.adapters.conductor.polling); the plan is given up
+                       with a BusinessException after policy.timeout seconds
+        :param service_type: e.g. placement, nsi_selection (for the solve time statistics)
+        :return: Future which resolves to Conductor's final plan response
+        """
+        plan = PlanWatch(rc, url, req_id, service_type, policy, self.deadline_grace)
+        if self._stopped.is_set():
+            plan.future.set_exception(BusinessException("The Conductor plan poller is shut down"))
+            return plan.future
+        with self._cond:
+            self._plans.add(plan)
+        plan.future.add_done_callback(lambda _: self._forget(plan))
+        self._schedule(plan, policy.first_delay)
+        return plan.future
+
+    def shutdown(self, wait=True):
+        """Stop the threads of the poller; the plans which are not done yet fail with a BusinessException"""
+        self._stopped.set()
+        with self._cond:
+            plans = list(self._plans)
+            self._queue.clear()
+            self._cond.notify_all()
+        for plan in plans:
+            self._fail(plan, BusinessException("The Conductor plan poller is shut down"))
+        self._http.shutdown(wait=wait)
+        if wait:
+            self._thread.join()
+            self._watchdog.join()
+
+    def solve_time_stats(self):
+        """Recently measured plan solve times (seconds), per service type"""
+        with self._cond:
+            samples = {k: list(v) for k, v in self._solve_times.items()}
+        return {k: {"count": len(v), "mean": sum(v) / len(v), "max": max(v)} for k, v in samples.items() if v}
+
+    def outstanding(self):
+        """Number of plans waiting for their next poll"""
+        with self._cond:
+            return len(self._queue)
+
+    def _schedule(self, plan, delay):
+        with self._cond:
+            heapq.heappush(self._queue, (time.monotonic() + delay, next(self._seq), plan))
+            self._cond.notify()
+
+    def _start_scheduler(self):
+        self._thread = threading.Thread(target=self._schedule_loop, name="osdf-conductor-poller", daemon=True)
+        self._thread.start()
+
+    def _schedule_loop(self):
+        while not self._stopped.is_set():
+            with self._cond:
+                while not self._stopped.is_set() and (not self._queue or self._queue[0][0] > time.monotonic()):
+                    self._cond.wait(self._queue[0][0] - time.monotonic() if self._queue else None)
+                if self._stopped.is_set():
+                    return
+                _, _, plan = heapq.heappop(self._queue)
+            try:
+                self._http.submit(self._poll, plan)
+            except RuntimeError:  # the HTTP pool is shut down
+                return
+
+    def _watchdog_loop(self, interval):
+        while not self._stopped.wait(interval):
+            if not self._thread.is_alive():
+                error_log.error("The Conductor plan scheduler thread has died, restarting it")
+                self._start_scheduler()
+            now = time.monotonic()
+            with self._cond:
+                expired = [plan for plan in self._plans if plan.deadline < now]
+            for plan in expired:
+                self._fail(plan, BusinessException("Conductor plan for request_id {} is not done {} seconds after "
+                                                   "its timeout".format(plan.req_id, self.deadline_grace)))
+
+    def _forget(self, plan):
+        with self._cond:
+            self._plans.discard(plan)
+
+    @staticmethod
+    def _fail(plan, err):
+        try:
+            plan.future.set_exception(err)
+        except InvalidStateError:  # completed in the meantime
+            pass
+
+    def _poll(self, plan):
+        if plan.future.done():  # failed by the watchdog or by a shutdown
+            return
+        try:
+            self._check_plan(plan)
+        except Exception as err:  # handed over to whoever waits on the plan
+            debug_log.debug("Conductor plan for request_id {} failed {}"
+                            .format(plan.req_id, traceback.format_exc()))
+            self._fail(plan, err)
+
+    def _check_plan(self, plan):
+        plan.attempts += 1
+        debug_log.debug("Attempt number {} url {}; prior status={}".format(plan.attempts, plan.url, plan.status))
+        try:
+            raw_resp = plan.rc.request(plan.url, raw_response=True)
+            resp = raw_resp.json()
+        except RequestException as e:
+            debug_log.debug("Conductor attempt {} for request_id {} has failed because {}"
+                            .format(plan.attempts, plan.req_id, str(e)))
+        else:
+            plan.status = resp["plans"][0].get("status")
+            if plan.status in ERROR_STATUSES:
+                raise RequestException(response=raw_resp, request=raw_resp.request)
+            if plan.status in FINAL_STATUSES:
+                self._record_solve_time(plan)
+                try:
+                    plan.future.set_result(resp)
+                except InvalidStateError:  # failed by the watchdog in the meantime
+                    pass
+                return
+            plan.url = resp['plans'][0]['links'][0][0]['href']
+
+        if plan.elapsed() >= plan.policy.timeout:
+            raise BusinessException("Conductor could not provide a solution within {} seconds,"
+                                    "this transaction is timing out".format(plan.policy.timeout))
+        self._schedule(plan, plan.policy.next_delay(plan.attempts, plan.elapsed()))
+
+    def _record_solve_time(self, plan):
+        solve_time = plan.solve_time()
+        with self._cond:
+            self._solve_times[plan.service_type].append(solve_time)
+        metrics_log.info("Conductor plan for request ID: {} [{}] is {} after {:.2f} seconds and {} polls"
+                         .format(plan.req_id, plan.service_type, plan.status, solve_time, plan.attempts))
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_plan_poller(osdf_config):
+    """The process-wide PlanPoller (started on first use)"""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = PlanPoller(osdf_config.deployment.get('conductorPollerWorkers', 4))
+        return _poller
+
+
+def shutdown_plan_poller(wait=True):
+    """Stop the process-wide PlanPoller, if it was started (a new one is started on next use)"""
+    global _poller
+    with _poller_lock:
+        poller, _poller = _poller, None
+    if poller is not None:
+        poller.shutdown(wait)
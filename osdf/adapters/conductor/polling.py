@@ -0,0 +1,93 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+"""
+Polling schedules for Conductor plans
+"""
+
+import random
+
+
+class FixedPolling(object):
+    """Wait first_delay seconds, then poll every interval seconds"""
+
+    def __init__(self, timeout, first_delay=10, interval=60):
+        self.timeout = timeout
+        self.first_delay = first_delay
+        self.interval = interval
+
+    def next_delay(self, attempts, elapsed):
+        """Seconds to wait before the next poll
+
+        :param attempts: number of polls made so far
+        :param elapsed: seconds since the first poll
+        """
+        return self.interval
+
+
+class BackoffPolling(object):
+    """Short first probe, then exponentially growing intervals with jitter
+
+    The interval is capped by max_interval and by a fraction of the request timeout, and the last poll is
+    never scheduled later than the timeout itself.
+    """
+
+    def __init__(self, timeout, first_delay=1, initial_interval=1, multiplier=2, max_interval=60,
+                 jitter=0.2, timeout_fraction=0.1):
+        self.timeout = timeout
+        self.first_delay = first_delay
+        self.initial_interval = initial_interval
+        self.multiplier = multiplier
+        self.max_interval = max(min(max_interval, timeout * timeout_fraction), initial_interval)
+        self.jitter = jitter
+
+    def next_delay(self, attempts, elapsed):
+        """Seconds to wait before the next poll
+
+        :param attempts: number of polls made so far
+        :param elapsed: seconds since the first poll
+        """
+        delay = min(self.initial_interval * self.multiplier ** max(attempts - 1, 0), self.max_interval)
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(min(delay, self.timeout - elapsed), 0)
+
+
+POLLING_POLICIES = {
+    "fixed": FixedPolling,
+    "backoff": BackoffPolling
+}
+
+
+def polling_policy(osdf_config, service_type, timeout):
+    """Build the polling schedule for a plan from osdf_config.deployment['conductorPolling']
+
+    The settings for service_type are applied over the 'default' ones. Without any configuration the
+    legacy schedule is used: 10 seconds, then every conductorPingWaitTime seconds.
+    :param osdf_config: OSDF configuration
+    :param service_type: e.g. placement, nst_selection, nsi_selection
+    :param timeout: seconds after which the plan is given up
+    :return: polling policy object
+    """
+    config = osdf_config.deployment
+    polling_conf = config.get('conductorPolling') or {}
+    conf = dict(polling_conf.get('default') or {})
+    conf.update(polling_conf.get(service_type) or {})
+    policy_name = conf.pop('policy', 'fixed')
+    conf.setdefault('max_interval' if policy_name == 'backoff' else 'interval',
+                    config.get('conductorPingWaitTime', 60))
+    return POLLING_POLICIES[policy_name](timeout, **conf)
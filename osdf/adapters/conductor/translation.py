@@ -16,11 +16,14 @@
 #
 # -------------------------------------------------------------------------
 #
+from collections import OrderedDict
 import copy
 import json
 import re
 import yaml
 
+from osdf.adapters.policy.utils import group_policies_gen
+from osdf.adapters.policy.utils import PolicySetCache
 from osdf.utils.programming_utils import dot_notation
 
 policy_config_mapping = yaml.safe_load(open('config/has_config.yaml')).get('policy_config_mapping')
@@ -115,148 +118,229 @@ def get_matching_vnfs(resources, vnf_list, match_type="intersection"):
     return default, resources if common_vnfs else None  # "any" match => all resources to be returned
 
 
-def gen_policy_instance(vnf_list, resource_policy, match_type="intersection", rtype=None):
-    """Generate a list of policies
+class Constraint(object):
+    """Immutable, compiled form of a policy"""
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+    def __delattr__(self, name):
+        raise AttributeError("{} is immutable".format(type(self).__name__))
+
+
+class ResourceConstraint(Constraint):
+    """A resource policy (attribute, distance, zone, hpa, ...) ready to be turned into Conductor constraints
+
+    properties is shared by every request using the compiled policy, so it must not be modified.
+    """
+    __slots__ = ("name", "identity", "constraint_type", "resources", "resources_lower", "resource_set", "default",
+                 "properties")
+
+    def matching_demands(self, vnf_list, vnf_set, match_type="intersection"):
+        """Same result as get_matching_vnfs(resources, vnf_list, match_type)"""
+        if match_type == "all":
+            return list(self.resources) if self.resource_set <= vnf_set else None
+        if self.default:
+            return list(set(vnf_list))
+        common_resources = [x for x, lower in zip(self.resources, self.resources_lower) if lower in vnf_set]
+        if match_type == "intersection":
+            return common_resources
+        return list(self.resources) if common_resources else None
+
+    def constraint(self, demands, properties=None):
+        content = {'type': self.constraint_type, 'demands': demands}
+        if properties is not None:
+            content['properties'] = properties
+        return {self.identity: content}
+
+
+class VnfConstraint(Constraint):
+    """A VNF policy, matched against the demands by (lowercase) resource name"""
+    __slots__ = ("name", "resources_lower", "vnf_properties")
+
+    def applies_to(self, demand):
+        return not self.resources_lower or demand['resourceModuleName'].lower() in self.resources_lower
+
+
+def _controller_request(rtype):
+    return lambda pc: {'controller': pc[rtype]['controller'], 'request': json.loads(pc[rtype]['request'])}
+
+
+def _distance_properties(pc):
+    properties = pc['properties']['distanceProperties']
+    pcp_d = properties['distance']
+    return {'distance': pcp_d['operator'] + " " + pcp_d['value'].lower() + " " + pcp_d['unit'].lower(),
+            'location': properties['locationInfo']}
+
+
+def _attribute_properties(pc):
+    properties = pc['properties']['attributeProperties']
+    attribute_mapping = policy_config_mapping['filtering_attributes']  # wanted attributes and mapping
+    return {'evaluate': dict((attribute_mapping[k], properties.get(k)
+                              if k != "cloudRegion" else gen_cloud_region(properties))
+                             for k in attribute_mapping.keys())}
+
+
+def _zone_properties(pc):
+    pmz = pc['properties']['affinityProperties']
+    return {'category': pmz['category'], 'qualifier': pmz['qualifier']}
+
+
+def _capacity_properties(pc):
+    pmz = pc['properties']['capacityProperty']
+    return {"controller": pmz['controller'], 'request': json.loads(pmz['request'])}
+
+
+# policy type -> (how demands are matched, properties of the constraint, whether the per-demand constraints
+# of a default policy carry the properties too); the order is the order of the constraints sent to Conductor
+RESOURCE_CONSTRAINTS = OrderedDict([
+    ("onap.policies.optimization.resource.AttributePolicy", ("intersection", _attribute_properties, True)),
+    ("onap.policies.optimization.resource.DistancePolicy", ("intersection", _distance_properties, True)),
+    ("onap.policies.optimization.resource.InventoryGroupPolicy", ("intersection", None, False)),
+    ("onap.policies.optimization.resource.ResourceInstancePolicy",
+     ("intersection", _controller_request('resourceInstanceProperty'), False)),
+    ("onap.policies.optimization.resource.ResourceRegionPolicy",
+     ("intersection", _controller_request('resourceRegionProperty'), False)),
+    ("onap.policies.optimization.resource.AffinityPolicy", ("all", _zone_properties, True)),
+    ("onap.policies.optimization.resource.InstanceReservationPolicy",
+     ("intersection", _controller_request('instanceReservationProperty'), False)),
+    ("onap.policies.optimization.resource.Vim_fit", ("intersection", _capacity_properties, True)),
+    ("onap.policies.optimization.resource.HpaPolicy",
+     ("intersection", lambda pc: {'evaluate': pc['properties']['flavorFeatures']}, True)),
+    ("onap.policies.optimization.resource.ThresholdPolicy",
+     ("intersection", lambda pc: {'evaluate': pc['properties']['thresholdProperties']}, True)),
+    ("onap.policies.optimization.resource.AggregationPolicy",
+     ("intersection", lambda pc: {'evaluate': pc['properties']['aggregationProperties']}, True)),
+])
+
+
+def compile_resource_policies(resource_policy, policy_type):
+    """Compile the policies of one resource policy type
+
+    :param resource_policy: policies of policy_type
+    :param policy_type: one of RESOURCE_CONSTRAINTS
+    :return: tuple of ResourceConstraint
+    """
+    _, properties_func, _ = RESOURCE_CONSTRAINTS[policy_type]
+    constraints = []
+    for policy in resource_policy:
+        name = next(iter(policy))
+        pc = policy[name]
+        resources = tuple(pc['properties']['resources'])
+        resources_lower = tuple(x.lower() for x in resources)
+        constraints.append(ResourceConstraint(
+            name=name, identity=pc['properties']['identity'], constraint_type=CONSTRAINT_TYPE_MAP.get(pc['type']),
+            resources=resources, resources_lower=resources_lower, resource_set=frozenset(resources_lower),
+            default=not resources, properties=properties_func(pc) if properties_func else None))
+    return tuple(constraints)
+
+
+def compile_vnf_policies(vnf_policies):
+    """Compile VNF policies into a tuple of VnfConstraint"""
+    constraints = []
+    for policy in vnf_policies:
+        name = next(iter(policy))
+        properties = policy[name]['properties']
+        constraints.append(VnfConstraint(name=name,
+                                         resources_lower=frozenset(x.lower() for x in properties['resources']),
+                                         vnf_properties=tuple(properties['vnfProperties'])))
+    return tuple(constraints)
+
+
+def gen_constraints(vnf_list, constraints, match_type="intersection", default_properties=True):
+    """Generate the Conductor constraints for compiled resource policies
 
     :param vnf_list: List of vnf's to used in placement request
-    :param resource_policy: policy for this specific resource
+    :param constraints: ResourceConstraints of one policy type
     :param match_type: How to match the vnf_names with the vnf_list (intersection or "any")
              intersection => return intersection; "any" implies return all vnf_names if intersection is not null
-    :param rtype: resource type (e.g. resourceRegionProperty or resourceInstanceProperty)
-             None => no controller information added to the policy specification to Conductor
+    :param default_properties: whether the per-demand constraints of a default policy get the properties
     :return: resource policy list in a format required by Conductor
     """
-    resource_policy_list = []
-    related_policies = []
-    for policy in resource_policy:
-        pc = policy[list(policy.keys())[0]]
-        default, demands = get_matching_vnfs(pc['properties']['resources'], vnf_list, match_type=match_type)
-        resource = {pc['properties']['identity']: {'type': CONSTRAINT_TYPE_MAP.get(pc['type']), 'demands': demands}}
-
-        if rtype:
-            resource[pc['properties']['identity']]['properties'] = {'controller': pc[rtype]['controller'],
-                                                                    'request': json.loads(pc[rtype]['request'])}
-        if demands and len(demands) != 0:
-            # The default policy shall not override the specific policy that already appended
-            if default:
-                for d in demands:
-                    resource_repeated = True \
-                        if {pc['properties']['identity']: {'type': CONSTRAINT_TYPE_MAP.get(pc['type']),
-                                                           'demands': d}} in resource_policy_list else False
-                    if resource_repeated:
-                        continue
-                    else:
-                        resource_policy_list.append(
-                            {pc['properties']['identity']: {'type': CONSTRAINT_TYPE_MAP.get(pc['type']),
-                                                            'demands': d}})
-                        policy[list(policy.keys())[0]]['properties']['resources'] = d
-                        related_policies.append(policy)
-            # Need to override the default policies, here delete the outdated policy stored in the db
-            if resource in resource_policy_list:
-                for pc in related_policies:
-                    if pc[list(pc.keys()[0])]['properties']['resources'] == resource:
-                        related_policies.remove(pc)
-                resource_policy_list.remove(resource)
-            related_policies.append(policy)
-            resource_policy_list.append(resource)
-
-    return resource_policy_list, related_policies
+    vnf_set = set(vnf_list)
+    resource_policy_list = OrderedDict()  # (identity, demands) -> constraint
+    for c in constraints:
+        demands = c.matching_demands(vnf_list, vnf_set, match_type)
+        if not demands:
+            continue
+        if c.default:  # the default policy shall not override the specific policy that already appended
+            for d in demands:
+                resource_policy_list.setdefault((c.identity, d),
+                                                c.constraint(d, c.properties if default_properties else None))
+        # a later policy for the same identity and demands overrides the earlier one
+        key = (c.identity, tuple(demands))
+        resource_policy_list.pop(key, None)
+        resource_policy_list[key] = c.constraint(demands, c.properties)
+    return list(resource_policy_list.values())
+
+
+def _gen_resource_policy(vnf_list, resource_policy, policy_type):
+    match_type, _, default_properties = RESOURCE_CONSTRAINTS[policy_type]
+    return gen_constraints(vnf_list, compile_resource_policies(resource_policy, policy_type), match_type,
+                           default_properties)
 
 
 def gen_resource_instance_policy(vnf_list, resource_instance_policy):
     """Get policies governing resource instances in order to populate the Conductor API call"""
-    cur_policies, _ = gen_policy_instance(vnf_list, resource_instance_policy, rtype='resourceInstanceProperty')
-    return cur_policies
+    return _gen_resource_policy(vnf_list, resource_instance_policy,
+                                "onap.policies.optimization.resource.ResourceInstancePolicy")
 
 
 def gen_resource_region_policy(vnf_list, resource_region_policy):
     """Get policies governing resource region in order to populate the Conductor API call"""
-    cur_policies, _ = gen_policy_instance(vnf_list, resource_region_policy, rtype='resourceRegionProperty')
-    return cur_policies
+    return _gen_resource_policy(vnf_list, resource_region_policy,
+                                "onap.policies.optimization.resource.ResourceRegionPolicy")
 
 
 def gen_inventory_group_policy(vnf_list, inventory_group_policy):
     """Get policies governing inventory group in order to populate the Conductor API call"""
-    cur_policies, _ = gen_policy_instance(vnf_list, inventory_group_policy, rtype=None)
-    return cur_policies
+    return _gen_resource_policy(vnf_list, inventory_group_policy,
+                                "onap.policies.optimization.resource.InventoryGroupPolicy")
 
 
 def gen_reservation_policy(vnf_list, reservation_policy):
     """Get policies governing resource instances in order to populate the Conductor API call"""
-    cur_policies, _ = gen_policy_instance(vnf_list, reservation_policy, rtype='instanceReservationProperty')
-    return cur_policies
+    return _gen_resource_policy(vnf_list, reservation_policy,
+                                "onap.policies.optimization.resource.InstanceReservationPolicy")
 
 
 def gen_distance_to_location_policy(vnf_list, distance_to_location_policy):
     """Get policies governing distance-to-location for VNFs in order to populate the Conductor API call"""
-    cur_policies, related_policies = gen_policy_instance(vnf_list, distance_to_location_policy, rtype=None)
-    for p_new, p_main in zip(cur_policies, related_policies):  # add additional fields to each policy
-        properties = p_main[list(p_main.keys())[0]]['properties']['distanceProperties']
-        pcp_d = properties['distance']
-        p_new[p_main[list(p_main.keys())[0]]['properties']['identity']]['properties'] = {
-            'distance': pcp_d['operator'] + " " + pcp_d['value'].lower() + " " + pcp_d['unit'].lower(),
-            'location': properties['locationInfo']
-        }
-    return cur_policies
+    return _gen_resource_policy(vnf_list, distance_to_location_policy,
+                                "onap.policies.optimization.resource.DistancePolicy")
 
 
 def gen_attribute_policy(vnf_list, attribute_policy):
     """Get policies governing attributes of VNFs in order to populate the Conductor API call"""
-    cur_policies, related_policies = gen_policy_instance(vnf_list, attribute_policy, rtype=None)
-    for p_new, p_main in zip(cur_policies, related_policies):  # add additional fields to each policy
-        properties = p_main[list(p_main.keys())[0]]['properties']['attributeProperties']
-        attribute_mapping = policy_config_mapping['filtering_attributes']  # wanted attributes and mapping
-        p_new[p_main[list(p_main.keys())[0]]['properties']['identity']]['properties'] = {
-            'evaluate': dict((attribute_mapping[k], properties.get(k)
-                              if k != "cloudRegion" else gen_cloud_region(properties))
-                             for k in attribute_mapping.keys())
-        }
-    return cur_policies  # cur_policies gets updated in place...
+    return _gen_resource_policy(vnf_list, attribute_policy, "onap.policies.optimization.resource.AttributePolicy")
 
 
 def gen_zone_policy(vnf_list, zone_policy):
     """Get zone policies in order to populate the Conductor API call"""
-    cur_policies, related_policies = gen_policy_instance(vnf_list, zone_policy, match_type="all", rtype=None)
-    for p_new, p_main in zip(cur_policies, related_policies):  # add additional fields to each policy
-        pmz = p_main[list(p_main.keys())[0]]['properties']['affinityProperties']
-        p_new[p_main[list(p_main.keys())[0]]['properties']['identity']]['properties'] = \
-            {'category': pmz['category'], 'qualifier': pmz['qualifier']}
-    return cur_policies
+    return _gen_resource_policy(vnf_list, zone_policy, "onap.policies.optimization.resource.AffinityPolicy")
 
 
 def gen_capacity_policy(vnf_list, capacity_policy):
     """Get zone policies in order to populate the Conductor API call"""
-    cur_policies, related_policies = gen_policy_instance(vnf_list, capacity_policy, rtype=None)
-    for p_new, p_main in zip(cur_policies, related_policies):  # add additional fields to each policy
-        pmz = p_main[list(p_main.keys())[0]]['properties']['capacityProperty']
-        p_new[p_main[list(p_main.keys())[0]]['properties']['identity']]['properties'] = \
-            {"controller": pmz['controller'], 'request': json.loads(pmz['request'])}
-    return cur_policies
+    return _gen_resource_policy(vnf_list, capacity_policy, "onap.policies.optimization.resource.Vim_fit")
 
 
 def gen_hpa_policy(vnf_list, hpa_policy):
     """Get zone policies in order to populate the Conductor API call"""
-    cur_policies, related_policies = gen_policy_instance(vnf_list, hpa_policy, rtype=None)
-    for p_new, p_main in zip(cur_policies, related_policies):  # add additional fields to each policy
-        p_new[p_main[list(p_main.keys())[0]]['properties']['identity']]['properties'] = \
-            {'evaluate': p_main[list(p_main.keys())[0]]['properties']['flavorFeatures']}
-    return cur_policies
+    return _gen_resource_policy(vnf_list, hpa_policy, "onap.policies.optimization.resource.HpaPolicy")
 
 
 def gen_threshold_policy(vnf_list, threshold_policy):
-    cur_policies, related_policies = gen_policy_instance(vnf_list, threshold_policy, rtype=None)
-    for p_new, p_main in zip(cur_policies, related_policies):
-        pmz = p_main[list(p_main.keys())[0]]['properties']['thresholdProperties']
-        p_new[p_main[list(p_main.keys())[0]]['properties']['identity']]['properties'] = {'evaluate': pmz}
-    return cur_policies
+    return _gen_resource_policy(vnf_list, threshold_policy, "onap.policies.optimization.resource.ThresholdPolicy")
 
 
 def gen_aggregation_policy(vnf_list, cross_policy):
-    cur_policies, related_policies = gen_policy_instance(vnf_list, cross_policy, rtype=None)
-    for p_new, p_main in zip(cur_policies, related_policies):
-        pmz = p_main[list(p_main.keys())[0]]['properties']['aggregationProperties']
-        p_new[p_main[list(p_main.keys())[0]]['properties']['identity']]['properties'] = {'evaluate': pmz}
-    return cur_policies
+    return _gen_resource_policy(vnf_list, cross_policy, "onap.policies.optimization.resource.AggregationPolicy")
 
 
 def get_augmented_policy_attributes(policy_property, demand):
@@ -278,22 +362,18 @@ def get_candidates_demands(demand):
     return res
 
 
-def get_policy_properties(demand, policies):
-    """Get policy_properties for cases where there is a match with the demand"""
-    for policy in policies:
-        policy_demands = set([x.lower() for x in policy[list(policy.keys())[0]]['properties']['resources']])
-        if policy_demands and demand['resourceModuleName'].lower() not in policy_demands:
-            continue  # no match for this policy
-        elif policy_demands == set():  # Append resource name for default policy
-            policy[list(policy.keys())[0]]['properties'].update(resources=list(demand.get('resourceModuleName')))
-        for policy_property in policy[list(policy.keys())[0]]['properties']['vnfProperties']:
-            yield policy_property
+def get_policy_properties(demand, vnf_constraints):
+    """Get policy_properties for cases where there is a match with the demand (default policies match all)"""
+    for constraint in vnf_constraints:
+        if constraint.applies_to(demand):
+            for policy_property in constraint.vnf_properties:
+                yield policy_property
 
 
-def get_demand_properties(demand, policies):
-    """Get list demand properties objects (named tuples) from policy"""
+def get_demand_properties(demand, vnf_constraints):
+    """Get list demand properties objects (named tuples) from compiled VNF policies"""
     demand_properties = []
-    for policy_property in get_policy_properties(demand, policies):
+    for policy_property in get_policy_properties(demand, vnf_constraints):
         prop = dict(inventory_provider=policy_property['inventoryProvider'],
                     inventory_type=policy_property['inventoryType'],
                     service_type=demand.get('serviceResourceId', ''),
@@ -360,14 +440,59 @@ def gen_demands(demands, vnf_policies):
            (e.g. from grouped_policies['vnfPolicy'])
     :return: list of demand parameters to populate the Conductor API call
     """
+    return gen_compiled_demands(demands, compile_vnf_policies(vnf_policies))
+
+
+def gen_compiled_demands(demands, vnf_constraints):
+    """Same as gen_demands, for VNF policies compiled with compile_vnf_policies"""
     demand_dictionary = {}
     for demand in demands:
-        prop = get_demand_properties(demand, vnf_policies)
+        prop = get_demand_properties(demand, vnf_constraints)
         if len(prop) > 0:
             demand_dictionary.update({demand['resourceModuleName']: prop})
     return demand_dictionary
 
 
+class CompiledPolicies(object):
+    """A policy set grouped and compiled once for building Conductor requests
+
+    Instances are cached by policy set (see compile_policies) and shared between requests, so neither the
+    compiled constraints nor the grouped policies are modified while translating a request.
+    """
+
+    def __init__(self, grouped_policies):
+        self.grouped_policies = grouped_policies
+        self.vnf_constraints = compile_vnf_policies(
+            grouped_policies.get('onap.policies.optimization.resource.VnfPolicy', []))
+        self.resource_constraints = [(policy_type, compile_resource_policies(grouped_policies[policy_type],
+                                                                             policy_type))
+                                     for policy_type in RESOURCE_CONSTRAINTS if grouped_policies.get(policy_type)]
+
+    def policies(self, policy_type):
+        return self.grouped_policies.get(policy_type, [])
+
+    def gen_demands(self, demands):
+        return gen_compiled_demands(demands, self.vnf_constraints)
+
+    def gen_constraints(self, vnf_list):
+        """All the resource constraints for the (lowercase) demand names, in the order Conductor gets them"""
+        policy_groups = []
+        for policy_type, constraints in self.resource_constraints:
+            match_type, _, default_properties = RESOURCE_CONSTRAINTS[policy_type]
+            policy_groups.extend(gen_constraints(vnf_list, constraints, match_type, default_properties))
+        return policy_groups
+
+
+_compiled = PolicySetCache()
+
+
+def compile_policies(flat_policies, local_config):
+    """Grouped (see group_policies_gen) and compiled policies, reused for the same policy set"""
+    return _compiled.get(flat_policies, json.dumps(local_config.get('policy_info', {}).get(
+        'prioritization_attributes', {}), sort_keys=True),
+        lambda: CompiledPolicies(group_policies_gen(flat_policies, local_config)))
+
+
 def gen_cloud_region(property):
     prop = {"cloud_region_attributes": dict()}
     if 'cloudRegion' in property:
@@ -16,11 +16,63 @@
 # -------------------------------------------------------------------------
 #
 
+import copy
 import json
 import os
 import re
+import threading
+
 from osdf.logging.osdf_logging import debug_log
 
+
+class LocalPolicyStore(object):
+    """Policies of a local folder, kept in memory
+
+    A policy file is parsed on first use and again only when its modification time changes, so serving
+    policies does not touch the disk beyond a stat() per file. Callers get their own copy of each policy.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._files = {}  # file name -> (mtime, parsed policy)
+        self._lock = threading.Lock()
+
+    def get(self, file_names):
+        """Policies in the given files"""
+        with self._lock:
+            policies = [self._load(fname) for fname in file_names]
+        return copy.deepcopy(policies)
+
+    def get_by_name(self, policy_names):
+        """Policies with the given names (policy <name> is in the file <name>.json)"""
+        return self.get([name + ".json" for name in policy_names])
+
+    def _load(self, fname):
+        path = os.path.join(self.folder, fname)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._files.get(fname)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        debug_log.debug("Loading local policy file {}".format(path))
+        with open(path) as fid:
+            policy = json.load(fid)
+        self._files[fname] = (mtime, policy)
+        return policy
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_policy_store(local_policy_folder):
+    """The shared LocalPolicyStore of a folder"""
+    folder = os.path.abspath(local_policy_folder)
+    with _stores_lock:
+        if folder not in _stores:
+            _stores[folder] = LocalPolicyStore(folder)
+        return _stores[folder]
+
+
 def get_local_policies(local_policy_folder, local_policy_list, policy_id_list=None):
     """
     Get policies from a local file system.
@@ -33,16 +85,10 @@ def get_local_policies(local_policy_folder, local_policy_list, policy_id_list=No
     :return: get policies
     """
     debug_log.debug("Policy folder: {}, local_list {}, policy id list {}".format(local_policy_folder, local_policy_list, policy_id_list))
-    policies = []
+    store = get_policy_store(local_policy_folder)
     if policy_id_list:
-        for policy_id in policy_id_list:
-            with open(os.path.join(local_policy_folder, policy_id + ".json")) as fid:
-                policies.append(json.load(fid))
-    else:
-        for fname in local_policy_list:
-            with open(os.path.join(local_policy_folder, fname)) as fid:
-                policies.append(json.load(fid))
-    return policies
+        return store.get_by_name(policy_id_list)
+    return store.get(local_policy_list)
 
 
 def get_policy_names_from_file(fname_for_list_of_files):
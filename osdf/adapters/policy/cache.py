@@ -0,0 +1,160 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+"""
+In-process cache of the policies fetched from the Policy platform
+
+Entries are keyed by (service_type, normalized scope fields), expire after a TTL and are evicted in LRU
+order beyond max_size. In stale-while-revalidate mode an expired entry is still served (for up to max_stale
+seconds) while it is refreshed in the background, so a slow Policy platform does not delay the requests.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import threading
+import time
+
+from osdf.logging.osdf_logging import debug_log
+
+
+def normalize_scope(scope_fields):
+    """Order-independent, hashable form of the scope fields of a policy query
+
+    :param scope_fields: dict of scope field name -> value or list of values
+    :return: sorted tuple of (field name, sorted tuple of values)
+    """
+    normalized = []
+    for field, values in scope_fields.items():
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        normalized.append((field, tuple(sorted(set(str(v) for v in values)))))
+    return tuple(sorted(normalized))
+
+
+def cache_key(service_type, scope_fields):
+    return service_type, normalize_scope(scope_fields)
+
+
+class CacheEntry(object):
+    __slots__ = ["value", "expires"]
+
+    def __init__(self, value, expires):
+        self.value = value
+        self.expires = expires
+
+
+class PolicyCache(object):
+    """LRU cache with TTL (and optional stale-while-revalidate) for policy query results"""
+
+    def __init__(self, ttl=300, max_size=256, stale_while_revalidate=False, max_stale=None, refresh_workers=2):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = ttl if max_stale is None else max_stale
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "staleHits": 0, "misses": 0, "evictions": 0, "refreshErrors": 0}
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="osdf-policy-refresh")
+
+    def get(self, key, loader):
+        """Cached value for key; loader() is called to fetch it on a miss
+
+        :param key: cache key (see cache_key)
+        :param loader: function without arguments returning the value; its exceptions are not cached
+        :return: a copy of the cached value, so callers can modify it freely
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.expires > now:
+                    self._counters["hits"] += 1
+                    return copy.deepcopy(entry.value)
+                if self.stale_while_revalidate and now < entry.expires + self.max_stale:
+                    self._counters["staleHits"] += 1
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._refresher.submit(self._refresh, key, loader)
+                    return copy.deepcopy(entry.value)
+            self._counters["misses"] += 1
+        value = loader()
+        self.put(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = CacheEntry(copy.deepcopy(value), time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, service_type=None, scope_fields=None):
+        """Drop the matching entries (all of them if neither argument is given)
+
+        :param service_type: only entries of this service type
+        :param scope_fields: only entries whose scope contains all of these field values
+        :return: number of entries dropped
+        """
+        wanted = dict(normalize_scope(scope_fields or {}))
+        with self._lock:
+            keys = [key for key in self._entries
+                    if (service_type is None or key[0] == service_type) and self._in_scope(key[1], wanted)]
+            for key in keys:
+                del self._entries[key]
+        debug_log.debug("Invalidated {} cached policy queries".format(len(keys)))
+        return len(keys)
+
+    @staticmethod
+    def _in_scope(scope, wanted):
+        scope = dict(scope)
+        return all(field in scope and set(values) <= set(scope[field]) for field, values in wanted.items())
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, size=len(self._entries), maxSize=self.max_size, ttl=self.ttl,
+                        staleWhileRevalidate=self.stale_while_revalidate)
+
+    def _refresh(self, key, loader):
+        try:
+            self.put(key, loader())
+        except Exception as err:  # keep serving the stale entry until max_stale
+            with self._lock:
+                self._counters["refreshErrors"] += 1
+            debug_log.debug("Refreshing cached policies for {} failed: {}".format(key, err))
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_policy_cache(osdf_config):
+    """The process-wide PolicyCache, or None if osdf_config.deployment['policyCache'] does not enable it"""
+    global _cache
+    conf = dict(osdf_config.deployment.get('policyCache') or {})
+    if not conf.pop('enabled', False):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = PolicyCache(**conf)
+        return _cache
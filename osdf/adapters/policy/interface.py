@@ -17,13 +17,17 @@
 #
 
 import base64
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 from requests import RequestException
+import threading
 import uuid
 import yaml
 
 from osdf.adapters.local_data.local_policies import get_local_policies
+from osdf.adapters.policy.cache import cache_key
+from osdf.adapters.policy.cache import get_policy_cache
 from osdf.adapters.policy.utils import policy_name_as_regex
 from osdf.config.base import osdf_config
 from osdf.logging.osdf_logging import audit_log
@@ -59,7 +63,7 @@ def get_by_scope(rest_client, req, config_local, type_service):
     :param type_service: the type of optimization service.
     :return: policies in the form of list of list where inner list contains policies for a single a scope.
     """
-    scope_policies = []
+    scope_policies = {}
     references = config_local.get('references', {})
     pscope = config_local.get('policy_info', {}).get(type_service, {}).get('policy_scope', [])
     scope_fields = {}
@@ -70,21 +74,38 @@ def get_by_scope(rest_client, req, config_local, type_service):
                 scope_fields[key] = list_flatten([get_scope_fields(field, references, req, policies)
                                                   if 'get_param' in field else field])
         if scope_fields.get('resources') and len(scope_fields['resources']) > 1:
-            for s in scope_fields['resources']:
-                scope_fields['resources'] = [s]
-                policies.update(policy_api_call(rest_client, scope_fields).get('policies', {}))
+            resources = scope_fields['resources']
+            for response in fetch_pool().map(
+                    lambda s: cached_policy_api_call(rest_client, dict(scope_fields, resources=[s]), type_service),
+                    resources):
+                policies.update(response.get('policies', {}))
+            scope_fields['resources'] = [resources[-1]]  # as left by querying the resources one by one
         else:
-            policies.update(policy_api_call(rest_client, scope_fields).get('policies', {}))
+            policies.update(cached_policy_api_call(rest_client, scope_fields, type_service).get('policies', {}))
         for policyName in policies.keys():
-            keys = scope_fields.keys() & policies[policyName]['properties'].keys()
-            policy = {}
-            policy[policyName] = policies[policyName]
-            for k in keys:
-                if set(policies.get(policyName, {}).get('properties', {}).get(k)) >= set(scope_fields[k]) \
-                        and policy not in scope_policies:
-                    scope_policies.append(policy)
+            if policyName in scope_policies:
+                continue
+            properties = policies[policyName]['properties']
+            for k in scope_fields.keys() & properties.keys():
+                if set(properties.get(k)) >= set(scope_fields[k]):
+                    scope_policies[policyName] = {policyName: policies[policyName]}
+                    break
 
-    return scope_policies
+    return list(scope_policies.values())
+
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+
+def fetch_pool():
+    """Pool shared by all requests for the concurrent policy queries (policyFetchConcurrency threads)"""
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(max_workers=osdf_config.deployment.get('policyFetchConcurrency', 8),
+                                             thread_name_prefix="osdf-policy-fetch")
+        return _fetch_pool
 
 
 def get_scope_fields(field, references, req, policies):
@@ -138,6 +159,21 @@ def policy_api_call(rest_client, scope_fields):
     return response
 
 
+def cached_policy_api_call(rest_client, scope_fields, service_type):
+    """policy_api_call through the policy cache, if the cache is enabled
+
+    :param rest_client: rest client to make a call
+    :param scope_fields: a collection of scopes to be used for filtering
+    :param service_type: the type of optimization service (part of the cache key)
+    :return: a list of policies matching all filters
+    """
+    cache = get_policy_cache(osdf_config)
+    if cache is None:
+        return policy_api_call(rest_client, scope_fields)
+    scope = {k: list(v) if isinstance(v, list) else v for k, v in scope_fields.items()}  # caller reuses the dict
+    return cache.get(cache_key(service_type, scope), lambda: policy_api_call(rest_client, scope))
+
+
 def remote_api(req_json, osdf_config, service_type="placement"):
     """Make a request to policy and return response -- it accounts for multiple requests that be needed
 
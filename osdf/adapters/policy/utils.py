@@ -19,10 +19,99 @@ import copy
 import json
 
 from collections import defaultdict
+from collections import OrderedDict
+import hashlib
 import itertools
+import threading
 from osdf.utils.programming_utils import dot_notation, list_flatten
 
 
+class PolicyIndex(object):
+    """Prioritized grouping of a policy set, compiled once and reusable for any request with the same policies
+
+    Policies are referred to by their position in the policy list, so the index can be applied to another
+    copy of the same set (e.g. one served by the policy cache) without sharing policy objects between requests.
+    """
+
+    def __init__(self, flat_policies, priority):
+        self.winners = {}  # priority key (type, resource, service, ...) -> position of the prioritized policy
+        self.groups = defaultdict(list)  # policy type -> positions of the policies to use
+        names = set()
+        for pos, plc in enumerate(flat_policies):
+            name = next(iter(plc))
+            content = plc[name]
+            if not content["type"]:  # drop ones without 'type'
+                continue
+            prioritized = False
+            for key in priority_keys(content, priority):
+                if key not in self.winners:
+                    self.winners[key] = pos
+                    prioritized = True
+            # TODO: Check logic here... should policy appear only once across all groups?
+            if prioritized and name not in names:
+                names.add(name)
+                self.groups[content["type"]].append(pos)
+
+    def group(self, flat_policies):
+        """Grouped policies, taken from flat_policies (the policy set this index was built for)"""
+        filtered_policies = defaultdict(list)
+        for policy_type, positions in self.groups.items():
+            filtered_policies[policy_type] = [flat_policies[pos] for pos in positions]
+        return filtered_policies
+
+
+def priority_keys(policy_content, priority):
+    """All combinations of the prioritization attribute values of a policy"""
+    attrs = [dot_notation(policy_content, dot_path) for key in priority.keys() for dot_path in priority[key]]
+    attributes = [list_flatten(x) if isinstance(x, list) else [x] for x in attrs]
+    return itertools.product(*attributes)
+
+
+def policy_set_fingerprint(flat_policies):
+    """Identity of a policy set: a hash of the content of its policies, in order
+
+    Policy versions are not relied upon, a policy may be changed without bumping its version.
+    """
+    return hashlib.sha256(json.dumps(flat_policies, sort_keys=True).encode()).hexdigest()
+
+
+class PolicySetCache(object):
+    """Small LRU cache for data derived from a policy set (e.g. its PolicyIndex), keyed by the set's content"""
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, flat_policies, extra_key, build):
+        """Cached build() result for flat_policies
+
+        :param flat_policies: list of flat policies
+        :param extra_key: anything else the result depends on (e.g. configuration)
+        :param build: function without arguments computing the result
+        """
+        key = (policy_set_fingerprint(flat_policies), extra_key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+
+_indexes = PolicySetCache()
+
+
+def policy_index(flat_policies, priority):
+    """PolicyIndex for a policy set, reused while the same policies keep coming back"""
+    return _indexes.get(flat_policies, json.dumps(priority, sort_keys=True),
+                        lambda: PolicyIndex(flat_policies, priority))
+
+
 def group_policies_gen(flat_policies, config):
     """Filter policies using the following steps:
     1. Apply prioritization among the policies that are sharing the same policy type and resource type
@@ -31,28 +120,8 @@ def group_policies_gen(flat_policies, config):
     :param flat_policies: list of flat policies
     :return: Filtered policies
     """
-    filtered_policies = defaultdict(list)
-    policy_name = []
-    policies = [x for x in flat_policies if x[list(x.keys())[0]]["type"]] # drop ones without 'type'
     priority = config.get('policy_info', {}).get('prioritization_attributes', {})
-    aggregated_policies = dict()
-    for plc in policies:
-        attrs = [dot_notation(plc[list(plc.keys())[0]], dot_path) for key in priority.keys() for dot_path in priority[key]]
-        attrs_list  = [x if isinstance(x, list) else [x] for x in attrs]
-        attributes = [list_flatten(x) if isinstance(x, list) else x for x in attrs_list]
-        for y in itertools.product(*attributes):
-            aggregated_policies.setdefault(y, [])
-            aggregated_policies[y].append(plc)
-
-    for key in aggregated_policies.keys():
-        #aggregated_policies[key].sort(key=lambda x: x['priority'], reverse=True)
-        prioritized_policy = aggregated_policies[key][0]
-        if list(prioritized_policy.keys())[0] not in policy_name:
-            # TODO: Check logic here... should policy appear only once across all groups?
-            filtered_policies[prioritized_policy[list(prioritized_policy.keys())[0]]['type']].append(prioritized_policy)
-            policy_name.append(list(prioritized_policy.keys())[0])
-
-    return filtered_policies
+    return policy_index(flat_policies, priority).group(flat_policies)
 
 
 def policy_name_as_regex(policy_name):
@@ -43,6 +43,8 @@ from osdf.logging.osdf_logging import error_log
 from osdf.operation.error_handling import internal_error_message
 from osdf.operation.error_handling import request_exception_to_json_body
 from osdf.operation.exceptions import BusinessException
+from osdf.operation.exceptions import WorkerPoolFullException
+from osdf.operation.exceptions import WorkerPoolUnavailableException
 import osdf.operation.responses
 from osdf.utils.mdc_utils import clear_mdc
 from osdf.utils.mdc_utils import get_request_id
@@ -70,6 +72,31 @@ def handle_business_exception(e):
     return response
 
 
+@app.errorhandler(WorkerPoolFullException)
+def handle_worker_pool_full(e):
+    """Back-pressure: the worker pool for this service cannot take more requests right now
+
+    """
+    error_log.error("Rejected request id {}: {}".format(g.request_id, str(e)))
+    err_msg = ERROR_TEMPLATE.render(description=str(e))
+    response = Response(err_msg, content_type='application/json; charset=utf-8')
+    response.headers.add('Retry-After', osdf_config.deployment.get('workerPoolRetryAfter', 30))
+    response.status_code = 429
+    return response
+
+
+@app.errorhandler(WorkerPoolUnavailableException)
+def handle_worker_pool_unavailable(e):
+    """The worker pool for this service is shut down (e.g. OSDF is stopping)
+
+    """
+    error_log.error("Rejected request id {}: {}".format(g.request_id, str(e)))
+    err_msg = ERROR_TEMPLATE.render(description=str(e))
+    response = Response(err_msg, content_type='application/json; charset=utf-8')
+    response.status_code = 503
+    return response
+
+
 @app.errorhandler(RequestException)
 def handle_request_exception(e):
     """Returns a detailed synchronous message to the calling client when osdf fails due to a remote call to another system
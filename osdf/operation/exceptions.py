@@ -38,3 +38,11 @@ class CMSOCallBackError(Exception):
 
 class CMSOInvalidRequestException(Exception):
     pass
+
+
+class WorkerPoolFullException(Exception):
+    pass
+
+
+class WorkerPoolUnavailableException(Exception):
+    pass
@@ -0,0 +1,146 @@
+# -------------------------------------------------------------------------
+#   Copyright (c) 2020 AT&T Intellectual Property
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+"""
+Bounded worker pools used by the asynchronous optimization endpoints
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import traceback
+
+from osdf.config.base import osdf_config
+from osdf.logging.osdf_logging import error_log
+from osdf.operation.exceptions import WorkerPoolFullException
+from osdf.operation.exceptions import WorkerPoolUnavailableException
+
+DEFAULT_POOL_CONFIG = {
+    "maxWorkers": 10,
+    "maxQueueSize": 50
+}
+
+
+class BoundedWorkerPool(object):
+    """A thread pool that refuses work instead of queueing it without limit
+
+    At most max_workers tasks run at a time and at most max_queue_size tasks wait for a free worker;
+    any submission beyond that raises WorkerPoolFullException so the caller can push back on the client.
+    """
+
+    def __init__(self, name, max_workers, max_queue_size):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="osdf-" + name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._active = 0
+        self._rejected = 0
+
+    def submit(self, func, *args, **kwargs):
+        """Schedule func(*args, **kwargs) on the pool
+
+        :return: a concurrent.futures.Future for the task
+        :raises WorkerPoolFullException: if all workers are busy and the queue is full
+        :raises WorkerPoolUnavailableException: if the pool has been shut down
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise WorkerPoolFullException("Worker pool '{}' is full ({} running, {} queued), "
+                                          "retry later".format(self.name, self.max_workers, self.max_queue_size))
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(self._run, func, *args, **kwargs)
+        except RuntimeError:
+            self._release()
+            raise WorkerPoolUnavailableException("Worker pool '{}' is shut down".format(self.name))
+
+    def _run(self, func, *args, **kwargs):
+        with self._lock:
+            self._active += 1
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            error_log.error("Unhandled error in worker pool '{}' {}".format(self.name, traceback.format_exc()))
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._release()
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        """Current pool occupancy, to help size the pools"""
+        with self._lock:
+            return {
+                "maxWorkers": self.max_workers,
+                "maxQueueSize": self.max_queue_size,
+                "activeWorkers": self._active,
+                "queueDepth": self._in_flight - self._active,
+                "rejected": self._rejected
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool_config(service, config=osdf_config):
+    """Pool sizes for a service from osdf_config.deployment['workerPools'] (falling back to 'default')"""
+    pools_conf = config.deployment.get('workerPools') or {}
+    conf = dict(DEFAULT_POOL_CONFIG)
+    conf.update(pools_conf.get('default') or {})
+    conf.update(pools_conf.get(service) or {})
+    return conf
+
+
+def get_worker_pool(service):
+    """Get (creating it on first use) the shared worker pool for a service
+
+    :param service: service name, e.g. placement, pci, nst_selection
+    :return: BoundedWorkerPool
+    """
+    with _pools_lock:
+        pool = _pools.get(service)
+        if pool is None:
+            conf = pool_config(service)
+            pool = BoundedWorkerPool(service, conf['maxWorkers'], conf['maxQueueSize'])
+            _pools[service] = pool
+        return pool
+
+
+def submit(service, func, *args, **kwargs):
+    """Run func(*args, **kwargs) on the worker pool of the given service"""
+    return get_worker_pool(service).submit(func, *args, **kwargs)
+
+
+def worker_pool_stats():
+    """Occupancy of every worker pool created so far, keyed by service name"""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {name: pool.stats() for name, pool in pools.items()}
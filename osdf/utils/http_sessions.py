@@ -0,0 +1,96 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+"""
+Process-wide pool of keep-alive HTTP sessions
+
+Every remote system OSDF talks to (Conductor, Policy, SO/PCI-handler callbacks, ConfigDB, CPS, DES, AAF, AAI)
+is reached through a requests.Session shared by all requests and threads, so that TCP and TLS connections
+are reused instead of being set up for every call.
+"""
+
+from http.cookiejar import DefaultCookiePolicy
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from osdf.config.base import osdf_config
+
+DEFAULT_POOL_CONFIG = {
+    "pool_connections": 10,  # number of hosts for which connections are kept per session
+    "pool_maxsize": 20,  # connections kept per host
+    "max_retries": 2,  # retries on connection errors and 502/503/504 (idempotent methods only)
+    "backoff_factor": 0.5
+}
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def session_key(url, auth=None):
+    """Sessions are shared per scheme, host (and port) and credentials"""
+    parts = urlsplit(url)
+    return parts.scheme, parts.netloc, auth
+
+
+def pool_config(config=osdf_config):
+    conf = dict(DEFAULT_POOL_CONFIG)
+    conf.update(config.deployment.get('httpConnectionPool') or {})
+    return conf
+
+
+def new_session(conf):
+    """A session with pooled connections and a retry adapter, which does not keep cookies between calls"""
+    retries = Retry(total=conf['max_retries'], connect=conf['max_retries'], read=0,
+                    backoff_factor=conf['backoff_factor'], status_forcelist=(502, 503, 504),
+                    raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=conf['pool_connections'], pool_maxsize=conf['pool_maxsize'],
+                          max_retries=retries)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session(url, auth=None):
+    """Get the shared session for the remote system at url
+
+    :param url: any URL of the remote system
+    :param auth: credentials used for the remote system (e.g. a (userid, password) tuple), if any
+    :return: requests.Session
+    """
+    key = session_key(url, auth)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = new_session(pool_config())
+            _sessions[key] = session
+        return session
+
+
+def close_sessions():
+    """Close all the pooled connections (e.g. on shutdown)"""
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
@@ -17,13 +17,13 @@
 #
 
 import json
-import requests
 import yaml
 
 from osdf.config.base import creds_prefixes
 from osdf.config.base import osdf_config
 from osdf.logging.osdf_logging import debug_log
 from osdf.logging.osdf_logging import MH
+from osdf.utils.http_sessions import get_session
 
 
 def get_rest_client(request_json, service):
@@ -53,7 +53,10 @@ def yaml_from_file(file_name):
 
 
 class RestClient(object):
-    """Simple REST Client that supports get/post and basic auth"""
+    """Simple REST Client that supports get/post and basic auth
+
+    Connections are kept alive and shared with other clients of the same remote system (see http_sessions)
+    """
 
     def __init__(self, userid=None, passwd=None, log_func=None, url=None, timeout=None, headers=None,
                  method="POST", req_id=None, verify=None):
@@ -95,9 +98,10 @@ class RestClient(object):
         else:
             verify = self.verify
 
-        res = requests.request(url=url or self.url, method=method or self.method,
-                               auth=self.auth, headers=self.headers,
-                               timeout=timeout or self.timeout, verify=verify, **kwargs)
+        session = get_session(url, self.auth)
+        res = session.request(url=url, method=method or self.method,
+                              auth=self.auth, headers=self.headers,
+                              timeout=timeout or self.timeout, verify=verify, **kwargs)
 
         if self.log_func:
             self.log_func(MH.received_http_response(res))
@@ -0,0 +1,64 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+
+"""
+Thread-safe map whose entries expire after a time to live
+"""
+
+import itertools
+import threading
+import time
+
+
+class TTLCache(object):
+    """Values of keys looked up from remote systems, reused until they expire
+
+    With a max_size, the entries put first are dropped once there are more than max_size of them.
+    """
+
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        self._entries = {}  # key -> (value, expiry time), in the order they were put
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        """dict of key -> value, for the keys whose values have not expired"""
+        now = time.monotonic()
+        with self._lock:
+            entries = ((key, self._entries.get(key)) for key in keys)
+            return {key: entry[0] for key, entry in entries if entry and entry[1] > now}
+
+    def put_many(self, values, ttl):
+        """Add the values of a dict of key -> value, which expire after ttl seconds (expired entries are dropped)"""
+        now = time.monotonic()
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] > now and k not in values}
+            self._entries.update((key, (value, now + ttl)) for key, value in values.items())
+            if self.max_size is not None and len(self._entries) > self.max_size:
+                excess = len(self._entries) - self.max_size
+                for key in list(itertools.islice(self._entries, excess)):
+                    del self._entries[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -23,9 +23,7 @@ OSDF Manager Main Flask Application
 
 import json
 
-from threading import Thread  # for scaling up, may need celery with RabbitMQ or redis
-
-from flask import request, g
+from flask import request, g, Response
 
 from osdf.apps.baseapp import app, run_app
 from apps.nst.models.api.nstSelectionRequest import NSTSelectionAPI
@@ -34,19 +32,24 @@ from apps.pci.models.api.pciOptimizationRequest import PCIOptimizationAPI
 from apps.nst.optimizers.nst_select_processor import NstSelection
 from apps.nsst.optimizers.nsst_select_processor import NsstSelection
 from apps.pci.optimizers.pci_opt_processor import process_pci_optimation
+from apps.pci.optimizers.topology_cache import get_topology_cache
 from apps.placement.models.api.placementRequest import PlacementAPI
 from apps.placement.optimizers.conductor.remote_opt_processor import process_placement_opt
 from apps.route.optimizers.inter_domain_route_opt import InterDomainRouteOpt
 from apps.route.optimizers.simple_route_opt import RouteOpt
+from apps.route.optimizers.topology import get_route_topology
 from apps.slice_selection.models.api.nsi_selection_request import NSISelectionAPI
 from apps.slice_selection.models.api.nssi_selection_request import NSSISelectionAPI
 from apps.slice_selection.optimizers.conductor.remote_opt_processor import SliceSelectionOptimizer
+from osdf.adapters.aai import aai_client
+from osdf.adapters.policy.cache import get_policy_cache
 from osdf.adapters.policy.interface import get_policies
 from osdf.adapters.policy.interface import upload_policy_models
 from osdf.config.base import osdf_config
 from osdf.config.base import slice_config
 from osdf.logging.osdf_logging import MH, audit_log
 from osdf.operation.responses import osdf_response_for_request_accept as req_accept
+from osdf.operation import worker_pool
 from osdf.utils import api_data_utils
 from osdf.webapp.appcontroller import auth_basic
 from apps.nxi_termination.optimizers.remote_opt_processor import process_nxi_termination_opt
@@ -60,6 +63,88 @@ def do_osdf_health_check():
     return "OK"
 
 
+@app.route("/api/oof/v1/workerpools", methods=["GET"])
+def do_worker_pool_stats():
+    """Queue depth and active workers of the asynchronous worker pools"""
+    body = json.dumps(worker_pool.worker_pool_stats())
+    return Response(body, content_type='application/json; charset=utf-8')
+
+
+@app.route("/api/oof/v1/aai/latency", methods=["GET"])
+def do_aai_latency_stats():
+    """Number, errors and mean/max latency (seconds) of the calls to AAI, per endpoint"""
+    body = json.dumps(aai_client.latency.stats())
+    return Response(body, content_type='application/json; charset=utf-8')
+
+
+@app.route("/api/oof/v1/policycache", methods=["GET"])
+def do_policy_cache_stats():
+    """Size and hit/miss counters of the policy cache"""
+    cache = get_policy_cache(osdf_config)
+    body = json.dumps(cache.stats() if cache else {"enabled": False})
+    return Response(body, content_type='application/json; charset=utf-8')
+
+
+@app.route("/api/oof/v1/policycache/invalidate", methods=["POST"])
+@auth_basic.login_required
+def do_policy_cache_invalidate():
+    """Drop cached policies, optionally only those of a serviceType and/or matching a scope,
+
+    e.g. {"serviceType": "placement", "scope": {"services": ["vCPE"]}}
+    """
+    req_json = request.get_json(silent=True) or {}
+    cache = get_policy_cache(osdf_config)
+    invalidated = cache.invalidate(req_json.get("serviceType"), req_json.get("scope")) if cache else 0
+    audit_log.info("Invalidated {} policy cache entries for {}".format(invalidated, req_json))
+    return Response(json.dumps({"invalidated": invalidated}), content_type='application/json; charset=utf-8')
+
+
+@app.route("/api/oof/v1/pci/topologycache", methods=["GET"])
+def do_pci_topology_cache_stats():
+    """Size and hit/miss counters of the PCI network topology cache"""
+    cache = get_topology_cache(osdf_config)
+    body = json.dumps(cache.stats() if cache else {"enabled": False})
+    return Response(body, content_type='application/json; charset=utf-8')
+
+
+@app.route("/api/oof/v1/pci/topologycache/invalidate", methods=["POST"])
+@auth_basic.login_required
+def do_pci_topology_cache_invalidate():
+    """Drop the cached topology of a network (of all networks without networkId),
+
+    or with a cellIdList only re-pull the neighbor lists of those cells and of their neighbors,
+    e.g. {"networkId": "netw1000", "cellIdList": ["cell0"]}
+    """
+    req_json = request.get_json(silent=True) or {}
+    cache = get_topology_cache(osdf_config)
+    invalidated = cache.invalidate(req_json.get("networkId"), req_json.get("cellIdList")) if cache else 0
+    audit_log.info("Invalidated {} PCI topology cache entries for {}".format(invalidated, req_json))
+    return Response(json.dumps({"invalidated": invalidated}), content_type='application/json; charset=utf-8')
+
+
+@app.route("/api/oof/v1/route/topology", methods=["GET"])
+def do_route_topology_stats():
+    """Versions and sizes of the topology kept in memory for the route APIs"""
+    topology = get_route_topology(osdf_config)
+    body = json.dumps(topology.stats() if topology else {"enabled": False})
+    return Response(body, content_type='application/json; charset=utf-8')
+
+
+@app.route("/api/oof/v1/route/topology/events", methods=["POST"])
+@auth_basic.login_required
+def do_route_topology_events():
+    """Apply AAI events (one or a list) adding, updating or removing links to the route topology,
+
+    e.g. {"event-header": {"entity-type": "logical-link", "action": "DELETE"}, "entity": {"link-name": "link1"}}
+    """
+    req_json = request.get_json(silent=True) or []
+    events = req_json if isinstance(req_json, list) else [req_json]
+    topology = get_route_topology(osdf_config)
+    changed = topology.apply_events(events) if topology else 0
+    audit_log.info("Applied {} AAI events to the route topology, {} changes".format(len(events), changed))
+    return Response(json.dumps({"changed": changed}), content_type='application/json; charset=utf-8')
+
+
 @app.route("/api/oof/loadmodels/v1", methods=["GET"])
 def do_osdf_load_policies():
     audit_log.info("Uploading policy models")
@@ -94,8 +179,7 @@ def placement_rest_api():
     PlacementAPI(request_json).validate()
     policies = get_policies(request_json, "placement")
     audit_log.info(MH.new_worker_thread(req_id, "[for placement]"))
-    t = Thread(target=process_placement_opt, args=(request_json, policies, osdf_config))
-    t.start()
+    worker_pool.submit("placement", process_placement_opt, request_json, policies, osdf_config)
     audit_log.info(MH.accepted_valid_request(req_id, request))
     return req_accept(request_id=req_id,
                       transaction_id=request_json['requestInfo']['transactionId'],
@@ -124,6 +208,28 @@ def do_mdons_route_calc():
     return response
 
 
+@app.route("/api/oof/route/batch/v1", methods=["POST"])
+def do_route_batch_calc():
+    """
+    Perform the route calculations of all the routeRequests, with optional alternative routes
+    """
+    request_json = request.get_json()
+    audit_log.info("Calculate Route batch request received!")
+    response = RouteOpt().get_routes(request_json, osdf_config)
+    return response
+
+
+@app.route("/api/oof/mdons/route/batch/v1", methods=["POST"])
+def do_mdons_route_batch_calc():
+    """
+    Perform the inter domain route calculations of all the routeRequests, with optional alternative routes
+    """
+    request_json = request.get_json()
+    audit_log.info("Inter Domain Calculation Route batch request received!")
+    response = InterDomainRouteOpt().get_routes(request_json, osdf_config)
+    return response
+
+
 @app.route("/api/oof/v1/selection/nst", methods=["POST"])
 def do_nst_selection():
     request_json = request.get_json()
@@ -132,7 +238,7 @@ def do_nst_selection():
     NSTSelectionAPI(request_json).validate()
     audit_log.info(MH.new_worker_thread(req_id, "[for NST selection]"))
     nst_selection = NstSelection(osdf_config, request_json)
-    nst_selection.start()
+    worker_pool.submit("nst_selection", nst_selection.run)
     return req_accept(request_id=req_id,
                       transaction_id=request_json['requestInfo']['transactionId'],
                       request_status="accepted", status_message="")
@@ -146,7 +252,7 @@ def do_nsst_selection():
     NSSTSelectionAPI(request_json).validate()
     audit_log.info(MH.new_worker_thread(req_id, "[for NSST selection]"))
     nsst_selection = NsstSelection(osdf_config, request_json)
-    nsst_selection.start()
+    worker_pool.submit("nsst_selection", nsst_selection.run)
     return req_accept(request_id=req_id,
                       transaction_id=request_json['requestInfo']['transactionId'],
                       request_status="accepted", status_message="")
@@ -169,8 +275,7 @@ def do_pci_optimization():
     # disable policy retrieval
     # policies = get_policies(request_json, "pciopt")
     audit_log.info(MH.new_worker_thread(req_id, "[for pciopt]"))
-    t = Thread(target=process_pci_optimation, args=(request_json, osdf_config, None))
-    t.start()
+    worker_pool.submit("pci", process_pci_optimation, request_json, osdf_config, None)
     audit_log.info(MH.accepted_valid_request(req_id, request))
     audit_log.info('reached upto return')
     return req_accept(request_id=req_id,
@@ -187,7 +292,7 @@ def do_nsi_selection():
     NSISelectionAPI(request_json).validate()
     audit_log.info(MH.new_worker_thread(req_id, "[for NSI selection]"))
     slice_opt = SliceSelectionOptimizer(osdf_config, slice_config, request_json, 'NSI')
-    slice_opt.start()
+    worker_pool.submit("nsi_selection", slice_opt.run)
     return req_accept(request_id=req_id,
                       transaction_id=request_json['requestInfo']['transactionId'],
                       request_status="accepted", status_message="")
@@ -202,7 +307,7 @@ def do_nssi_selection():
     NSSISelectionAPI(request_json).validate()
     audit_log.info(MH.new_worker_thread(req_id, "[for NSSI selection]"))
     slice_opt = SliceSelectionOptimizer(osdf_config, slice_config, request_json, 'NSSI')
-    slice_opt.start()
+    worker_pool.submit("nssi_selection", slice_opt.run)
     return req_accept(request_id=req_id,
                       transaction_id=request_json['requestInfo']['transactionId'],
                       request_status="accepted", status_message="")
@@ -0,0 +1,70 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from requests import ConnectionError
+
+from osdf.adapters.aai import aai_client
+from osdf.adapters.aai.aai_client import AAIClient
+from osdf.adapters.aai.aai_client import AAIException
+from osdf.utils.programming_utils import DotDict
+
+
+class TestAAIClient(unittest.TestCase):
+
+    def setUp(self):
+        self.config = DotDict({"deployment": {"aaiUrl": "https://aai.test:8443", "aaiUsername": "oof",
+                                              "aaiPassword": "secret", "aaiTimeout": [1, 5]}})
+        aai_client.latency = aai_client.EndpointLatency()
+
+    def test_get(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"a": 1}
+        with patch('requests.Session.get', return_value=response) as mock_get:
+            self.assertEqual({"a": 1}, AAIClient(self.config).get("/aai/v19/x?depth=2", endpoint="x"))
+        args, kwargs = mock_get.call_args
+        self.assertEqual("https://aai.test:8443/aai/v19/x?depth=2", args[0])
+        self.assertEqual(("oof", "secret"), kwargs['auth'])
+        self.assertEqual((1, 5), kwargs['timeout'])
+        self.assertEqual(1, aai_client.latency.stats()["x"]["count"])
+        self.assertEqual(0, aai_client.latency.stats()["x"]["errors"])
+
+    def test_errors(self):
+        client = AAIClient(self.config)
+        with patch('requests.Session.get', return_value=MagicMock(status_code=404)):
+            self.assertRaises(AAIException, client.get, "/aai/v19/x")
+        with patch('requests.Session.put', side_effect=ConnectionError("down")):
+            self.assertRaises(AAIException, client.dsl_query, "q", "resource", "/aai/v23/dsl?format=")
+        stats = aai_client.latency.stats()
+        self.assertEqual(1, stats["/aai/v19/x"]["errors"])
+        self.assertEqual(1, stats["dsl"]["errors"])
+
+    def test_insecure_warning_only_without_verify(self):
+        with patch('urllib3.disable_warnings') as mock_disable:
+            self.config.deployment["aaiVerify"] = True
+            AAIClient(self.config)
+            mock_disable.assert_not_called()
+            self.config.deployment["aaiVerify"] = False
+            AAIClient(self.config)
+            mock_disable.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
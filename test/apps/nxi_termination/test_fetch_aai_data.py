@@ -50,7 +50,7 @@ class TestRemoteOptProcessor(unittest.TestCase):
         response.status_code = 200
         response.ok = True
         response.json.return_value = response_json
-        self.patcher_req = patch('requests.get',
+        self.patcher_req = patch('requests.Session.get',
                                          return_value = response)
         self.Mock_req = self.patcher_req.start()
         self.assertEquals(response_json, get_aai_data(request_json,osdf_config))
@@ -59,7 +59,7 @@ class TestRemoteOptProcessor(unittest.TestCase):
         responsenew=mock.MagicMock()
         responsenew.status_code=404
         responsenew.json.return_value = exception_json
-        self.patcher_req = patch('requests.get',
+        self.patcher_req = patch('requests.Session.get',
                                  return_value=responsenew)
         self.Mock_req = self.patcher_req.start()
         self.assertRaises( AAIException,get_aai_data,request_json,osdf_config)
@@ -0,0 +1,97 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import random
+import unittest
+
+from apps.pci.optimizers.solver import coloring
+from apps.pci.optimizers.solver.coloring import ConflictGraph
+
+
+def random_dzn(num_nodes, degree, seed, num_pcis=None):
+    rnd = random.Random(seed)
+    neighbors = set()
+    for node in range(num_nodes):
+        for nbr in rnd.sample(range(num_nodes), degree):
+            if nbr != node:
+                neighbors.add((node, nbr))
+    second_level = set()
+    for node in range(num_nodes):
+        nbrs = sorted(b for a, b in neighbors if a == node)
+        second_level.update((a, b) for i, a in enumerate(nbrs) for b in nbrs[i + 1:])
+    return {
+        'NUM_NODES': num_nodes,
+        'NUM_PCIS': num_pcis or num_nodes,
+        'NUM_NEIGHBORS': len(neighbors),
+        'NEIGHBORS': sorted([a, b] for a, b in neighbors),
+        'NUM_SECOND_LEVEL_NEIGHBORS': len(second_level),
+        'SECOND_LEVEL_NEIGHBORS': sorted([a, b] for a, b in second_level),
+        'PCI_UNCHANGEABLE_CELLS': set(),
+        'ORIGINAL_PCIS': [0] * num_nodes
+    }
+
+
+def conflicts(dzn_data, pcis, key):
+    return [(a, b) for a, b in dzn_data[key] if pcis[a] == pcis[b]]
+
+
+class TestColoring(unittest.TestCase):
+
+    def test_no_conflicts_no_confusion(self):
+        for seed in range(5):
+            data = random_dzn(60, 4, seed)
+            solution = coloring.solve(data, False)
+            pcis = solution[0]['pci']
+            self.assertEqual(list(range(60)), sorted(pcis))
+            self.assertEqual([], conflicts(data, pcis, 'NEIGHBORS'))
+            self.assertEqual([], conflicts(data, pcis, 'SECOND_LEVEL_NEIGHBORS'))
+            self.assertTrue(all(0 <= pci < 60 for pci in pcis.values()))
+
+    def test_tabu_search_resolves_conflicts(self):
+        data = random_dzn(40, 3, 7, num_pcis=25)
+        graph = ConflictGraph.from_dzn(data, False)
+        colors, total = coloring.tabu_search(graph, [0] * 40, 25, {})
+        self.assertEqual(0, total)
+        self.assertEqual(0, graph.cost(colors))
+
+    def test_fixed_cells_keep_their_pci(self):
+        data = random_dzn(30, 3, 1)
+        data['PCI_UNCHANGEABLE_CELLS'] = {2, 5}
+        data['ORIGINAL_PCIS'] = [7] * 30
+        data['ORIGINAL_PCIS'][5] = 11
+        pcis = coloring.solve(data, False)[0]['pci']
+        self.assertEqual((7, 11), (pcis[2], pcis[5]))
+        self.assertEqual([], conflicts(data, pcis, 'NEIGHBORS'))
+
+    def test_no_assignment_found(self):
+        data = random_dzn(3, 0, 1)
+        data.update({'NUM_NEIGHBORS': 1, 'NEIGHBORS': [[0, 1]], 'PCI_UNCHANGEABLE_CELLS': {0, 1}})
+        self.assertIsNone(coloring.solve(data, False))
+        self.assertIsNone(coloring.solve(random_dzn(6, 5, 3, num_pcis=3), False))
+
+    def test_anr_uses_ignorable_links(self):
+        # a triangle with two PCIs: one of the links has to be given up
+        data = random_dzn(3, 0, 1, num_pcis=2)
+        data.update({'NUM_NEIGHBORS': 3, 'NEIGHBORS': [[0, 1], [0, 2], [1, 2]],
+                     'NUM_IGNORABLE_NEIGHBOR_LINKS': 1, 'IGNORABLE_NEIGHBOR_LINKS': [[1, 2]]})
+        solution = coloring.solve(data, True)[0]
+        self.assertEqual([1], solution['used_ignorables'])
+        self.assertEqual([(1, 2)], conflicts(data, solution['pci'], 'NEIGHBORS'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import threading
+import time
+import unittest
+from unittest import mock
+
+from apps.pci.optimizers.config.config_client import ConfigClient
+from apps.pci.optimizers.config.cps import Cps
+from apps.pci.optimizers.config_request import request
+from osdf.utils.programming_utils import DotDict
+
+
+class SlowClient(ConfigClient):
+    """Client whose neighbor list calls take a while, recording how many run at the same time"""
+
+    def __init__(self, cells):
+        self.cells = cells
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def get_cell_list(self, network_id):
+        return list(self.cells)
+
+    def get_nbr_list(self, network_id, cell_id):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return [{'targetCellId': cell_id + '-nbr', 'pciValue': 1, 'ho': True}]
+
+
+def relation(cell_id, pci):
+    return {'attributes': {'nRTCI': cell_id, 'nRPCI': str(pci), 'isHOAllowed': True}}
+
+
+class TestConfigRequest(unittest.TestCase):
+
+    def setUp(self):
+        self.cells = ['cell-{}'.format(i) for i in range(8)]
+        self.req = {'cellInfo': {'networkId': 'NTWK001'}}
+
+    def config(self, **deployment):
+        return DotDict({'deployment': dict(deployment, configClientType='slow')})
+
+    def test_concurrent_fetch_is_bounded_and_ordered(self):
+        client = SlowClient(self.cells)
+        with mock.patch.object(ConfigClient, 'create', return_value=client):
+            cell_resp, response = request(self.req, self.config(configClientConcurrency=3), [])
+        self.assertEqual(self.cells, cell_resp)
+        self.assertEqual(list(range(8)), [c['id'] for c in response['cell_list']])
+        self.assertEqual([c + '-nbr' for c in self.cells],
+                         [c['nbr_list'][0]['targetCellId'] for c in response['cell_list']])
+        self.assertEqual(3, client.max_running)
+
+    def test_sequential_fetch_by_default(self):
+        client = SlowClient(self.cells)
+        with mock.patch.object(ConfigClient, 'create', return_value=client):
+            _, response = request(self.req, self.config(), [])
+        self.assertEqual(8, len(response['cell_list']))
+        self.assertEqual(1, client.max_running)
+
+    def test_cps_fetches_per_cell(self):
+        client = Cps.__new__(Cps)
+        client.config = {'cpsUrl': 'http://cps', 'cpsNbrListUrl': 'ran-network/getNbrList'}
+        client.rc = mock.MagicMock()
+        client.rc.request.return_value = {'NRCellRelation': [relation('c9', 3)]}
+        nbr_lists = client.get_nbr_lists('NTWK001', ['c1', 'c2'], 2)
+        self.assertEqual(2, client.rc.request.call_count)
+        self.assertEqual([{'targetCellId': 'c9', 'pciValue': 3, 'ho': True}], nbr_lists['c2'])
+
+
+if __name__ == "__main__":
+    unittest.main()
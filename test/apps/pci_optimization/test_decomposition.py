@@ -0,0 +1,98 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import unittest
+
+from apps.pci.optimizers.solver.decomposition import connected_components
+from apps.pci.optimizers.solver.decomposition import decompose
+from apps.pci.optimizers.solver.decomposition import is_decomposable
+from apps.pci.optimizers.solver.decomposition import neighborhood
+
+
+def dzn(num_nodes, neighbors, second_level, ignorable=None, unchangeable=()):
+    data = {
+        'NUM_NODES': num_nodes,
+        'NUM_PCIS': num_nodes,
+        'NUM_NEIGHBORS': len(neighbors),
+        'NEIGHBORS': neighbors,
+        'NUM_SECOND_LEVEL_NEIGHBORS': len(second_level),
+        'SECOND_LEVEL_NEIGHBORS': second_level,
+        'PCI_UNCHANGEABLE_CELLS': set(unchangeable),
+        'ORIGINAL_PCIS': [10 + i for i in range(num_nodes)]
+    }
+    if ignorable is not None:
+        data['NUM_IGNORABLE_NEIGHBOR_LINKS'] = len(ignorable)
+        data['IGNORABLE_NEIGHBOR_LINKS'] = ignorable
+    return data
+
+
+class TestDecomposition(unittest.TestCase):
+
+    def test_connected_components(self):
+        self.assertEqual([[0, 3], [1, 4, 5], [2]], connected_components(6, [[3, 0], [4, 1]], [[5, 4]]))
+        self.assertEqual([[0], [1]], connected_components(2))
+
+    def test_decompose(self):
+        data = dzn(6, [[0, 2], [2, 0], [1, 3]], [[2, 4], [3, 5]], unchangeable=[4, 5])
+        sub_problems = decompose(data, False)
+        self.assertEqual([[0, 2, 4], [1, 3, 5]], [sub.nodes for sub in sub_problems])
+        first = sub_problems[0].dzn_data
+        self.assertEqual([[0, 1], [1, 0]], first['NEIGHBORS'])
+        self.assertEqual([[1, 2]], first['SECOND_LEVEL_NEIGHBORS'])
+        self.assertEqual({2}, first['PCI_UNCHANGEABLE_CELLS'])
+        self.assertEqual([10, 12, 14], first['ORIGINAL_PCIS'])
+        self.assertEqual(6, first['NUM_PCIS'])
+        self.assertNotIn('IGNORABLE_NEIGHBOR_LINKS', first)
+        self.assertEqual(({1: 7, 3: 8, 5: 9}, []), sub_problems[1].to_global({'pci': {0: 7, 1: 8, 2: 9}}))
+
+    def test_decompose_anr(self):
+        data = dzn(5, [[0, 1], [2, 3]], [], ignorable=[[2, 3]])
+        sub_problems = decompose(data, True)
+        self.assertEqual([[0, 1], [2, 3], [4]], [sub.nodes for sub in sub_problems])
+        self.assertEqual([True, True, True], [sub.anr_flag for sub in sub_problems])  # confusions stay soft
+        self.assertEqual([], sub_problems[0].dzn_data['IGNORABLE_NEIGHBOR_LINKS'])
+        self.assertEqual([[0, 1]], sub_problems[1].dzn_data['IGNORABLE_NEIGHBOR_LINKS'])
+        self.assertEqual(({2: 0, 3: 0}, [(2, 3)]),
+                         sub_problems[1].to_global({'pci': [0, 0], 'used_ignorables': [1]}))
+        self.assertFalse(sub_problems[2].has_links())
+
+    def test_neighborhood(self):
+        # path 0 - 1 - 2 - 3 - 4 - 5, with a confusion between 4 and 5
+        data = dzn(6, [[0, 1], [1, 2], [2, 3], [3, 4]], [[4, 5]], unchangeable=[2])
+        sub_problem = neighborhood(data, False, [2], 1)
+        self.assertEqual([0, 1, 2, 3, 4], sub_problem.nodes)
+        self.assertEqual([[0, 1], [1, 2], [2, 3], [3, 4]], sub_problem.dzn_data['NEIGHBORS'])
+        self.assertEqual({0, 2, 4}, sub_problem.dzn_data['PCI_UNCHANGEABLE_CELLS'])
+        self.assertEqual([], sub_problem.dzn_data['SECOND_LEVEL_NEIGHBORS'])
+
+        sub_problem = neighborhood(data, False, [4], 0)
+        self.assertEqual([3, 4, 5], sub_problem.nodes)
+        self.assertEqual([[0, 1]], sub_problem.dzn_data['NEIGHBORS'])
+        self.assertEqual([[1, 2]], sub_problem.dzn_data['SECOND_LEVEL_NEIGHBORS'])
+        self.assertEqual({0, 2}, sub_problem.dzn_data['PCI_UNCHANGEABLE_CELLS'])
+
+    def test_is_decomposable(self):
+        self.assertTrue(is_decomposable(dzn(3, [[0, 1]], [[1, 2]]), False))
+        self.assertFalse(is_decomposable(dzn(3, [[0, None]], []), False))
+        self.assertFalse(is_decomposable(dzn(3, [[0, 1]], [], ignorable=[[1, 7]]), True))
+        data = dzn(3, [[0, 1]], [])
+        data['ORIGINAL_PCIS'] = [1, 2]
+        self.assertFalse(is_decomposable(data, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
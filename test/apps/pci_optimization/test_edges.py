@@ -0,0 +1,59 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import random
+import unittest
+
+from apps.pci.optimizers.solver import optimizer
+from apps.pci.optimizers.solver.edges import NeighborArrays
+from apps.pci.optimizers.solver.pci_utils import NetworkIndex
+
+
+def random_network(num_cells, max_degree, seed):
+    """Cells with random neighbor lists, including unknown cells, duplicates and self references"""
+    rnd = random.Random(seed)
+    targets = ["cell{}".format(i) for i in range(num_cells)] + ["unknown"]
+    return {'cell_list': [{'cell_id': "cell{}".format(i), 'id': i,
+                           'nbr_list': [{'targetCellId': rnd.choice(targets), 'pciValue': 0}
+                                        for _ in range(rnd.randint(0, max_degree))]}
+                          for i in range(num_cells)]}
+
+
+class TestEdges(unittest.TestCase):
+
+    def test_same_edges_as_python_builders(self):
+        for seed in range(10):
+            net = random_network(50, 8, seed)
+            index = NetworkIndex(net)
+            arrays = NeighborArrays(net, index)
+            neighbor_edges = arrays.neighbor_edges()
+            second_level_edges = arrays.second_level_edges()
+            self.assertEqual('int32', str(second_level_edges.dtype))
+            self.assertEqual(optimizer.get_list(optimizer.get_neighbor_list(net, index)),
+                             optimizer.get_list(neighbor_edges))
+            self.assertEqual(optimizer.get_list(optimizer.get_second_level_neighbor(net, index)),
+                             optimizer.get_list(second_level_edges))
+
+    def test_no_edges(self):
+        net = {'cell_list': [{'cell_id': "cell0", 'id': 0, 'nbr_list': []}]}
+        arrays = NeighborArrays(net, NetworkIndex(net))
+        self.assertEqual((0, 2), arrays.neighbor_edges().shape)
+        self.assertEqual([], optimizer.get_list(arrays.second_level_edges()))
+
+
+if __name__ == "__main__":
+    unittest.main()
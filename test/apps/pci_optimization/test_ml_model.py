@@ -17,9 +17,11 @@
 #
 
 import copy
+import json
 from mock import patch
 import unittest
 from apps.pci.optimizers.solver.ml_model import MlModel
+from apps.pci.optimizers.solver.ml_model import ho_stats_cache
 from osdf.adapters.dcae.des import DESException
 import osdf.config.loader as config_loader
 from osdf.utils.interfaces import json_from_file
@@ -66,12 +68,17 @@ class TestMlModel(unittest.TestCase):
                 }
             ]
         }
-        self.patcher_req = patch('osdf.adapters.dcae.des.extract_data', side_effect=results)
+        results_by_cell = dict(zip(['Chn0001', 'Chn0002'], results))
+        self.patcher_req = patch('osdf.adapters.dcae.des.extract_data',
+                                 side_effect=lambda service_id, data: results_by_cell[json.loads(data)['cell_id']])
         self.Mock_req = self.patcher_req.start()
         mlmodel = MlModel()
         mlmodel.get_additional_inputs(dzn_data, network_cell_info)
         self.assertEqual({1}, dzn_data['PCI_UNCHANGEABLE_CELLS'])
         self.patcher_req.stop()
+        self.assertEqual({'Chn0001': (925, 1300), 'Chn0002': (425, 450)},
+                         ho_stats_cache.get_many(['Chn0001', 'Chn0002']))
+        ho_stats_cache.clear()
 
         dzn_data['PCI_UNCHANGEABLE_CELLS'] = []
         self.patcher_req = patch('osdf.adapters.dcae.des.extract_data', side_effect=DESException('error'))
@@ -85,3 +92,51 @@ class TestMlModel(unittest.TestCase):
         mlmodel.get_additional_inputs(dzn_data, network_cell_info)
         self.assertEqual(set() , dzn_data['PCI_UNCHANGEABLE_CELLS'])
         self.patcher_req.stop()
+
+    def test_batched_and_cached_ho_details(self):
+        ho_stats_cache.clear()
+        cell_ids = ['Chn000{}'.format(i) for i in range(5)]
+        batch_results = [
+            [{'cellId': 'Chn0000', 'overallHoAtt': 20000}, {'cellId': 'Chn0001', 'overallHoAtt': 10},
+             {'cellId': 'Chn0000', 'overallHoAtt': 100}],
+            DESException('error'),
+            [{'cellId': 'Chn0004', 'overallHoAtt': 700}]
+        ]
+        des_config = dict(MlModel().config['DES'], batch_service_id='ho_metric_batch', batch_size=2, cache_ttl=60)
+        with patch.dict(MlModel().config, {'DES': des_config}), \
+                patch('osdf.adapters.dcae.des.extract_data', side_effect=batch_results) as mock_des:
+            ho_details = MlModel().get_ho_details_of_cells(cell_ids)
+            self.assertEqual({'Chn0000': (10050, 20000), 'Chn0001': (10, 10), 'Chn0002': (0, 0), 'Chn0003': (0, 0),
+                              'Chn0004': (700, 700)}, ho_details)
+            self.assertEqual(3, mock_des.call_count)
+            service_id, request_data = mock_des.call_args_list[0][0]
+            self.assertEqual('ho_metric_batch', service_id)
+            self.assertEqual({'interval': 10, 'cell_ids': ['Chn0000', 'Chn0001']}, json.loads(request_data))
+            self.assertEqual({'interval': 10}, des_config['filter'])
+
+            # only the cells of the failed batch are fetched again
+            mock_des.side_effect = [[{'cellId': 'Chn0003', 'overallHoAtt': 1}]]
+            ho_details = MlModel().get_ho_details_of_cells(cell_ids)
+            self.assertEqual(4, mock_des.call_count)
+            self.assertEqual(['Chn0002', 'Chn0003'], json.loads(mock_des.call_args[0][1])['cell_ids'])
+            self.assertEqual((1, 1), ho_details['Chn0003'])
+        ho_stats_cache.clear()
+
+    def test_concurrent_ho_details(self):
+        ho_stats_cache.clear()
+        cell_ids = ['Chn000{}'.format(i) for i in range(6)]
+
+        def extract_data(service_id, request_data):
+            cell_id = json.loads(request_data)['cell_id']
+            if cell_id == 'Chn0002':
+                raise DESException('error')
+            return [{'overallHoAtt': int(cell_id[-1])}]
+
+        des_config = dict(MlModel().config['DES'], concurrency=3, cache_ttl=60)
+        with patch.dict(MlModel().config, {'DES': des_config}), \
+                patch('osdf.adapters.dcae.des.extract_data', side_effect=extract_data) as mock_des:
+            ho_details = MlModel().get_ho_details_of_cells(cell_ids)
+        self.assertEqual(6, mock_des.call_count)
+        self.assertEqual({cell_id: (0, 0) if i == 2 else (i, i) for i, cell_id in enumerate(cell_ids)}, ho_details)
+        self.assertEqual({}, ho_stats_cache.get_many(['Chn0002']))  # not cached, DES did not answer
+        ho_stats_cache.clear()
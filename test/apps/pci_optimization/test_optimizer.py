@@ -0,0 +1,155 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+from unittest.mock import patch
+
+from apps.pci.optimizers.pci_opt_processor import build_solution_list
+from apps.pci.optimizers.solver import optimizer
+from apps.pci.optimizers.solver.optimizer import PciOptimizationContext
+from osdf.operation.exceptions import BusinessException
+
+
+def network(prefix, size):
+    """Ring of size cells, each neighbor of the next two; the PCI of a cell is its position"""
+    cells = ["{}{}".format(prefix, i) for i in range(size)]
+    return {'cell_list': [{'cell_id': cell, 'id': i,
+                           'nbr_list': [{'targetCellId': cells[(i + k) % size], 'pciValue': (i + k) % size}
+                                        for k in (1, 2)]}
+                          for i, cell in enumerate(cells)]}
+
+
+def request(fixed_cells=()):
+    return {"requestInfo": {"optimizers": ["pci"]}, "cellInfo": {"fixedPCICells": list(fixed_cells)}}
+
+
+def echo_original_pcis(mzn_model, dzn_data):
+    return [{'pci': dict(enumerate(dzn_data['ORIGINAL_PCIS']))}]
+
+
+class TestOptimizer(unittest.TestCase):
+
+    def test_context(self):
+        context = PciOptimizationContext(network("a", 5), ["a0", "a1", "a2", "a3", "a4"], request(["a3"]))
+        self.assertEqual(3, context.cell_id_mapping["a3"])
+        self.assertEqual("a3", context.id_cell_mapping[3])
+        self.assertEqual({3}, context.unchangeable_pcis)
+        self.assertEqual([0, 1, 2, 3, 4], context.original_pcis)
+        self.assertEqual(5, context.dzn_data['NUM_NODES'])
+        self.assertFalse(context.anr_flag)
+
+    def test_concurrent_requests(self):
+        networks = {prefix: network(prefix, size) for prefix, size in [("a", 4), ("b", 7), ("c", 11)]}
+
+        def optimize(prefix):
+            net = networks[prefix]
+            cells = [c['cell_id'] for c in net['cell_list']]
+            return prefix, optimizer.pci_optimize(net, cells, request([cells[-1]]))
+
+        with patch('apps.pci.optimizers.solver.optimizer.solve', side_effect=echo_original_pcis):
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                results = list(executor.map(optimize, list(networks) * 20))
+        for prefix, solution in results:
+            self.assertEqual(len(networks[prefix]['cell_list']), len(solution['pci']))
+
+    def test_independent_clusters_are_solved_separately(self):
+        net_a, net_b = network("a", 4), network("b", 5)
+        for cell in net_b['cell_list']:
+            cell['id'] += 4
+        net = {'cell_list': net_a['cell_list'] + net_b['cell_list']}
+        for cell in net['cell_list']:
+            for nbr in cell['nbr_list']:
+                nbr['pciValue'] = 20 + int(nbr['targetCellId'][1:]) + (4 if nbr['targetCellId'][0] == 'b' else 0)
+        cells = [c['cell_id'] for c in net['cell_list']]
+
+        with patch('apps.pci.optimizers.solver.optimizer.solve', side_effect=echo_original_pcis) as mock_solve:
+            solution = optimizer.pci_optimize(net, cells, request(["b0"]))
+        self.assertEqual(2, mock_solve.call_count)
+        self.assertEqual([4, 5], sorted(call[0][1]['NUM_NODES'] for call in mock_solve.call_args_list))
+        self.assertEqual({i: 20 + i for i in range(9)}, solution['pci'])
+
+        with patch.dict(optimizer.osdf_config.core['PCI'], {'decomposition': {'enabled': False}}), \
+                patch('apps.pci.optimizers.solver.optimizer.solve', side_effect=echo_original_pcis) as mock_solve:
+            self.assertEqual(solution, optimizer.pci_optimize(net, cells, request(["b0"])))
+        self.assertEqual(1, mock_solve.call_count)
+
+    def test_one_index_per_request(self):
+        net = network("a", 5)
+        cells = [c['cell_id'] for c in net['cell_list']]
+        req = request()
+        req['requestInfo']['requestId'] = "r1"
+        with patch('apps.pci.optimizers.solver.optimizer.solve', side_effect=echo_original_pcis), \
+                patch('apps.pci.optimizers.solver.optimizer.NetworkIndex', side_effect=AssertionError), \
+                patch('apps.pci.optimizers.solver.ml_model.NetworkIndex', side_effect=AssertionError):
+            self.assertEqual(("success", [], []), build_solution_list(cells, net, req))
+
+    def test_engines(self):
+        net = network("a", 9)
+        cells = [c['cell_id'] for c in net['cell_list']]
+        req = request()
+        req['requestInfo']['engine'] = 'native'
+        with patch('apps.pci.optimizers.solver.optimizer.solve') as mock_solve:
+            solution = optimizer.pci_optimize(net, cells, req)
+        mock_solve.assert_not_called()
+        context = PciOptimizationContext(net, cells, req)
+        for a, b in context.dzn_data['NEIGHBORS'] + context.dzn_data['SECOND_LEVEL_NEIGHBORS']:
+            self.assertNotEqual(solution['pci'][a], solution['pci'][b])
+
+        req['requestInfo']['engine'] = 'native-warm-start'
+        with patch('apps.pci.optimizers.solver.optimizer.solve', side_effect=echo_original_pcis) as mock_solve:
+            optimizer.pci_optimize(net, cells, req)
+        mzn_model, dzn_data = mock_solve.call_args[0]
+        self.assertIn('solve :: warm_start(array1d(pci), PCI_HINT) :: int_search', mzn_model)
+        self.assertEqual([solution['pci'][node] for node in range(9)], dzn_data['PCI_HINT'])
+
+    def test_incremental(self):
+        def move_free_cells(mzn_model, dzn_data):
+            fixed = dzn_data['PCI_UNCHANGEABLE_CELLS']
+            return [{'pci': {i: pci if i in fixed else 100 + pci for i, pci in enumerate(dzn_data['ORIGINAL_PCIS'])}}]
+
+        net = network("a", 12)
+        cells = [c['cell_id'] for c in net['cell_list']]
+        req = request()
+        req['cellInfo'].update({'incremental': True, 'cellIdList': ['a5'], 'neighborhoodHops': 0})
+        with patch('apps.pci.optimizers.solver.optimizer.solve', side_effect=move_free_cells) as mock_solve:
+            solution = optimizer.pci_optimize(net, cells, req)
+            self.assertEqual({5: 105}, {i: pci for i, pci in solution['pci'].items() if pci != i})
+            self.assertEqual(5, mock_solve.call_args[0][1]['NUM_NODES'])
+
+            req['cellInfo']['neighborhoodHops'] = 1
+            solution = optimizer.pci_optimize(net, cells, req)
+            self.assertEqual([3, 4, 5, 6, 7], [i for i, pci in solution['pci'].items() if pci != i])
+            self.assertEqual(12, len(solution['pci']))
+
+            req['cellInfo']['cellIdList'] = ['a5', 'b1']
+            self.assertRaises(BusinessException, optimizer.pci_optimize, net, cells, req)
+
+    def test_incremental_falls_back_to_the_whole_network(self):
+        net = network("a", 6)
+        net['cell_list'].append({'cell_id': 'a6', 'id': 6, 'nbr_list': []})  # nobody knows its PCI
+        cells = [c['cell_id'] for c in net['cell_list']]
+        req = request()
+        req['cellInfo'].update({'incremental': True, 'cellIdList': ['a5']})
+        with patch('apps.pci.optimizers.solver.optimizer.solve', side_effect=echo_original_pcis) as mock_solve, \
+                self.assertLogs(level='WARNING'):
+            optimizer.pci_optimize(net, cells, req)
+        self.assertEqual(7, mock_solve.call_args[0][1]['NUM_NODES'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import unittest
+
+from apps.pci.optimizers.solver import pci_utils
+
+
+class TestPciUtils(unittest.TestCase):
+
+    def test_network_index_matches_scans(self):
+        network_cell_info = {'cell_list': [
+            {'cell_id': 'Chn0001', 'id': 0, 'nbr_list': [{'targetCellId': 'Chn0002', 'pciValue': 7},
+                                                         {'targetCellId': 'Chn0009', 'pciValue': 9}]},
+            {'cell_id': 'Chn0002', 'id': 1, 'nbr_list': [{'targetCellId': 'Chn0001', 'pciValue': 3},
+                                                         {'targetCellId': 'Chn0002', 'pciValue': 8}]},
+            {'cell_id': 'Chn0003', 'id': 2, 'nbr_list': []}]}
+        index = pci_utils.NetworkIndex(network_cell_info)
+        for cell_id in ['Chn0001', 'Chn0002', 'Chn0003', 'Chn0009']:
+            self.assertEqual(pci_utils.get_id(network_cell_info, cell_id), index.get_id(cell_id))
+        for id in [0, 1, 2, 3]:
+            self.assertEqual(pci_utils.get_cell_id(network_cell_info, id), index.get_cell_id(id))
+            self.assertEqual(pci_utils.get_pci_value(network_cell_info, id), index.get_pci_value(id))
+        self.assertEqual(7, index.get_pci_value(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
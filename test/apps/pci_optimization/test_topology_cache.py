@@ -0,0 +1,130 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import unittest
+from unittest import mock
+
+from apps.pci.optimizers.topology_cache import TopologyCache
+
+
+class TestTopologyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.fetch_cells = mock.MagicMock(return_value=['c1', 'c2', 'c3'])
+        self.fetch_nbr_lists = mock.MagicMock(
+            side_effect=lambda cell_ids: {c: [{'targetCellId': c + '-nbr'}] for c in cell_ids})
+
+    def get(self, cache, network_id='netw1', changed_cells=()):
+        return cache.get(network_id, self.fetch_cells, self.fetch_nbr_lists, changed_cells)
+
+    def test_hit_does_not_fetch_again(self):
+        cache = TopologyCache(ttl=60)
+        cell_ids, nbr_lists = self.get(cache)
+        nbr_lists['c1'].clear()  # callers get copies
+        self.assertEqual((cell_ids, {'c1': [{'targetCellId': 'c1-nbr'}], 'c2': [{'targetCellId': 'c2-nbr'}],
+                                     'c3': [{'targetCellId': 'c3-nbr'}]}), self.get(cache))
+        self.assertEqual(1, self.fetch_cells.call_count)
+        self.assertEqual(1, self.fetch_nbr_lists.call_count)
+        self.get(cache, 'netw2')
+        self.assertEqual(2, self.fetch_cells.call_count)
+        self.assertEqual(1, cache.stats()['hits'])
+
+    def test_expired_entry_is_fetched_again(self):
+        cache = TopologyCache(ttl=0)
+        self.get(cache)
+        self.get(cache)
+        self.assertEqual(2, self.fetch_cells.call_count)
+
+    def test_invalidate_network(self):
+        cache = TopologyCache()
+        self.get(cache)
+        self.assertEqual(1, cache.invalidate('netw1'))
+        self.assertEqual(0, cache.invalidate('netw1'))
+        self.get(cache)
+        self.assertEqual(2, self.fetch_cells.call_count)
+
+    def test_invalidated_cells_are_re_pulled(self):
+        cache = TopologyCache()
+        self.get(cache)
+        cache.invalidate('netw1', ['c3', 'c1'])
+        self.get(cache)
+        self.get(cache)
+        self.assertEqual(2, self.fetch_cells.call_count)  # the cell list is refreshed along with them
+        self.assertEqual([mock.call(['c1', 'c2', 'c3']), mock.call(['c1', 'c3'])], self.fetch_nbr_lists.call_args_list)
+        self.assertEqual(2, cache.stats()['refreshedCells'])
+
+    def test_neighbors_of_changed_cells_are_re_pulled(self):
+        pci = {'c1': 1, 'c2': 2, 'c3': 3}
+        self.fetch_nbr_lists.side_effect = lambda cell_ids: {
+            c: [{'targetCellId': n, 'pciValue': pci[n]} for n in ['c1', 'c2', 'c3'] if n != c and 'c2' in (c, n)]
+            for c in cell_ids}
+        cache = TopologyCache()
+        self.get(cache)
+        pci['c1'] = 11
+        cache.invalidate('netw1', ['c1'])
+        _, nbr_lists = self.get(cache)
+        self.assertEqual(['c1', 'c2'], self.fetch_nbr_lists.call_args[0][0])  # c3 is not a neighbor of c1
+        self.assertEqual({'targetCellId': 'c1', 'pciValue': 11}, nbr_lists['c2'][0])
+
+    def test_expected_changes_survive_a_re_pull_before_the_apply(self):
+        pci = {'c1': 1, 'c2': 2, 'c3': 3}
+        self.fetch_nbr_lists.side_effect = lambda cell_ids: {
+            c: [{'targetCellId': n, 'pciValue': pci[n]} for n in ['c1', 'c2', 'c3'] if n != c and 'c2' in (c, n)]
+            for c in cell_ids}
+        cache = TopologyCache()
+        self.get(cache)
+        self.assertEqual(0, cache.expect_changes('netw2', ['c1']))
+        self.assertEqual(1, cache.expect_changes('netw1', ['c1']))
+        self.get(cache)  # the solution is not applied yet
+        pci['c1'] = 11
+        _, nbr_lists = self.get(cache)
+        self.assertEqual({'targetCellId': 'c1', 'pciValue': 11}, nbr_lists['c2'][0])
+        cache.invalidate('netw1', ['c1'])  # the change is confirmed
+        self.get(cache)
+        self.get(cache)
+        self.assertEqual(4, self.fetch_nbr_lists.call_count)
+        self.assertEqual(4, self.fetch_cells.call_count)
+
+    def test_cell_list_changes_are_picked_up(self):
+        cache = TopologyCache()
+        self.get(cache)
+        self.fetch_cells.return_value = ['c1', 'c2', 'c4']
+        cache.invalidate('netw1', ['c1'])
+        cell_ids, nbr_lists = self.get(cache)
+        self.assertEqual(['c1', 'c2', 'c4'], cell_ids)
+        self.assertEqual(['c1', 'c4'], self.fetch_nbr_lists.call_args[0][0])
+        self.assertEqual(['c1', 'c2', 'c4'], sorted(nbr_lists))
+
+    def test_delta_refresh_of_request_cells(self):
+        self.get(TopologyCache(), changed_cells=['c2'])
+        self.get(TopologyCache(), changed_cells=['c2'])
+        cache = TopologyCache(delta_refresh=True)
+        self.get(cache, changed_cells=['c2'])
+        self.get(cache, changed_cells=['c2', 'c9'])
+        self.assertEqual(['c2'], self.fetch_nbr_lists.call_args[0][0])
+        self.assertEqual(4, self.fetch_cells.call_count)
+
+    def test_lru_eviction(self):
+        cache = TopologyCache(max_size=2)
+        for network_id in ['n1', 'n2', 'n1', 'n3', 'n1']:
+            self.get(cache, network_id)
+        self.assertEqual(3, self.fetch_cells.call_count)
+        self.assertEqual(1, cache.stats()['evictions'])
+
+
+if __name__ == "__main__":
+    unittest.main()
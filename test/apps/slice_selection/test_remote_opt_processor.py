@@ -16,6 +16,7 @@
 # -------------------------------------------------------------------------
 #
 
+from concurrent.futures import Future
 import json
 import unittest
 from requests import RequestException, Response
@@ -31,6 +32,16 @@ from osdf.logging.osdf_logging import error_log, debug_log
 from osdf.adapters.policy.interface import get_policies
 
 
+def done_plan(resp=None, error=None):
+    """A Conductor plan which is already done, as returned by conductor.request_async"""
+    plan = Future()
+    if error:
+        plan.set_exception(error)
+    else:
+        plan.set_result(resp)
+    return plan
+
+
 class TestRemoteOptProcessor(unittest.TestCase):
     def setUp(self):
         self.config_spec = {
@@ -75,8 +86,8 @@ class TestRemoteOptProcessor(unittest.TestCase):
         # new solution
         new_solution_conductor_response_file = 'test/apps/slice_selection/new_solution_conductor_response.json'
         new_solution_conductor_response = json_from_file(new_solution_conductor_response_file)
-        self.patcher_req = patch('osdf.adapters.conductor.conductor.request',
-                                 return_value=new_solution_conductor_response)
+        self.patcher_req = patch('osdf.adapters.conductor.conductor.request_async',
+                                 return_value=done_plan(new_solution_conductor_response))
         self.Mock_req = self.patcher_req.start()
         slice_select_opt = SliceSelectionOptimizer(self.osdf_config, self.slice_config, request_json, 'NSI')
         slice_select_opt.process_slice_selection_opt()
@@ -87,8 +98,8 @@ class TestRemoteOptProcessor(unittest.TestCase):
         request_json['preferReuse'] = True
         shared_solution_conductor_response_file = 'test/apps/slice_selection/shared_solution_conductor_response.json'
         shared_solution_conductor_response = json_from_file(shared_solution_conductor_response_file)
-        self.patcher_req = patch('osdf.adapters.conductor.conductor.request',
-                                 return_value=shared_solution_conductor_response)
+        self.patcher_req = patch('osdf.adapters.conductor.conductor.request_async',
+                                 return_value=done_plan(shared_solution_conductor_response))
         self.Mock_req = self.patcher_req.start()
         slice_select_opt = SliceSelectionOptimizer(self.osdf_config, self.slice_config, request_json, 'NSI')
         slice_select_opt.process_slice_selection_opt()
@@ -98,8 +109,8 @@ class TestRemoteOptProcessor(unittest.TestCase):
         # no recommendation
         no_solution_conductor_response_file = 'test/apps/slice_selection/no_rec.json'
         no_solution_conductor_response = json_from_file(no_solution_conductor_response_file)
-        self.patcher_req = patch('osdf.adapters.conductor.conductor.request',
-                                 return_value=no_solution_conductor_response)
+        self.patcher_req = patch('osdf.adapters.conductor.conductor.request_async',
+                                 return_value=done_plan(no_solution_conductor_response))
         self.Mock_req = self.patcher_req.start()
         slice_select_opt.process_slice_selection_opt()
         self.mock_rc.assert_called_with(json=no_solution_response_json, noresponse=True)
@@ -111,15 +122,15 @@ class TestRemoteOptProcessor(unittest.TestCase):
 
         response = Response()
         response._content = json.dumps(conductor_error_response).encode()
-        self.patcher_req = patch('osdf.adapters.conductor.conductor.request',
-                                 side_effect=RequestException(response=response))
+        self.patcher_req = patch('osdf.adapters.conductor.conductor.request_async',
+                                 return_value=done_plan(error=RequestException(response=response)))
         self.Mock_req = self.patcher_req.start()
         slice_select_opt.process_slice_selection_opt()
         self.mock_rc.assert_called_with(json=error_response_json, noresponse=True)
         self.patcher_req.stop()
 
-        self.patcher_req = patch('osdf.adapters.conductor.conductor.request',
-                                 side_effect=Exception("Some error message"))
+        self.patcher_req = patch('osdf.adapters.conductor.conductor.request_async',
+                                 return_value=done_plan(error=Exception("Some error message")))
         self.Mock_req = self.patcher_req.start()
         slice_select_opt.process_slice_selection_opt()
         self.mock_rc.assert_called_with(json=error_response_json, noresponse=True)
@@ -147,8 +158,8 @@ class TestRemoteOptProcessor(unittest.TestCase):
 
         shared_solution_conductor_response_file = 'test/apps/slice_selection/nssi_conductor_response.json'
         shared_solution_conductor_response = json_from_file(shared_solution_conductor_response_file)
-        self.patcher_req = patch('osdf.adapters.conductor.conductor.request',
-                                 return_value=shared_solution_conductor_response)
+        self.patcher_req = patch('osdf.adapters.conductor.conductor.request_async',
+                                 return_value=done_plan(shared_solution_conductor_response))
         self.Mock_req = self.patcher_req.start()
         slice_select_opt = SliceSelectionOptimizer(self.osdf_config, self.slice_config, request_json, 'NSSI')
         slice_select_opt.process_slice_selection_opt()
@@ -0,0 +1,86 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+
+"""
+Benchmark of building the request to Conductor: Jinja template rendered per request (re-parsed as JSON before
+sending) against the payload built directly as a dict and serialized once.
+
+Both sides get their demands and constraints from the same compiled policies (compile_policies reuses them for
+the same policy set), so this measures the rendering and the extra JSON round trips only, not the whole path
+used before the policies were compiled.
+
+Run from the top directory: PYTHONPATH=. python test/conductor/benchmark_api_builder.py [demands] [iterations]
+"""
+
+import copy
+import json
+import sys
+import timeit
+
+import yaml
+
+from osdf.adapters.conductor import api_builder
+from osdf.adapters.local_data import local_policies
+from osdf.utils.interfaces import json_from_file
+
+TEMPLATE = "osdf/adapters/conductor/templates/conductor_interface.json"
+
+
+def large_request(num_demands):
+    """Placement request with num_demands demands and a full set of local policies for each of them"""
+    request = json_from_file("test/placement-tests/request.json")
+    folder = "test/policy-local-files/"
+    policies = local_policies.get_local_policies(
+        folder, local_policies.get_policy_names_from_file(folder + "meta-valid-policies.txt"))
+    demand = request['placementInfo']['placementDemands'][0]
+    demands, flat_policies = [], []
+    for i in range(num_demands):
+        resource = "vnf{}".format(i)
+        demands.append(dict(copy.deepcopy(demand), resourceModuleName=resource))
+        for policy in policies:
+            name, content = copy.deepcopy(next(iter(policy.items())))
+            if content['properties'].get('resources'):
+                content['properties']['resources'] = [resource]
+                content['properties']['identity'] = "{}_{}".format(content['properties'].get('identity'), resource)
+            flat_policies.append({"{}_{}".format(name, resource): content})
+    return request, demands, flat_policies
+
+
+def main(num_demands=100, iterations=20):
+    request, demands, flat_policies = large_request(num_demands)
+    local_config = yaml.safe_load(open("config/common_config.yaml"))
+    args = (request['requestInfo'], demands, request['placementInfo']['requestParameters'],
+            request['serviceInfo'], {'location_enabled': True, 'version': '2017-10-10'}, flat_policies, local_config)
+
+    def template_rendering():
+        api_builder.compiled_template.cache_clear()  # the template used to be read and compiled for every request
+        json.dumps(json.loads(api_builder.conductor_api_builder(*args, template=TEMPLATE)))
+
+    def direct_payload():
+        json.dumps(api_builder.conductor_payload(*args))
+
+    assert json.loads(api_builder.conductor_api_builder(*args, template=TEMPLATE)) == \
+        api_builder.conductor_payload(*args)
+    print("{} demands, {} policies, {} iterations".format(num_demands, len(flat_policies), iterations))
+    for name, func in [("template rendering", template_rendering), ("direct payload", direct_payload)]:
+        best = min(timeit.repeat(func, number=iterations, repeat=3)) / iterations
+        print("{:20s} {:8.2f} ms per request".format(name, best * 1000))
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:3]])
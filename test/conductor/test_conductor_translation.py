@@ -16,8 +16,11 @@
 #
 # -------------------------------------------------------------------------
 #
+import copy
 import unittest
 
+import yaml
+
 from osdf.adapters.local_data import local_policies
 from osdf.adapters.conductor import translation as tr
 from osdf.utils.interfaces import json_from_file
@@ -81,6 +84,33 @@ class TestConductorTranslation(unittest.TestCase):
                          tr.gen_optimization_policy(self.request_vfmod_json['placementInfo']['placementDemands'],
                                                     self.optimization_policies))
 
+    def test_compiled_policies(self):
+        local_config = yaml.safe_load(open(self.local_config_file))
+        policies = copy.deepcopy(self.policies)
+        compiled = tr.compile_policies(policies, local_config)
+        self.assertIs(compiled, tr.compile_policies(copy.deepcopy(self.policies), local_config))
+
+        demands = self.request_json['placementInfo']['placementDemands']
+        vnf_list = [d['resourceModuleName'].lower() for d in demands]
+        constraints = compiled.gen_constraints(vnf_list)
+        self.assertEqual(tr.gen_zone_policy(vnf_list, compiled.policies(
+            "onap.policies.optimization.resource.AffinityPolicy")),
+            [c for c in constraints if list(c.values())[0]['type'] == 'zone'])
+        self.assertEqual(self.policies, policies)  # translation does not modify the policies
+
+        constraint = compiled.resource_constraints[0][1][0]
+        with self.assertRaises(AttributeError):
+            constraint.identity = "other"
+
+    def test_default_vnf_policy_applies_to_all_demands(self):
+        vnf_policies = [copy.deepcopy(x) for x in self.policies if x[list(x.keys())[0]]["type"]
+                        == "onap.policies.optimization.resource.VnfPolicy"][:1]
+        vnf_policies[0][list(vnf_policies[0].keys())[0]]['properties']['resources'] = []
+        demands = self.request_json['placementInfo']['placementDemands']
+        res = tr.gen_demands(demands, vnf_policies)
+        self.assertEqual({d['resourceModuleName'] for d in demands}, set(res.keys()))
+        self.assertEqual([], vnf_policies[0][list(vnf_policies[0].keys())[0]]['properties']['resources'])
+
 
 if __name__ == "__main__":
     unittest.main()
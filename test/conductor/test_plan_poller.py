@@ -0,0 +1,127 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from requests import RequestException
+
+from osdf.adapters.conductor.plan_poller import PlanPoller
+from osdf.adapters.conductor.polling import BackoffPolling
+from osdf.adapters.conductor.polling import FixedPolling
+from osdf.adapters.conductor.polling import polling_policy
+from osdf.operation.exceptions import BusinessException
+from osdf.utils.programming_utils import DotDict
+
+
+def plan_response(status, href="http://conductor/v1/plans/1"):
+    raw_resp = MagicMock()
+    raw_resp.json.return_value = {"plans": [{"status": status, "links": [[{"href": href}]]}]}
+    return raw_resp
+
+
+class TestPlanPoller(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.poller = PlanPoller(http_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.poller.shutdown()
+
+    def test_plan_solved_after_polling(self):
+        rc = MagicMock()
+        rc.request.side_effect = [plan_response("translating"), RequestException("glitch"),
+                                  plan_response("solving"), plan_response("done")]
+        solved = self.poller.solve_time_stats().get("placement", {}).get("count", 0)
+        future = self.poller.watch(rc, "http://conductor/v1/plans/1", "req-1", FixedPolling(10, 0, 0.01))
+        self.assertEqual("done", future.result(5)["plans"][0]["status"])
+        self.assertEqual(4, rc.request.call_count)
+        self.assertEqual(0, self.poller.outstanding())
+        self.assertEqual(solved + 1, self.poller.solve_time_stats()["placement"]["count"])
+
+    def test_plan_error(self):
+        rc = MagicMock()
+        rc.request.return_value = plan_response("error")
+        future = self.poller.watch(rc, "http://conductor/v1/plans/1", "req-1", FixedPolling(10, 0, 0.01))
+        self.assertRaises(RequestException, future.result, 5)
+
+    def test_plan_timeout(self):
+        rc = MagicMock()
+        rc.request.return_value = plan_response("solving")
+        future = self.poller.watch(rc, "http://conductor/v1/plans/1", "req-1", FixedPolling(0.05, 0, 0.01))
+        self.assertRaises(BusinessException, future.result, 5)
+
+    def test_many_plans(self):
+        rcs = [MagicMock() for _ in range(50)]
+        for rc in rcs:
+            rc.request.side_effect = [plan_response("solving"), plan_response("solved")]
+        futures = [self.poller.watch(rc, "http://conductor/v1/plans/1", "req", FixedPolling(10, 0, 0.01))
+                   for rc in rcs]
+        self.assertTrue(all(f.result(5)["plans"][0]["status"] == "solved" for f in futures))
+
+    def test_stuck_plan_failed_by_watchdog(self):
+        poller = PlanPoller(http_workers=1, deadline_grace=0, watchdog_interval=0.01)
+        try:
+            rc = MagicMock()
+            rc.request.side_effect = lambda *args, **kwargs: time.sleep(1)  # Conductor never answers
+            future = poller.watch(rc, "http://conductor/v1/plans/1", "req-1", FixedPolling(0.05, 0, 0.01))
+            self.assertRaises(BusinessException, future.result, 0.5)
+        finally:
+            poller.shutdown()
+
+    def test_shutdown(self):
+        poller = PlanPoller(http_workers=1)
+        rc = MagicMock()
+        rc.request.return_value = plan_response("solving")
+        future = poller.watch(rc, "http://conductor/v1/plans/1", "req-1", FixedPolling(10, 0, 1))
+        poller.shutdown()
+        self.assertRaises(BusinessException, future.result, 1)
+        self.assertFalse(poller._thread.is_alive() or poller._watchdog.is_alive())
+        future = poller.watch(rc, "http://conductor/v1/plans/1", "req-2", FixedPolling(10, 0, 1))
+        self.assertRaises(BusinessException, future.result, 1)
+
+
+class TestPollingPolicy(unittest.TestCase):
+
+    def test_backoff_schedule(self):
+        policy = BackoffPolling(timeout=300, first_delay=1, initial_interval=1, multiplier=2, max_interval=60,
+                                jitter=0)
+        self.assertEqual([1, 2, 4, 8, 16, 30, 30], [policy.next_delay(n, 0) for n in range(1, 8)])
+        self.assertEqual(5, policy.next_delay(7, 295))  # never past the timeout
+
+    def test_backoff_jitter(self):
+        policy = BackoffPolling(timeout=300, initial_interval=10, jitter=0.2)
+        self.assertTrue(all(8 <= policy.next_delay(1, 0) <= 12 for _ in range(20)))
+
+    def test_policy_from_config(self):
+        config = {"deployment": {"conductorPingWaitTime": 20,
+                                 "conductorPolling": {"default": {"policy": "backoff", "first_delay": 2},
+                                                      "nsi_selection": {"first_delay": 1}}}}
+        policy = polling_policy(DotDict(config), "nsi_selection", 600)
+        self.assertEqual((1, 20), (policy.first_delay, policy.max_interval))
+        self.assertEqual(2, polling_policy(DotDict(config), "placement", 600).first_delay)
+
+    def test_legacy_policy(self):
+        policy = polling_policy(DotDict({"deployment": {"conductorPingWaitTime": 20}}), "placement", 600)
+        self.assertEqual((10, 20), (policy.first_delay, policy.next_delay(5, 100)))
+
+
+if __name__ == "__main__":
+    unittest.main()
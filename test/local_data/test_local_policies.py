@@ -15,7 +15,10 @@
 #
 # -------------------------------------------------------------------------
 #
+import json
+import os
 import re
+import tempfile
 import unittest
 
 from osdf.adapters.local_data import local_policies
@@ -46,6 +49,32 @@ class TestLocalPolicies(unittest.TestCase):
         res = local_policies.get_local_policies(self.folder, self.valid_policies, wanted)
         assert len(res) == len(wanted)
 
+    def test_policy_store_reloads_changed_files(self):
+        with tempfile.TemporaryDirectory() as folder:
+            fname = os.path.join(folder, "p1.json")
+            with open(fname, "w") as fid:
+                json.dump({"OSDF.hpa_1": {"type": "hpaPolicy", "properties": {"v": 1}}}, fid)
+            store = local_policies.LocalPolicyStore(folder)
+            first = store.get(["p1.json"])[0]
+            first["OSDF.hpa_1"]["properties"]["v"] = 5  # callers get their own copy
+            self.assertEqual(1, store.get(["p1.json"])[0]["OSDF.hpa_1"]["properties"]["v"])
+
+            with open(fname, "w") as fid:
+                json.dump({"OSDF.hpa_2": {"type": "vnfPolicy", "properties": {"v": 2}}}, fid)
+            os.utime(fname, ns=(0, os.stat(fname).st_mtime_ns + 10 ** 9))
+            self.assertEqual(2, store.get(["p1.json"])[0]["OSDF.hpa_2"]["properties"]["v"])
+
+    def test_policy_store_get_by_name(self):
+        with tempfile.TemporaryDirectory() as folder:
+            for fname, name in [("OSDF.hpa_1.json", "OSDF.hpa_1"), ("other.json", "OSDF.hpa_2")]:
+                with open(os.path.join(folder, fname), "w") as fid:
+                    json.dump({name: {"type": "hpaPolicy"}}, fid)
+            store = local_policies.LocalPolicyStore(folder)
+            self.assertEqual([{"OSDF.hpa_1": {"type": "hpaPolicy"}}], store.get_by_name(["OSDF.hpa_1"]))
+            store.get(["other.json"])  # policies are looked up by file name only, whatever was read before
+            with self.assertRaises(FileNotFoundError):
+                store.get_by_name(["OSDF.hpa_2"])
+
 
 if __name__ == "__main__":
     unittest.main()
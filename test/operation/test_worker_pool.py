@@ -0,0 +1,70 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import threading
+import unittest
+
+from osdf.operation.exceptions import WorkerPoolFullException
+from osdf.operation.exceptions import WorkerPoolUnavailableException
+from osdf.operation.worker_pool import BoundedWorkerPool
+from osdf.operation.worker_pool import pool_config
+from osdf.utils.programming_utils import DotDict
+
+
+class TestWorkerPool(unittest.TestCase):
+
+    def test_rejects_when_queue_is_full(self):
+        pool = BoundedWorkerPool("test", max_workers=1, max_queue_size=1)
+        started, release = threading.Event(), threading.Event()
+
+        def blocked():
+            started.set()
+            release.wait(5)
+
+        first = pool.submit(blocked)
+        started.wait(5)
+        second = pool.submit(release.wait, 5)
+        self.assertEqual(1, pool.stats()['activeWorkers'])
+        self.assertEqual(1, pool.stats()['queueDepth'])
+        with self.assertRaises(WorkerPoolFullException):
+            pool.submit(release.wait, 5)
+        self.assertEqual(1, pool.stats()['rejected'])
+
+        release.set()
+        first.result(5)
+        second.result(5)
+        self.assertEqual(0, pool.stats()['activeWorkers'])
+        self.assertEqual(0, pool.stats()['queueDepth'])
+        self.assertEqual(3, pool.submit(sum, [1, 2]).result(5))
+        pool.shutdown()
+
+    def test_submit_after_shutdown(self):
+        pool = BoundedWorkerPool("test", max_workers=1, max_queue_size=0)
+        pool.shutdown()
+        with self.assertRaises(WorkerPoolUnavailableException):
+            pool.submit(sum, [1])
+        self.assertEqual(0, pool.stats()['queueDepth'])
+
+    def test_pool_config(self):
+        config = DotDict({"deployment": {"workerPools": {"default": {"maxWorkers": 4},
+                                                         "pci": {"maxQueueSize": 2}}}})
+        self.assertEqual({"maxWorkers": 4, "maxQueueSize": 2}, pool_config("pci", config))
+        self.assertEqual({"maxWorkers": 4, "maxQueueSize": 50}, pool_config("placement", config))
+
+
+if __name__ == "__main__":
+    unittest.main()
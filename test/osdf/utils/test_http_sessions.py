@@ -0,0 +1,48 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import unittest
+
+from osdf.utils import http_sessions
+from osdf.utils.programming_utils import DotDict
+
+
+class TestHttpSessions(unittest.TestCase):
+
+    def tearDown(self):
+        http_sessions.close_sessions()
+
+    def test_sessions_shared_per_host_and_credentials(self):
+        s1 = http_sessions.get_session("https://policy:6969/policy/pdpx/v1/decision", ("u", "p"))
+        s2 = http_sessions.get_session("https://policy:6969/policy/api/v1/policytypes", ("u", "p"))
+        s3 = http_sessions.get_session("https://policy:6969/policy/pdpx/v1/decision", ("u2", "p"))
+        s4 = http_sessions.get_session("http://policy:6969/policy/pdpx/v1/decision", ("u", "p"))
+        self.assertIs(s1, s2)
+        self.assertIsNot(s1, s3)
+        self.assertIsNot(s1, s4)
+
+    def test_pool_config(self):
+        conf = http_sessions.pool_config(DotDict({"deployment": {"httpConnectionPool": {"pool_maxsize": 5}}}))
+        self.assertEqual(5, conf["pool_maxsize"])
+        session = http_sessions.new_session(conf)
+        adapter = session.get_adapter("https://aai:8443")
+        self.assertEqual(5, adapter._pool_maxsize)
+        self.assertEqual(conf["max_retries"], adapter.max_retries.total)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,13 +36,13 @@ mock_bad_response = m2
 
 
 class TestOsdfUtilsInterfaces(unittest.TestCase):
-    @patch('requests.request', return_value=mock_good_response)
+    @patch('requests.Session.request', return_value=mock_good_response)
     def test_rc_request(self, mock_good_response):
         rc = RestClient()
         rc.add_headers({})
         rc.request(url="http://localhost", req_id="testReq")
 
-    @patch('requests.request', return_value=mock_good_response)
+    @patch('requests.Session.request', return_value=mock_good_response)
     def test_rc_request_v1(self, mock_good_response):
         rc = RestClient()
         rc.add_headers({})
@@ -50,7 +50,7 @@ class TestOsdfUtilsInterfaces(unittest.TestCase):
         rc.request(url="http://localhost", raw_response=True)
         rc.request(url="http://localhost", no_response=True)
 
-    @patch('requests.request', return_value=mock_bad_response)
+    @patch('requests.Session.request', return_value=mock_bad_response)
     def test_rc_request_v2(self, mock_bad_response):
         rc = RestClient()
         try:
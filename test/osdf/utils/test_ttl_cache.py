@@ -0,0 +1,46 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import unittest
+from unittest.mock import patch
+
+from osdf.utils.ttl_cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_entries_expire(self):
+        cache = TTLCache()
+        with patch('time.monotonic', return_value=100):
+            cache.put_many({'a': 1, 'b': 2}, 10)
+            self.assertEqual({'a': 1}, cache.get_many(['a', 'c']))
+        with patch('time.monotonic', return_value=111):
+            self.assertEqual({}, cache.get_many(['a', 'b']))
+            cache.put_many({'c': 3}, 10)
+        self.assertEqual(1, len(cache))
+
+    def test_max_size_drops_the_oldest_entries(self):
+        cache = TTLCache(max_size=3)
+        cache.put_many({'a': 1, 'b': 2}, 60)
+        cache.put_many({'c': 3, 'a': 4}, 60)  # 'a' put again, 'b' is now the oldest
+        cache.put_many({'d': 5}, 60)
+        self.assertEqual({'c': 3, 'a': 4, 'd': 5}, cache.get_many(['a', 'b', 'c', 'd']))
+        self.assertEqual(3, len(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from osdf.adapters.policy import interface
+from osdf.adapters.policy.cache import cache_key
+from osdf.adapters.policy.cache import PolicyCache
+
+
+class TestPolicyCache(unittest.TestCase):
+
+    def test_key_is_order_independent(self):
+        self.assertEqual(cache_key("placement", {"resources": ["vG", "vGMuxInfra"], "services": "vCPE"}),
+                         cache_key("placement", {"services": ["vCPE"], "resources": ["vGMuxInfra", "vG"]}))
+        self.assertNotEqual(cache_key("placement", {"services": ["vCPE"]}),
+                            cache_key("nst_selection", {"services": ["vCPE"]}))
+
+    def test_ttl_and_lru(self):
+        cache = PolicyCache(ttl=0.05, max_size=2)
+        loader = MagicMock(side_effect=lambda: {"policies": {"p": {}}})
+        cache.get("a", loader)
+        value = cache.get("a", loader)
+        value["policies"]["changed"] = {}
+        self.assertEqual({"policies": {"p": {}}}, cache.get("a", loader))
+        self.assertEqual(1, loader.call_count)
+        time.sleep(0.06)
+        cache.get("a", loader)
+        self.assertEqual(2, loader.call_count)
+
+        cache.get("b", loader)
+        cache.get("a", loader)
+        cache.get("c", loader)  # evicts b, the least recently used
+        cache.get("a", loader)
+        self.assertEqual(4, loader.call_count)
+        cache.get("b", loader)
+        self.assertEqual(5, loader.call_count)
+        self.assertEqual(2, cache.stats()["evictions"])
+
+    def test_stale_while_revalidate(self):
+        cache = PolicyCache(ttl=0.01, max_stale=10, stale_while_revalidate=True)
+        cache.put("a", "old")
+        time.sleep(0.02)
+        refreshed = threading.Event()
+
+        def loader():
+            refreshed.set()
+            return "new"
+
+        self.assertEqual("old", cache.get("a", loader))
+        self.assertTrue(refreshed.wait(5))
+        for _ in range(50):
+            if cache.get("a", lambda: "miss") == "new":
+                break
+            time.sleep(0.01)
+        self.assertEqual("new", cache.get("a", lambda: "miss"))
+        self.assertEqual(0, cache.stats()["misses"])
+
+    def test_invalidate(self):
+        cache = PolicyCache()
+        cache.put(cache_key("placement", {"services": ["vCPE"], "resources": ["vG"]}), 1)
+        cache.put(cache_key("placement", {"services": ["vFW"]}), 2)
+        cache.put(cache_key("nst_selection", {"services": ["vCPE"]}), 3)
+        self.assertEqual(1, cache.invalidate("placement", {"services": "vCPE"}))
+        self.assertEqual(1, cache.invalidate(service_type="nst_selection"))
+        self.assertEqual(1, cache.invalidate())
+        self.assertEqual(0, cache.stats()["size"])
+
+    def test_cached_policy_api_call(self):
+        scope_fields = {"resources": ["vG"], "services": ["vCPE"]}
+        with patch('osdf.adapters.policy.interface.get_policy_cache', return_value=PolicyCache()), \
+                patch('osdf.adapters.policy.interface.policy_api_call', return_value={"policies": {"p": {}}}) as call:
+            interface.cached_policy_api_call(None, scope_fields, "placement")
+            scope_fields["resources"] = ["vGMuxInfra"]
+            interface.cached_policy_api_call(None, scope_fields, "placement")
+            interface.cached_policy_api_call(None, {"services": ["vCPE"], "resources": ["vG"]}, "placement")
+        self.assertEqual(2, call.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
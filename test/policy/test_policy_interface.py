@@ -54,6 +54,28 @@ class TestPolicyInterface(unittest.TestCase):
     def test_get_by_name(self):
         pol.get_by_name(mock.MagicMock(), self.valid_policies_files[0])
 
+    def test_get_by_scope_fans_out_per_resource(self):
+        config_local = {
+            "references": {"resource": {"source": "request",
+                                        "value": "placementInfo.placementDemands.resourceModuleName"}},
+            "policy_info": {"placement": {"policy_scope": [{"scope": ["OSDF_FRANKFURT"],
+                                                            "resources": [{"get_param": "resource"}]}]}}
+        }
+        shared = {"properties": {"scope": ["OSDF_FRANKFURT"], "resources": ["vG", "vGMuxInfra"]}}
+
+        def api_call(rest_client, scope_fields):
+            resource = scope_fields["resources"][0]
+            return {"policies": {"shared": shared,
+                                 resource: {"properties": {"scope": ["OSDF_FRANKFURT"], "resources": [resource]}}}}
+
+        with mock.patch('osdf.adapters.policy.interface.policy_api_call', side_effect=api_call) as call:
+            policies = pol.get_by_scope(None, self.request_json, config_local, "placement")
+        resources = [d['resourceModuleName'] for d in self.request_json['placementInfo']['placementDemands']]
+        self.assertEqual(len(resources), call.call_count)
+        names = [list(p.keys())[0] for p in policies]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual({"shared"} | set(resources), set(names))
+
 
 if __name__ == "__main__":
     unittest.main()
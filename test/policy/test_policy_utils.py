@@ -0,0 +1,67 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import copy
+import unittest
+
+import yaml
+
+from osdf.adapters.local_data import local_policies
+from osdf.adapters.policy import utils
+
+
+class TestPolicyUtils(unittest.TestCase):
+
+    def setUp(self):
+        folder = "test/policy-local-files/"
+        names = local_policies.get_policy_names_from_file(folder + "meta-valid-policies.txt")
+        self.policies = local_policies.get_local_policies(folder, names)
+        with open("config/common_config.yaml") as fid:
+            self.config = yaml.safe_load(fid)
+
+    def test_group_policies_gen(self):
+        grouped = utils.group_policies_gen(self.policies + self.policies, self.config)
+        names = [list(p.keys())[0] for group in grouped.values() for p in group]
+        self.assertEqual(len(names), len(set(names)))
+        for policy_type, group in grouped.items():
+            self.assertTrue(all(p[list(p.keys())[0]]["type"] == policy_type for p in group))
+
+    def test_index_is_reused_for_the_same_policy_set(self):
+        priority = self.config['policy_info']['prioritization_attributes']
+        index = utils.policy_index(self.policies, priority)
+        policies_copy = copy.deepcopy(self.policies)
+        self.assertIs(index, utils.policy_index(policies_copy, priority))
+        grouped = index.group(policies_copy)
+        self.assertTrue(all(any(p is c for c in policies_copy) for group in grouped.values() for p in group))
+
+        name = list(policies_copy[0].keys())[0]
+        policies_copy[0][name]["metadata"]["policy-version"] += 1
+        self.assertIsNot(index, utils.policy_index(policies_copy, priority))
+
+    def test_index_follows_policy_content(self):
+        priority = self.config['policy_info']['prioritization_attributes']
+        index = utils.policy_index(self.policies, priority)
+        policies_copy = copy.deepcopy(self.policies)
+        name = list(policies_copy[0].keys())[0]
+        policies_copy[0][name]["type"] = ""  # same name and versions, different content
+        self.assertIsNot(index, utils.policy_index(policies_copy, priority))
+        self.assertNotIn(name, [list(p.keys())[0] for group in utils.policy_index(policies_copy, priority)
+                                .group(policies_copy).values() for p in group])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,6 +21,7 @@ import json
 import yaml
 
 from osdf.adapters.conductor.api_builder import conductor_api_builder
+from osdf.adapters.conductor.api_builder import conductor_payload
 from osdf.adapters.local_data import local_policies
 from osdf.utils.interfaces import json_from_file
 
@@ -75,6 +76,16 @@ class TestConductorApiBuilder(unittest.TestCase):
         templ_json = json.loads(templ_string)
         self.assertEqual(templ_json, self.request_placement_vfmod_json)
 
+    def test_conductor_payload_matches_template(self):
+        request_json = self.request_vfmod_json
+        local_config = yaml.safe_load(open(self.local_config_file))
+        args = (request_json['requestInfo'], request_json['placementInfo']['placementDemands'],
+                request_json['placementInfo']['requestParameters'], request_json['serviceInfo'],
+                self.template_fields, self.policies, local_config)
+        payload = conductor_payload(*args)
+        self.assertEqual(payload, self.request_placement_vfmod_json)
+        self.assertEqual(conductor_api_builder(*args, template=self.conductor_api_template), json.dumps(payload))
+
 
 if __name__ == "__main__":
     unittest.main()
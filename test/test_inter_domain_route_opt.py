@@ -14,16 +14,17 @@
 #   limitations under the License.
 #
 # -------------------------------------------------------------------------
+import json
 import unittest
 
 from unittest.mock import patch
 from apps.route.optimizers.inter_domain_route_opt import InterDomainRouteOpt
+from apps.route.optimizers.inter_domain_route_opt import port_controller_cache
 import osdf.config.loader as config_loader
+from osdf.operation.exceptions import BusinessException
 from osdf.utils.interfaces import json_from_file
 from osdf.utils.programming_utils import DotDict
 
-count = 1 
-
 def mocked_requests_get(*args, **kwargs):
     class MockResponse:
         def __init__(self, json_data, status_code):
@@ -71,34 +72,17 @@ def mocked_requests_put(*args, **kwargs):
     controllers_for_interfaces = main_dir + "test/inter_domain_route_opt/controllers_for_interfaces.json"
     controllers_for_interfaces_values = json_from_file(controllers_for_interfaces)
 
-    global count
-      
-    if count == 1:
-        count += 1
-        return MockResponse(controllers_for_interfaces_values["int-1-cont"], 200)
-    elif count == 2:
-        count += 1
-        return MockResponse(controllers_for_interfaces_values["int-3-cont"], 200)
-    elif count == 3:
-        count += 1
-        return MockResponse(controllers_for_interfaces_values["int-4-cont"], 200)
-    elif count == 4:
-        count += 1
-        return MockResponse(controllers_for_interfaces_values["int-5-cont"], 200)
-    elif count == 5:
-      count += 1
-      return MockResponse(controllers_for_interfaces_values["int-6-cont"], 200)
-    elif count == 6:
-        count += 1
-        return MockResponse(controllers_for_interfaces_values["int-7-cont"], 200)
-            
+    port_id = json.loads(kwargs["data"])["query"].split("portid=")[1]
+    controller_key = "int-{}-cont".format(port_id[len("int"):])
+    if controller_key in controllers_for_interfaces_values:
+        return MockResponse(controllers_for_interfaces_values[controller_key], 200)
     return MockResponse(None, 404)            
     
             
 
 class TestInterDomainRouteOpt(unittest.TestCase):
-    @patch('apps.route.optimizers.inter_domain_route_opt.requests.get', side_effect=mocked_requests_get)
-    @patch('apps.route.optimizers.inter_domain_route_opt.requests.put', side_effect=mocked_requests_put)
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    @patch('requests.Session.put', side_effect=mocked_requests_put)
     @patch('apps.route.optimizers.simple_route_opt.pymzn.minizinc')               
     def test_process_get_route(self, mock_solve , mock_put, mock_get):      
         main_dir = ""
@@ -110,6 +94,7 @@ class TestInterDomainRouteOpt(unittest.TestCase):
         self.osdf_config = DotDict(config_loader.all_configs(**self.config_spec))
         parameter_data_file = main_dir + "test/inter_domain_route_opt/request.json"
         request_json = json_from_file(parameter_data_file)
+        port_controller_cache.clear()
         routopt = InterDomainRouteOpt()
         actual_response = routopt.get_route(request_json,self.osdf_config)
         mock_response = {
@@ -144,6 +129,47 @@ class TestInterDomainRouteOpt(unittest.TestCase):
            }
         }
         self.assertEqual(mock_response, actual_response)
+        self.assertEqual(6, mock_put.call_count)  # one lookup per distinct port
+        self.assertEqual(8, mock_get.call_count)  # links, controllers and the 6 distinct p-interfaces
+
+        self.assertEqual(mock_response, routopt.get_route(request_json, self.osdf_config))
+        self.assertEqual(6, mock_put.call_count)  # controllers of the ports are cached
+
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    @patch('requests.Session.put', side_effect=mocked_requests_put)
+    def test_process_get_routes(self, mock_put, mock_get):
+        self.config_spec = {
+            "deployment": "test/functest/simulators/simulated-config/osdf_config.yaml",
+            "core": "test/functest/simulators/simulated-config/common_config.yaml"
+        }
+        self.osdf_config = DotDict(config_loader.all_configs(**self.config_spec))
+        request_json = json_from_file("test/inter_domain_route_opt/request.json")
+        route_request = request_json["routeInfo"].pop("routeRequest")
+        reverse_request = dict(route_request, srcDetails=route_request["dstDetails"],
+                               dstDetails=route_request["srcDetails"], options={"alternatives": 2})
+        request_json["routeInfo"]["routeRequests"] = [route_request, reverse_request]
+        request_json["routeInfo"]["options"] = {"linkWeight": "bandwidth"}
+        port_controller_cache.clear()
+        actual_response = InterDomainRouteOpt().get_routes(request_json, self.osdf_config)
+
+        solutions = actual_response["solutions"]
+        self.assertEqual(["success", "success"], [solution["routeStatus"] for solution in solutions])
+        self.assertEqual([["link1", "link2"]], [route["linkList"] for route in solutions[0]["routes"]])
+        self.assertEqual([["link2", "link1"]], [route["linkList"] for route in solutions[1]["routes"]])
+        self.assertEqual(["Controller3", "Controller2", "Controller1"],
+                         [hop["controllerId"] for hop in solutions[1]["routes"][0]["serviceRoute"]])
+        self.assertEqual(8, mock_get.call_count)  # the links are looked up once for the service rate
+
+    @patch('requests.Session.get', side_effect=mocked_requests_get)
+    def test_process_get_routes_invalid_options(self, mock_get):
+        self.osdf_config = DotDict(config_loader.all_configs(
+            deployment="test/functest/simulators/simulated-config/osdf_config.yaml",
+            core="test/functest/simulators/simulated-config/common_config.yaml"))
+        request_json = json_from_file("test/inter_domain_route_opt/request.json")
+        request_json["routeInfo"]["routeRequests"] = [request_json["routeInfo"].pop("routeRequest")]
+        request_json["routeInfo"]["options"] = {"alternatives": 0}
+        self.assertRaises(BusinessException, InterDomainRouteOpt().get_routes, request_json, self.osdf_config)
+        mock_get.assert_not_called()
         
         
 if __name__ == '__main__':
@@ -16,6 +16,7 @@
 #
 # -------------------------------------------------------------------------
 #
+from concurrent.futures import Future
 import mock
 import unittest
 
@@ -33,8 +34,10 @@ class TestProcessPlacementOpt(unittest.TestCase):
         mock_req_accept_message = Response("Accepted Request", content_type='application/json; charset=utf-8')
         conductor_response_file = 'test/placement-tests/conductor_response.json'
         conductor_response = json_from_file(conductor_response_file)
-        self.patcher_req = patch('osdf.adapters.conductor.conductor.request',
-                                 return_value=conductor_response)
+        self.conductor_plan = Future()
+        self.conductor_plan.set_result(conductor_response)
+        self.patcher_req = patch('osdf.adapters.conductor.conductor.request_async',
+                                 return_value=self.conductor_plan)
         self.patcher_req_accept = patch('osdf.operation.responses.osdf_response_for_request_accept',
                                         return_value=mock_req_accept_message)
         self.patcher_callback = patch(
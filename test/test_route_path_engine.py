@@ -0,0 +1,81 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import unittest
+
+from apps.route.optimizers import path_engine
+from apps.route.optimizers.path_engine import RouteGraph
+
+
+class TestRoutePathEngine(unittest.TestCase):
+
+    def setUp(self):
+        # 1 -> 2 -> 4 costs 2, 1 -> 3 -> 4 costs 3, 4 -> 5 costs 1 and 6 is unreachable
+        self.dzn_data = {
+            'N': 6,
+            'M': 6,
+            'Edge_Start': [1, 2, 1, 3, 4, 6],
+            'Edge_End': [2, 4, 3, 4, 5, 1],
+            'L': [1, 1, 1, 2, 1, 1],
+            'Start': 1,
+            'End': 5
+        }
+
+    def test_shortest_path(self):
+        graph = RouteGraph(self.dzn_data['Edge_Start'], self.dzn_data['Edge_End'], self.dzn_data['L'])
+        self.assertEqual([0, 1, 4], graph.shortest_path(1, 5))
+        self.assertEqual([2], graph.shortest_path(1, 3))
+        self.assertEqual([], graph.shortest_path(4, 4))
+        self.assertIsNone(graph.shortest_path(1, 6))
+
+    def test_link_cost(self):
+        self.dzn_data['L'] = [1, 5, 1, 1, 1, 1]
+        graph = RouteGraph(self.dzn_data['Edge_Start'], self.dzn_data['Edge_End'], self.dzn_data['L'])
+        self.assertEqual([2, 3, 4], graph.shortest_path(1, 5))
+
+    def test_solve(self):
+        self.assertEqual([{'x': [1, 1, 0, 0, 1, 0]}], path_engine.solve(self.dzn_data))
+        self.dzn_data['End'] = 6
+        self.assertEqual([], path_engine.solve(self.dzn_data))
+
+    def test_k_shortest_paths(self):
+        graph = RouteGraph(self.dzn_data['Edge_Start'], self.dzn_data['Edge_End'], self.dzn_data['L'])
+        self.assertEqual([[0, 1, 4], [2, 3, 4]], graph.k_shortest_paths(1, 5, 3))
+        self.assertEqual([[0, 1, 4]], graph.k_shortest_paths(1, 5, 1))
+        self.assertEqual([], graph.k_shortest_paths(1, 6, 2))
+
+    def test_disjoint_paths(self):
+        # 1 -> 2 -> 4 -> 5 and 1 -> 3 -> 4 -> 5 share the link 4 -> 5, 1 -> 5 is a direct link
+        graph = RouteGraph([1, 2, 1, 3, 4, 1], [2, 4, 3, 4, 5, 5], [1, 1, 1, 2, 1, 5])
+        self.assertEqual([[0, 1, 4], [5]], graph.disjoint_paths(1, 5, 3))
+        # links 1 (2 -> 3) and 4 (3 -> 2) are both directions of the same link
+        graph = RouteGraph([1, 2, 3, 1, 3, 2], [2, 3, 4, 3, 2, 4], [1, 1, 1, 5, 1, 5])
+        self.assertEqual([[0, 1, 2], [3, 4, 5]], graph.disjoint_paths(1, 4, 2))
+        self.assertEqual([[0, 1, 2]], graph.disjoint_paths(1, 4, 2, link_groups=["a", "b", "c", "d", "b", "e"]))
+
+    def test_solve_alternatives(self):
+        self.assertEqual([{'x': [1, 1, 0, 0, 1, 0]}, {'x': [0, 0, 1, 1, 1, 0]}],
+                         path_engine.solve(self.dzn_data, alternatives=2))
+        self.assertEqual([{'x': [1, 1, 0, 0, 1, 0]}], path_engine.solve(self.dzn_data, alternatives=2, disjoint=True))
+
+    def test_bandwidth_costs(self):
+        self.assertEqual([1, 10, 4, 10], path_engine.bandwidth_costs([100, 10, 25, None]))
+        self.assertEqual([1, 1], path_engine.bandwidth_costs([None, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+from operator import itemgetter
+import unittest
+
+from apps.route.optimizers.inter_domain_route_opt import InterDomainRouteOpt
+from apps.route.optimizers.route_processing import order_route
+from apps.route.optimizers.route_processing import route_options
+from apps.route.optimizers.route_processing import selected_links
+from osdf.operation.exceptions import BusinessException
+
+
+def link(name, src, dst):
+    return {"linkName": name, "srcControllerId": src, "dstControllerId": dst}
+
+
+class TestRouteProcessing(unittest.TestCase):
+
+    def order(self, links, src, dst):
+        return [item["linkName"] for item in order_route(links, src, dst, itemgetter("srcControllerId"),
+                                                         itemgetter("dstControllerId"))]
+
+    def test_order_route(self):
+        links = [link("l3", "C3", "C4"), link("l1", "C1", "C2"), link("l2", "C2", "C3")]
+        self.assertEqual(["l1", "l2", "l3"], self.order(links, "C1", "C4"))
+        self.assertEqual([], self.order([], "C1", "C1"))
+
+    def test_invalid_routes(self):
+        with self.assertRaisesRegex(BusinessException, "do not reach"):
+            self.order([link("l1", "C1", "C2"), link("l3", "C3", "C4")], "C1", "C4")
+        with self.assertRaisesRegex(BusinessException, "loop back to C2"):
+            self.order([link("l1", "C1", "C2"), link("l2", "C2", "C3"), link("l3", "C3", "C2")], "C1", "C4")
+        with self.assertRaisesRegex(BusinessException, "more than one link leaves C1"):
+            self.order([link("l1", "C1", "C2"), link("l2", "C1", "C3")], "C1", "C3")
+        with self.assertRaisesRegex(BusinessException, "1 links are not on the path"):
+            self.order([link("l1", "C1", "C2"), link("l2", "C3", "C4")], "C1", "C2")
+
+    def test_disconnected_inter_domain_route(self):
+        links = [link("l1", "C1", "C2"), link("l3", "C3", "C4")]
+        with self.assertRaises(BusinessException):
+            InterDomainRouteOpt().get_ordered_route_list(links, "C1", "C4")
+
+    def test_selected_links(self):
+        self.assertEqual(["b", "c"], selected_links([{'x': [0, 1, 1]}, {'x': [1, 0, 0]}], ["a", "b", "c"]))
+        with self.assertRaisesRegex(BusinessException, "No route found"):
+            selected_links([], ["a", "b", "c"])
+
+    def test_route_options(self):
+        self.assertEqual({"alternatives": 1, "disjoint": False, "linkWeight": "hops"}, route_options(None))
+        self.assertEqual({"alternatives": 3, "disjoint": True, "linkWeight": "bandwidth"},
+                         route_options({"alternatives": 2, "linkWeight": "bandwidth"},
+                                       {"alternatives": 3, "disjoint": True}))
+        for options in [{"alternatives": "2"}, {"alternatives": 0}, {"alternatives": False},
+                        {"disjoint": 1}, {"linkWeight": "latency"}]:
+            with self.assertRaisesRegex(BusinessException, "Invalid route option"):
+                route_options({}, options)
+
+
+if __name__ == '__main__':
+    unittest.main()
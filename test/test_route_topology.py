@@ -0,0 +1,113 @@
+# -------------------------------------------------------------------------
+#   Copyright (C) 2020 Wipro Limited.
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# -------------------------------------------------------------------------
+#
+import json
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from apps.route.optimizers.simple_route_opt import RouteOpt
+from apps.route.optimizers.topology import get_route_topology
+from apps.route.optimizers.topology import INTER_DOMAIN_LINKS
+from apps.route.optimizers.topology import is_inter_domain
+from apps.route.optimizers.topology import is_up
+from apps.route.optimizers.topology import LOGICAL_LINKS
+from apps.route.optimizers.topology import RouteTopology
+from apps.route.optimizers.topology import TopologySource
+from osdf.utils.interfaces import json_from_file
+from osdf.utils.programming_utils import DotDict
+
+
+def link(name, **fields):
+    return dict({"link-name": name}, **fields)
+
+
+def event(action, entity, entity_type="logical-link"):
+    return {"event-header": {"entity-type": entity_type, "action": action}, "entity": entity}
+
+
+class TestRouteTopology(unittest.TestCase):
+
+    def setUp(self):
+        self.load_links = MagicMock(return_value=[link("link1"), link("link2")])
+        self.load_inter_domain_links = MagicMock(return_value=[link("link3", **{"link-type": "inter-domain"})])
+        self.topology = RouteTopology({
+            LOGICAL_LINKS: TopologySource("logical-link", "link-name", self.load_links, is_up),
+            INTER_DOMAIN_LINKS: TopologySource("logical-link", "link-name", self.load_inter_domain_links,
+                                               is_inter_domain)
+        }, refresh_interval=0)
+
+    def names(self, name):
+        return [entity["link-name"] for entity in self.topology.snapshot(name).entities]
+
+    def test_snapshot_is_loaded_once(self):
+        snapshot = self.topology.snapshot(LOGICAL_LINKS)
+        self.assertEqual(["link1", "link2"], self.names(LOGICAL_LINKS))
+        self.assertIs(snapshot, self.topology.snapshot(LOGICAL_LINKS))
+        self.load_links.assert_called_once_with()
+        self.topology.load(LOGICAL_LINKS)
+        self.assertEqual(2, self.load_links.call_count)
+        self.assertGreater(self.topology.snapshot(LOGICAL_LINKS).version, snapshot.version)
+
+    def test_derived_data_is_built_once_per_snapshot(self):
+        build = MagicMock(return_value="graph")
+        snapshot = self.topology.snapshot(LOGICAL_LINKS)
+        self.assertEqual("graph", snapshot.derived("graph", build))
+        self.assertEqual("graph", snapshot.derived("graph", build))
+        build.assert_called_once_with()
+        self.topology.apply_events([event("CREATE", link("link4"))])
+        self.topology.snapshot(LOGICAL_LINKS).derived("graph", build)
+        self.assertEqual(2, build.call_count)
+
+    def test_apply_events(self):
+        self.topology.snapshot(LOGICAL_LINKS)
+        self.topology.snapshot(INTER_DOMAIN_LINKS)
+        changed = self.topology.apply_events([
+            event("CREATE", link("link4", **{"link-type": "inter-domain"})),
+            json.dumps(event("UPDATE", link("link1", **{"operational-status": "Down"}))),
+            event("DELETE", link("link3")),
+            event("DELETE", link("link5")),
+            event("UPDATE", {"thirdparty-sdnc-id": "c1"}, entity_type="esr-thirdparty-sdnc")
+        ])
+        self.assertEqual(["link2", "link4"], self.names(LOGICAL_LINKS))
+        self.assertEqual(["link4"], self.names(INTER_DOMAIN_LINKS))
+        self.assertEqual(4, changed)
+        stats = self.topology.stats()
+        self.assertEqual(4, stats["events"])
+        self.assertEqual(1, stats["ignoredEvents"])
+        self.assertEqual(2, stats["sources"][LOGICAL_LINKS]["size"])
+
+    def test_events_before_the_first_load(self):
+        self.assertEqual(0, self.topology.apply_events([event("CREATE", link("link4"))]))
+        self.assertEqual(["link1", "link2"], self.names(LOGICAL_LINKS))
+
+    def test_get_route_topology_disabled(self):
+        self.assertIsNone(get_route_topology(DotDict({"deployment": {}})))
+        self.assertIsNone(get_route_topology(DotDict({"deployment": {"routeTopology": {"enabled": False}}})))
+
+    def test_route_graph_from_topology(self):
+        logical_links = json_from_file("test/simple_route_opt/AAI.json")["logical-link"]
+        self.load_links.return_value = logical_links
+        with patch('apps.route.optimizers.simple_route_opt.get_route_topology', return_value=self.topology):
+            route_graph = RouteOpt().get_route_graph(None)
+            self.assertIs(route_graph, RouteOpt().get_route_graph(None))
+        self.assertEqual(RouteOpt().build_route_graph(logical_links)[:3], route_graph[:3])
+        self.load_links.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,11 +3,12 @@ from osdf.utils.interfaces import json_from_file
 from unittest.mock import patch
 import osdf.config.loader as config_loader
 from osdf.utils.programming_utils import DotDict
+from osdf.operation.exceptions import BusinessException
 import unittest
 
 
 class TestSimpleRouteOptimization(unittest.TestCase):
-    @patch('apps.route.optimizers.simple_route_opt.requests.get')
+    @patch('requests.Session.get')
     @patch('apps.route.optimizers.simple_route_opt.pymzn.minizinc')
     def test_process_nst_selection_solutions( self, mock_solve, mock_get):
 
@@ -50,6 +51,44 @@ class TestSimpleRouteOptimization(unittest.TestCase):
         actual_response = routopt.get_route(request_json,self.osdf_config)
         self.assertEqual(mock_response, actual_response)
 
+    @patch('requests.Session.get')
+    def test_get_routes(self, mock_get):
+        mock_get.return_value.json.return_value = json_from_file("test/simple_route_opt/AAI.json")
+        mock_get.return_value.status_code = 200
+        self.config_spec = {
+            "deployment": "test/functest/simulators/simulated-config/osdf_config.yaml",
+            "core": "test/functest/simulators/simulated-config/common_config.yaml"
+        }
+        self.osdf_config = DotDict(config_loader.all_configs(**self.config_spec))
+        request_json = json_from_file("test/simple_route_opt/routeOpt.json")
+        route_requests = request_json["routeInfo"]["routeRequests"]
+        route_requests.append({"srcPort": {"accessNodeId": "20.20.20.20"}, "dstPort": {"accessNodeId": "10.10.10.10"},
+                               "options": {"alternatives": 2}})
+        route_requests.append({"srcPort": {"accessNodeId": "30.30.30.30"}, "dstPort": {"accessNodeId": "10.10.10.10"}})
+        actual_response = RouteOpt().get_routes(request_json, self.osdf_config)
+
+        solutions = actual_response["solutions"]
+        self.assertEqual(3, len(solutions))
+        self.assertEqual("success", solutions[0]["routeStatus"])
+        self.assertEqual([["link-id-1", "link-id-2", "link-id-3"]],
+                         [[link["link"] for link in route] for route in solutions[0]["routes"]])
+        self.assertEqual([[{"link": "link-id-1", "start_node": "20.20.20.20", "end_node": "10.10.10.10"}]],
+                         solutions[1]["routes"])
+        self.assertEqual("failed", solutions[2]["routeStatus"])
+        self.assertEqual(1, mock_get.call_count)  # the links are fetched once for all the route requests
+
+    @patch('requests.Session.get')
+    def test_get_routes_invalid_options(self, mock_get):
+        self.osdf_config = DotDict(config_loader.all_configs(
+            deployment="test/functest/simulators/simulated-config/osdf_config.yaml",
+            core="test/functest/simulators/simulated-config/common_config.yaml"))
+        for options in [{"alternatives": "2"}, {"alternatives": 0}, {"alternatives": True},
+                        {"disjoint": "yes"}, {"linkWeight": "latency"}]:
+            request_json = json_from_file("test/simple_route_opt/routeOpt.json")
+            request_json["routeInfo"]["routeRequests"][0]["options"] = options
+            self.assertRaises(BusinessException, RouteOpt().get_routes, request_json, self.osdf_config)
+        mock_get.assert_not_called()
+
 
 
 if __name__ == '__main__':